@@ -0,0 +1,51 @@
+"""add entry_monthly_rollups
+
+Revision ID: 4b7d2e91c0a3
+Revises: c51cc2070bd4
+Create Date: 2026-10-18 10:12:41.207311
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '4b7d2e91c0a3'
+down_revision: Union[str, Sequence[str], None] = 'c51cc2070bd4'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        'entry_monthly_rollups',
+        sa.Column('user_id', sa.String(), nullable=False),
+        sa.Column('year', sa.Integer(), nullable=False),
+        sa.Column('month', sa.Integer(), nullable=False),
+        sa.Column('type', sa.String(length=10), nullable=False),
+        sa.Column('category', sa.String(length=100), nullable=False),
+        sa.Column('total', sa.Numeric(precision=14, scale=2), server_default='0', nullable=False),
+        sa.Column('entry_count', sa.Integer(), server_default='0', nullable=False),
+        sa.Column('updated_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False),
+        sa.ForeignKeyConstraint(['user_id'], ['users.id'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('user_id', 'year', 'month', 'type', 'category'),
+    )
+
+    # backfill from the live ledger (same query as app.db.rebuild_rollups)
+    op.execute(
+        """
+        INSERT INTO entry_monthly_rollups (user_id, year, month, type, category, total, entry_count)
+        SELECT user_id, year, month, type, category, sum(amount), count(*)
+        FROM entries
+        WHERE is_deleted = false
+        GROUP BY user_id, year, month, type, category
+        """
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table('entry_monthly_rollups')
@@ -0,0 +1,37 @@
+"""backfill user_steps_progress
+
+Revision ID: 6f2c9b14e8a1
+Revises: d3a81f6c2b57
+Create Date: 2026-10-18 15:02:41.774310
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = '6f2c9b14e8a1'
+down_revision: Union[str, Sequence[str], None] = 'd3a81f6c2b57'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # /user-roadmap no longer creates progress rows on read; give every
+    # existing user the rows signup now provisions
+    op.execute(
+        """
+        INSERT INTO user_steps_progress (id, user_id, step_key, progress)
+        SELECT gen_random_uuid(), u.id, s.key, 0
+        FROM users u CROSS JOIN roadmap_steps s
+        ON CONFLICT (user_id, step_key) DO NOTHING
+        """
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    # rows are indistinguishable from ones the old GET created; keep them
+    pass
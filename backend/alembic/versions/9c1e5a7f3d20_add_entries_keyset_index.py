@@ -0,0 +1,42 @@
+"""add partial keyset index on entries
+
+Revision ID: 9c1e5a7f3d20
+Revises: 4b7d2e91c0a3
+Create Date: 2026-10-18 11:03:55.480122
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '9c1e5a7f3d20'
+down_revision: Union[str, Sequence[str], None] = '4b7d2e91c0a3'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # CONCURRENTLY cannot run inside the migration transaction
+    with op.get_context().autocommit_block():
+        op.create_index(
+            'ix_entries_user_date_id_live',
+            'entries',
+            ['user_id', sa.text('date DESC'), sa.text('id DESC')],
+            unique=False,
+            postgresql_where=sa.text('is_deleted = false'),
+            postgresql_concurrently=True,
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.get_context().autocommit_block():
+        op.drop_index(
+            'ix_entries_user_date_id_live',
+            table_name='entries',
+            postgresql_concurrently=True,
+        )
@@ -0,0 +1,36 @@
+"""add user_data_versions
+
+Revision ID: a7e4c2d9b3f8
+Revises: 6f2c9b14e8a1
+Create Date: 2026-10-18 16:40:12.905127
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a7e4c2d9b3f8'
+down_revision: Union[str, Sequence[str], None] = '6f2c9b14e8a1'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # no backfill: a missing row reads as version 0
+    op.create_table(
+        'user_data_versions',
+        sa.Column('user_id', sa.String(), nullable=False),
+        sa.Column('version', sa.BigInteger(), server_default='0', nullable=False),
+        sa.Column('updated_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False),
+        sa.ForeignKeyConstraint(['user_id'], ['users.id'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('user_id'),
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table('user_data_versions')
@@ -0,0 +1,108 @@
+"""add entries_archive, entries.deleted_at and partial live indexes
+
+Revision ID: a9c4e2f7b1d3
+Revises: f1d6a8c3e7b2
+Create Date: 2026-10-18 21:26:09.644817
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a9c4e2f7b1d3'
+down_revision: Union[str, Sequence[str], None] = 'f1d6a8c3e7b2'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+LIVE_COLUMNS = ('date', 'year', 'month', 'type', 'category')
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('entries', sa.Column('deleted_at', sa.DateTime(timezone=True), nullable=True))
+    # rows deleted before this column existed: their last update was the delete
+    op.execute("UPDATE entries SET deleted_at = updated_at WHERE is_deleted AND deleted_at IS NULL")
+
+    op.create_table(
+        'entries_archive',
+        sa.Column('id', sa.UUID(), nullable=False),
+        sa.Column('user_id', sa.String(), nullable=False),
+        sa.Column('date', sa.Date(), nullable=False),
+        sa.Column('year', sa.Integer(), nullable=False),
+        sa.Column('month', sa.Integer(), nullable=False),
+        sa.Column('type', sa.String(length=10), nullable=False),
+        sa.Column('name', sa.String(length=200), nullable=False),
+        sa.Column('category', sa.String(length=100), nullable=False),
+        sa.Column('amount', sa.Numeric(precision=12, scale=2), nullable=False),
+        sa.Column('currency', sa.String(length=8), nullable=False),
+        sa.Column('notes', sa.Text(), nullable=True),
+        sa.Column('fingerprint', sa.String(length=32), nullable=True),
+        sa.Column('is_deleted', sa.Boolean(), nullable=False),
+        sa.Column('deleted_at', sa.DateTime(timezone=True), nullable=True),
+        sa.Column('created_at', sa.DateTime(timezone=True), nullable=False),
+        sa.Column('updated_at', sa.DateTime(timezone=True), nullable=False),
+        sa.Column('archived_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False),
+        sa.ForeignKeyConstraint(['user_id'], ['users.id'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('id'),
+    )
+    op.create_index('ix_entries_archive_user_deleted_at', 'entries_archive', ['user_id', 'deleted_at'], unique=False)
+
+    # CONCURRENTLY cannot run inside the migration transaction. The partial
+    # index is built before the full one it replaces is dropped, so reads
+    # always have one.
+    with op.get_context().autocommit_block():
+        for column in LIVE_COLUMNS:
+            op.create_index(
+                f'ix_entries_{column}_live',
+                'entries',
+                [column],
+                unique=False,
+                postgresql_where=sa.text('is_deleted = false'),
+                postgresql_concurrently=True,
+            )
+            op.drop_index(
+                f'ix_entries_{column}',
+                table_name='entries',
+                postgresql_concurrently=True,
+                if_exists=True,
+            )
+        op.create_index(
+            'ix_entries_deleted_at',
+            'entries',
+            ['deleted_at'],
+            unique=False,
+            postgresql_where=sa.text('is_deleted = true'),
+            postgresql_concurrently=True,
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.get_context().autocommit_block():
+        op.drop_index('ix_entries_deleted_at', table_name='entries', postgresql_concurrently=True)
+        for column in LIVE_COLUMNS:
+            op.create_index(
+                f'ix_entries_{column}',
+                'entries',
+                [column],
+                unique=False,
+                postgresql_concurrently=True,
+            )
+            op.drop_index(f'ix_entries_{column}_live', table_name='entries', postgresql_concurrently=True)
+
+    # archived rows go back to the live table (still soft-deleted) rather than being lost
+    op.execute(
+        """
+        INSERT INTO entries (id, user_id, date, year, month, type, name, category, amount,
+                             currency, notes, fingerprint, is_deleted, created_at, updated_at)
+        SELECT id, user_id, date, year, month, type, name, category, amount,
+               currency, notes, fingerprint, true, created_at, updated_at
+        FROM entries_archive
+        """
+    )
+    op.drop_index('ix_entries_archive_user_deleted_at', table_name='entries_archive')
+    op.drop_table('entries_archive')
+    op.drop_column('entries', 'deleted_at')
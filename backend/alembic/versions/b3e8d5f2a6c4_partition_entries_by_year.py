@@ -0,0 +1,149 @@
+"""partition entries by date range, one partition per year
+
+Revision ID: b3e8d5f2a6c4
+Revises: a9c4e2f7b1d3
+Create Date: 2026-10-18 22:08:51.377420
+
+"""
+from datetime import date
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b3e8d5f2a6c4'
+down_revision: Union[str, Sequence[str], None] = 'a9c4e2f7b1d3'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+BATCH_ROWS = 10_000
+YEARS_AHEAD = 2  # as app.db.partitions, which keeps creating them from here on
+NIL_UUID = '00000000-0000-0000-0000-000000000000'
+
+# (name, columns, partial-index predicate), as declared on app.models.Entry
+INDEXES = [
+    ('ix_entries_user_id', 'user_id', None),
+    ('ix_entries_user_date_id_live', 'user_id, date DESC, id DESC', 'is_deleted = false'),
+    ('ix_entries_user_fingerprint_date_live', 'user_id, fingerprint, date', 'is_deleted = false'),
+    ('ix_entries_date_live', 'date', 'is_deleted = false'),
+    ('ix_entries_year_live', 'year', 'is_deleted = false'),
+    ('ix_entries_month_live', 'month', 'is_deleted = false'),
+    ('ix_entries_type_live', 'type', 'is_deleted = false'),
+    ('ix_entries_category_live', 'category', 'is_deleted = false'),
+    ('ix_entries_deleted_at', 'deleted_at', 'is_deleted = true'),
+]
+
+
+def _create_indexes(table: str, suffix: str = '') -> None:
+    for name, columns, where in INDEXES:
+        op.execute(
+            f"CREATE INDEX {name}{suffix} ON {table} ({columns})"
+            + (f" WHERE {where}" if where else "")
+        )
+
+
+def upgrade() -> None:
+    """Upgrade schema.
+
+    Online: entries stays readable and writable while rows are copied.
+    A trigger mirrors every write on the old table into the new one, and
+    rows are copied in primary-key batches of BATCH_ROWS, each its own
+    transaction, locking only that batch (FOR SHARE, so a concurrent update
+    of a row being copied waits for the batch and is then mirrored). Only
+    the final rename takes an exclusive lock, for as long as the renames.
+    """
+    bind = op.get_bind()
+
+    # the same columns; the partition key has to be part of the primary key
+    op.execute("CREATE TABLE entries_new (LIKE entries INCLUDING DEFAULTS) PARTITION BY RANGE (date)")
+    op.execute("ALTER TABLE entries_new ADD CONSTRAINT entries_new_pkey PRIMARY KEY (id, date)")
+    op.execute(
+        "ALTER TABLE entries_new ADD CONSTRAINT entries_new_user_id_fkey "
+        "FOREIGN KEY (user_id) REFERENCES users (id) ON DELETE CASCADE"
+    )
+    _create_indexes('entries_new', suffix='_new')
+
+    # the years that have rows, plus the ones coming up; a year in between
+    # without rows is created by app.db.partitions once it gets some. Not
+    # the whole min..max span: one mistyped year would add centuries.
+    years = set(
+        bind.execute(sa.text("SELECT DISTINCT CAST(extract(year FROM date) AS integer) FROM entries")).scalars()
+    )
+    this_year = date.today().year
+    years |= set(range(this_year, this_year + YEARS_AHEAD + 1))
+    for year in sorted(years):
+        op.execute(
+            f"CREATE TABLE entries_y{year} PARTITION OF entries_new "
+            f"FOR VALUES FROM ('{year:04d}-01-01') TO ('{year + 1:04d}-01-01')"
+        )
+    op.execute("CREATE TABLE entries_default PARTITION OF entries_new DEFAULT")
+
+    op.execute(
+        """
+        CREATE FUNCTION entries_mirror() RETURNS trigger LANGUAGE plpgsql AS $$
+        BEGIN
+            IF TG_OP IN ('UPDATE', 'DELETE') THEN
+                DELETE FROM entries_new WHERE id = OLD.id AND date = OLD.date;
+            END IF;
+            IF TG_OP IN ('INSERT', 'UPDATE') THEN
+                INSERT INTO entries_new SELECT NEW.* ON CONFLICT DO NOTHING;
+            END IF;
+            RETURN NULL;
+        END $$
+        """
+    )
+    op.execute(
+        "CREATE TRIGGER entries_mirror AFTER INSERT OR UPDATE OR DELETE ON entries "
+        "FOR EACH ROW EXECUTE FUNCTION entries_mirror()"
+    )
+
+    # each statement below commits on its own
+    with op.get_context().autocommit_block():
+        after = NIL_UUID
+        while True:
+            row = bind.execute(
+                sa.text(
+                    """
+                    WITH batch AS (
+                        SELECT * FROM entries
+                        WHERE id > CAST(:after AS uuid)
+                        ORDER BY id
+                        LIMIT :n
+                        FOR SHARE
+                    ), copied AS (
+                        INSERT INTO entries_new SELECT * FROM batch ON CONFLICT DO NOTHING
+                    )
+                    SELECT (SELECT CAST(id AS text) FROM batch ORDER BY id DESC LIMIT 1)
+                    """
+                ),
+                {"after": after, "n": BATCH_ROWS},
+            ).one()
+            if row[0] is None:
+                break
+            after = row[0]
+
+    op.execute("LOCK TABLE entries IN ACCESS EXCLUSIVE MODE")
+    op.execute("DROP TRIGGER entries_mirror ON entries")
+    op.execute("DROP FUNCTION entries_mirror()")
+    op.execute("DROP TABLE entries")
+    op.execute("ALTER TABLE entries_new RENAME TO entries")
+    op.execute("ALTER TABLE entries RENAME CONSTRAINT entries_new_pkey TO entries_pkey")
+    op.execute("ALTER TABLE entries RENAME CONSTRAINT entries_new_user_id_fkey TO entries_user_id_fkey")
+    for name, _, _ in INDEXES:
+        op.execute(f"ALTER INDEX {name}_new RENAME TO {name}")
+
+
+def downgrade() -> None:
+    """Downgrade schema (offline: copies every row in one transaction)."""
+    op.execute("CREATE TABLE entries_plain (LIKE entries INCLUDING DEFAULTS)")
+    op.execute("INSERT INTO entries_plain SELECT * FROM entries")
+    op.execute("DROP TABLE entries CASCADE")  # and its partitions
+    op.execute("ALTER TABLE entries_plain RENAME TO entries")
+    op.execute("ALTER TABLE entries ADD CONSTRAINT entries_pkey PRIMARY KEY (id)")
+    op.execute(
+        "ALTER TABLE entries ADD CONSTRAINT entries_user_id_fkey "
+        "FOREIGN KEY (user_id) REFERENCES users (id) ON DELETE CASCADE"
+    )
+    _create_indexes('entries')
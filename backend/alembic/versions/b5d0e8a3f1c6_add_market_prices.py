@@ -0,0 +1,45 @@
+"""add market_symbols and market_prices
+
+Revision ID: b5d0e8a3f1c6
+Revises: a7e4c2d9b3f8
+Create Date: 2026-10-18 18:05:37.214530
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b5d0e8a3f1c6'
+down_revision: Union[str, Sequence[str], None] = 'a7e4c2d9b3f8'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        'market_symbols',
+        sa.Column('symbol', sa.String(length=20), nullable=False),
+        sa.Column('covered_from', sa.Date(), nullable=True),
+        sa.Column('covered_to', sa.Date(), nullable=True),
+        sa.Column('fetched_at', sa.DateTime(timezone=True), nullable=True),
+        sa.PrimaryKeyConstraint('symbol'),
+    )
+    # the primary key (symbol, date) is also the range-scan index
+    op.create_table(
+        'market_prices',
+        sa.Column('symbol', sa.String(length=20), nullable=False),
+        sa.Column('date', sa.Date(), nullable=False),
+        sa.Column('close', sa.Numeric(precision=14, scale=4), nullable=False),
+        sa.ForeignKeyConstraint(['symbol'], ['market_symbols.symbol'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('symbol', 'date'),
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table('market_prices')
+    op.drop_table('market_symbols')
@@ -0,0 +1,100 @@
+"""add fx_rates and entries.amount_base
+
+Revision ID: c6f2a9e4d8b1
+Revises: b3e8d5f2a6c4
+Create Date: 2026-10-18 23:37:05.614208
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c6f2a9e4d8b1'
+down_revision: Union[str, Sequence[str], None] = 'b3e8d5f2a6c4'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+BATCH_ROWS = 10_000
+NIL_UUID = '00000000-0000-0000-0000-000000000000'
+TABLES = ('entries', 'entries_archive')
+
+
+def _backfill(table: str) -> None:
+    """amount_base = amount in primary-key batches of BATCH_ROWS, each its own transaction."""
+    bind = op.get_bind()
+    after = NIL_UUID
+    while True:
+        row = bind.execute(
+            sa.text(
+                f"""
+                WITH batch AS (
+                    SELECT id FROM {table}
+                    WHERE id > CAST(:after AS uuid)
+                    ORDER BY id
+                    LIMIT :n
+                ), filled AS (
+                    UPDATE {table} SET amount_base = amount
+                    WHERE id IN (SELECT id FROM batch) AND amount_base IS NULL
+                )
+                SELECT (SELECT CAST(id AS text) FROM batch ORDER BY id DESC LIMIT 1)
+                """
+            ),
+            {"after": after, "n": BATCH_ROWS},
+        ).one()
+        if row[0] is None:
+            break
+        after = row[0]
+
+
+def upgrade() -> None:
+    """Upgrade schema.
+
+    amount_base starts out equal to amount, which is what the rollups
+    already total, so no rollup changes. Entries in other currencies get
+    their converted amounts once rates are loaded:
+    python -m app.db.load_fx_rates <file> --reconvert
+
+    Online: the column is added without a rewrite and backfilled in
+    batches, each its own short transaction, so writes keep flowing. NOT
+    NULL comes last, from a CHECK validated without blocking writes, so
+    SET NOT NULL only takes its lock for a catalog update, not a scan.
+    """
+    op.create_table(
+        'fx_rates',
+        sa.Column('currency', sa.String(length=8), nullable=False),
+        sa.Column('date', sa.Date(), nullable=False),
+        sa.Column('rate', sa.Numeric(precision=18, scale=8), nullable=False),
+        sa.PrimaryKeyConstraint('currency', 'date'),
+    )
+
+    for table in TABLES:
+        op.add_column(table, sa.Column('amount_base', sa.Numeric(precision=12, scale=2), nullable=True))
+
+    with op.get_context().autocommit_block():
+        for table in TABLES:
+            _backfill(table)
+            # rows written since their batch (by workers still on the old
+            # code), then refuse new NULLs before checking the old rows; one
+            # explicit transaction, so none slips in between the two
+            op.execute(
+                f"BEGIN; UPDATE {table} SET amount_base = amount WHERE amount_base IS NULL; "
+                f"ALTER TABLE {table} ADD CONSTRAINT {table}_amount_base_not_null "
+                f"CHECK (amount_base IS NOT NULL) NOT VALID; COMMIT"
+            )
+            op.execute(f"ALTER TABLE {table} VALIDATE CONSTRAINT {table}_amount_base_not_null")
+            op.execute(f"ALTER TABLE {table} ALTER COLUMN amount_base SET NOT NULL")
+            op.execute(f"ALTER TABLE {table} DROP CONSTRAINT {table}_amount_base_not_null")
+
+
+def downgrade() -> None:
+    """Downgrade schema.
+
+    The rollups keep their base-currency totals; run
+    python -m app.db.rebuild_rollups afterwards to total amount again.
+    """
+    op.drop_column('entries_archive', 'amount_base')
+    op.drop_column('entries', 'amount_base')
+    op.drop_table('fx_rates')
@@ -0,0 +1,29 @@
+"""add user_investments.symbol
+
+Revision ID: c8f3a1d6e2b9
+Revises: b5d0e8a3f1c6
+Create Date: 2026-10-18 19:12:08.530611
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c8f3a1d6e2b9'
+down_revision: Union[str, Sequence[str], None] = 'b5d0e8a3f1c6'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # nullable, no default: adding it is a catalog-only change
+    op.add_column('user_investments', sa.Column('symbol', sa.String(length=20), nullable=True))
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_column('user_investments', 'symbol')
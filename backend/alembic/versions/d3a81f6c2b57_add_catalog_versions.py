@@ -0,0 +1,35 @@
+"""add catalog_versions
+
+Revision ID: d3a81f6c2b57
+Revises: 9c1e5a7f3d20
+Create Date: 2026-10-18 14:21:07.318554
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'd3a81f6c2b57'
+down_revision: Union[str, Sequence[str], None] = '9c1e5a7f3d20'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        'catalog_versions',
+        sa.Column('name', sa.String(length=80), nullable=False),
+        sa.Column('version', sa.BigInteger(), server_default='1', nullable=False),
+        sa.Column('updated_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False),
+        sa.PrimaryKeyConstraint('name'),
+    )
+    op.execute("INSERT INTO catalog_versions (name, version) VALUES ('roadmap_steps', 1)")
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table('catalog_versions')
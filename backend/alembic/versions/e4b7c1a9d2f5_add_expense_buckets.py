@@ -0,0 +1,34 @@
+"""add expense_buckets
+
+Revision ID: e4b7c1a9d2f5
+Revises: c8f3a1d6e2b9
+Create Date: 2026-10-18 20:02:44.118307
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e4b7c1a9d2f5'
+down_revision: Union[str, Sequence[str], None] = 'c8f3a1d6e2b9'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # rows come from app.db.seed_expense_buckets, run on startup like the roadmap seed
+    op.create_table(
+        'expense_buckets',
+        sa.Column('category', sa.String(length=100), nullable=False),
+        sa.Column('bucket', sa.String(length=40), nullable=False),
+        sa.PrimaryKeyConstraint('category'),
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table('expense_buckets')
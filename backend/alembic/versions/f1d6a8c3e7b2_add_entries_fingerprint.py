@@ -0,0 +1,58 @@
+"""add entries.fingerprint for duplicate detection
+
+Revision ID: f1d6a8c3e7b2
+Revises: e4b7c1a9d2f5
+Create Date: 2026-10-18 20:41:17.902365
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'f1d6a8c3e7b2'
+down_revision: Union[str, Sequence[str], None] = 'e4b7c1a9d2f5'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('entries', sa.Column('fingerprint', sa.String(length=32), nullable=True))
+
+    # same value as app.core.dedupe.fingerprint: numeric(12,2)::text already
+    # has two decimals, and the regexp matches normalize_name
+    op.execute(
+        """
+        UPDATE entries
+        SET fingerprint = md5(
+            type || '|' || amount::text || '|'
+            || trim(regexp_replace(lower(name), '[^a-z0-9]+', ' ', 'g'))
+        )
+        WHERE fingerprint IS NULL
+        """
+    )
+
+    # CONCURRENTLY cannot run inside the migration transaction
+    with op.get_context().autocommit_block():
+        op.create_index(
+            'ix_entries_user_fingerprint_date_live',
+            'entries',
+            ['user_id', 'fingerprint', 'date'],
+            unique=False,
+            postgresql_where=sa.text('is_deleted = false'),
+            postgresql_concurrently=True,
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.get_context().autocommit_block():
+        op.drop_index(
+            'ix_entries_user_fingerprint_date_live',
+            table_name='entries',
+            postgresql_concurrently=True,
+        )
+    op.drop_column('entries', 'fingerprint')
@@ -1,30 +1,61 @@
-from fastapi import APIRouter, Depends, Query
+from datetime import date, datetime, timedelta, timezone
+from typing import Literal
+
+import orjson
+from fastapi import APIRouter, Depends, HTTPException, Query, Response
+from fastapi.concurrency import run_in_threadpool
 from sqlalchemy.orm import Session
-from sqlalchemy import func, distinct, and_
+from sqlalchemy import and_, func, select, tuple_
 
-from app.api.deps import get_db
-from app.models import Entry
+from app.api.caching import user_data_etag
+from app.api import market
+from app.api.deps import db_route, get_current_user_id, get_db, run_db
+from app.core.config import settings
+from app.core.price_providers import ProviderError
+from app.crud import market_prices
+from app.crud import portfolio_valuation as valuation_store
+from app.db import seed_expense_buckets
+from app.models import EntryMonthlyRollup, ExpenseBucket, UserDebt, UserInvestment, UserStepMetric
 
 router = APIRouter(prefix="/analytics", tags=["analytics"])
 
+MAX_PAYOFF_LEVELS = 100
+VALUATION_SEED_DAYS = 14  # how far before start to look for the close that seeds day 0
+
+# app.core.debt_payoff.Strategy; the numpy engines in app.core are imported
+# inside the handlers that use them, so booting a worker does not load numpy
+PayoffStrategy = Literal["avalanche", "snowball"]
+
 
 def ym_to_index(y: int, m: int) -> int:
     return y * 12 + (m - 1)
 
 
-@router.get("/summary")
+def index_to_ym(idx: int) -> tuple[int, int]:
+    y, m0 = divmod(idx, 12)
+    return y, m0 + 1
+
+
+@router.get("/summary", dependencies=[Depends(user_data_etag())])
+@db_route
 def summary(
     db: Session = Depends(get_db),
-    user_id: str = Query(...),
+    user_id: str = Depends(get_current_user_id),
     months: int = Query(3, ge=1, le=24),
 ):
+    return compute_summary(db, user_id, months)
+
+
+def compute_summary(db: Session, user_id: str, months: int) -> dict:
+    # Reads the incrementally maintained rollup (a handful of rows per month)
+    # instead of scanning the user's whole ledger.
     latest = (
-        db.query(Entry.year, Entry.month)
+        db.query(EntryMonthlyRollup.year, EntryMonthlyRollup.month)
         .filter(
-            Entry.user_id == user_id,
-            Entry.is_deleted == False,  # noqa: E712
+            EntryMonthlyRollup.user_id == user_id,
+            EntryMonthlyRollup.entry_count > 0,
         )
-        .order_by(Entry.year.desc(), Entry.month.desc())
+        .order_by(EntryMonthlyRollup.year.desc(), EntryMonthlyRollup.month.desc())
         .first()
     )
 
@@ -40,23 +71,28 @@ def summary(
     anchor_year, anchor_month = int(latest[0]), int(latest[1])
 
     end_idx = ym_to_index(anchor_year, anchor_month)
-    start_idx = end_idx - (months - 1)
+    start_year, start_month = index_to_ym(end_idx - (months - 1))
 
-    ym_idx = Entry.year * 12 + (Entry.month - 1)
+    ym = tuple_(EntryMonthlyRollup.year, EntryMonthlyRollup.month)
 
-    base_filter = and_(
-        Entry.user_id == user_id,
-        Entry.is_deleted == False,  # noqa: E712
-        ym_idx >= start_idx,
-        ym_idx <= end_idx,
+    rows = (
+        db.query(
+            EntryMonthlyRollup.year,
+            EntryMonthlyRollup.month,
+            EntryMonthlyRollup.type,
+            func.sum(EntryMonthlyRollup.total),
+        )
+        .filter(
+            EntryMonthlyRollup.user_id == user_id,
+            EntryMonthlyRollup.entry_count > 0,
+            ym >= (start_year, start_month),
+            ym <= (anchor_year, anchor_month),
+        )
+        .group_by(EntryMonthlyRollup.year, EntryMonthlyRollup.month, EntryMonthlyRollup.type)
+        .all()
     )
 
-    months_used = (
-        db.query(func.count(distinct(ym_idx)))
-        .filter(base_filter)
-        .scalar()
-    )
-    months_used = int(months_used or 0)
+    months_used = len({(y, m) for y, m, _, _ in rows})
 
     if months_used == 0:
         return {
@@ -67,16 +103,8 @@ def summary(
             "savings_rate": 0,
         }
 
-    income_sum = (
-        db.query(func.coalesce(func.sum(Entry.amount), 0))
-        .filter(base_filter, Entry.type == "income")
-        .scalar()
-    )
-    expense_sum = (
-        db.query(func.coalesce(func.sum(Entry.amount), 0))
-        .filter(base_filter, Entry.type == "expense")
-        .scalar()
-    )
+    income_sum = sum(total for _, _, t, total in rows if t == "income")
+    expense_sum = sum(total for _, _, t, total in rows if t == "expense")
 
     income_sum = float(income_sum or 0)
     expense_sum = float(expense_sum or 0)
@@ -94,4 +122,457 @@ def summary(
         "avg_expense_per_month": avg_expense,
         "savings_rate": savings_rate,
         "anchor": {"year": anchor_year, "month": anchor_month},
-    }
\ No newline at end of file
+    }
+
+
+def parse_anchor(anchor: str | None) -> tuple[int, int]:
+    if anchor is None:
+        today = date.today()
+        return today.year, today.month
+
+    try:
+        y, m = (int(part) for part in anchor.split("-"))
+    except ValueError:
+        raise HTTPException(status_code=422, detail="anchor must be YYYY-MM")
+    if not 1 <= m <= 12:
+        raise HTTPException(status_code=422, detail="anchor must be YYYY-MM")
+    return y, m
+
+
+def top_categories(totals: dict[str, float], top: int) -> list[dict]:
+    ranked = sorted(totals.items(), key=lambda kv: kv[1], reverse=True)[:top]
+    return [{"category": c, "amount": amount} for c, amount in ranked]
+
+
+@router.get("/timeseries")
+@db_route
+def timeseries(
+    db: Session = Depends(get_db),
+    user_id: str = Depends(get_current_user_id),
+    months: int = Query(12, ge=1, le=60),
+    anchor: str | None = Query(default=None, description="last month of the window, YYYY-MM (default: current month)"),
+    top: int = Query(8, ge=0, le=50),
+):
+    anchor_year, anchor_month = parse_anchor(anchor)
+
+    end_idx = ym_to_index(anchor_year, anchor_month)
+    start_idx = end_idx - (months - 1)
+    start_year, start_month = index_to_ym(start_idx)
+
+    ym = tuple_(EntryMonthlyRollup.year, EntryMonthlyRollup.month)
+
+    # One grouped query over the rollup for the whole window.
+    rows = (
+        db.query(
+            EntryMonthlyRollup.year,
+            EntryMonthlyRollup.month,
+            EntryMonthlyRollup.type,
+            EntryMonthlyRollup.category,
+            func.sum(EntryMonthlyRollup.total),
+        )
+        .filter(
+            EntryMonthlyRollup.user_id == user_id,
+            EntryMonthlyRollup.entry_count > 0,
+            ym >= (start_year, start_month),
+            ym <= (anchor_year, anchor_month),
+        )
+        .group_by(
+            EntryMonthlyRollup.year,
+            EntryMonthlyRollup.month,
+            EntryMonthlyRollup.type,
+            EntryMonthlyRollup.category,
+        )
+        .all()
+    )
+
+    # Pre-fill every month in the window so empty months come back as zeros.
+    buckets = {
+        idx: {"income": 0.0, "expense": 0.0, "categories": {}}
+        for idx in range(start_idx, end_idx + 1)
+    }
+    range_categories: dict[str, float] = {}
+
+    for y, m, t, category, total in rows:
+        if t not in ("income", "expense"):
+            continue
+
+        bucket = buckets[ym_to_index(y, m)]
+        amount = float(total or 0)
+        bucket[t] += amount
+        if t == "expense":
+            bucket["categories"][category] = bucket["categories"].get(category, 0.0) + amount
+            range_categories[category] = range_categories.get(category, 0.0) + amount
+
+    series = []
+    for idx, bucket in buckets.items():
+        y, m = index_to_ym(idx)
+        series.append(
+            {
+                "year": y,
+                "month": m,
+                "income": bucket["income"],
+                "expense": bucket["expense"],
+                "net": bucket["income"] - bucket["expense"],
+                "top_categories": top_categories(bucket["categories"], top),
+            }
+        )
+
+    return {
+        "months_requested": months,
+        "anchor": {"year": anchor_year, "month": anchor_month},
+        "series": series,
+        "top_categories": top_categories(range_categories, top),
+    }
+
+
+@router.get("/essential-expenses", dependencies=[Depends(user_data_etag(seed_expense_buckets.CATALOG_NAME))])
+@db_route
+def essential_expenses(
+    db: Session = Depends(get_db),
+    user_id: str = Depends(get_current_user_id),
+    months: int = Query(3, ge=1, le=24, description="how many of the latest months with expenses to average"),
+):
+    """Average monthly spend per essential bucket, shaped as the full-fund step's seed.
+
+    Categories map to buckets through the expense_buckets table. The window
+    is the latest ``months`` months that have any expense, and each bucket
+    is averaged over the months of the window it has spending in.
+    """
+    R = EntryMonthlyRollup
+    live_expense = (R.user_id == user_id, R.type == "expense", R.entry_count > 0)
+
+    window = (
+        select(R.year, R.month)
+        .where(*live_expense)
+        .group_by(R.year, R.month)
+        .order_by(R.year.desc(), R.month.desc())
+        .limit(months)
+        .subquery()
+    )
+    per_month = (
+        select(ExpenseBucket.bucket, func.sum(R.total).label("total"))
+        .join(window, and_(R.year == window.c.year, R.month == window.c.month))
+        .join(ExpenseBucket, ExpenseBucket.category == func.lower(func.trim(R.category)))
+        .where(*live_expense)
+        .group_by(ExpenseBucket.bucket, R.year, R.month)
+        .subquery()
+    )
+    rows = db.execute(
+        select(per_month.c.bucket, func.avg(per_month.c.total))
+        .where(per_month.c.total > 0)
+        .group_by(per_month.c.bucket)
+    ).all()
+
+    averages = {bucket: round(float(avg), 2) for bucket, avg in rows}
+    return {
+        **{bucket: averages.get(bucket, 0.0) for bucket in seed_expense_buckets.BUCKETS},
+        "selected_months": 3,
+        "current_saved": 0,
+        "save_per_month": 0,
+    }
+
+
+def _step_metrics(db: Session, user_id: str, step_key: str, keys: tuple[str, ...]) -> dict:
+    rows = (
+        db.query(UserStepMetric.metric_key, UserStepMetric.value_num, UserStepMetric.value_text)
+        .filter(
+            UserStepMetric.user_id == user_id,
+            UserStepMetric.step_key == step_key,
+            UserStepMetric.metric_key.in_(keys),
+        )
+        .all()
+    )
+    return {key: (num, text) for key, num, text in rows}
+
+
+def _month(idx: int) -> dict:
+    y, m = index_to_ym(idx)
+    return {"year": y, "month": m}
+
+
+def _payoff_inputs(db: Session, user_id: str, step_key: str, load_saved: bool) -> tuple[dict, list]:
+    """(saved strategy/contribution metrics if asked for, the step's debts)."""
+    saved = _step_metrics(db, user_id, step_key, ("strategy", "contributing_per_month")) if load_saved else {}
+    debts = (
+        db.query(UserDebt.id, UserDebt.name, UserDebt.balance, UserDebt.interest_pct, UserDebt.total_payment)
+        .filter(UserDebt.user_id == user_id, UserDebt.step_key == step_key)
+        .order_by(UserDebt.updated_at.desc())
+        .all()
+    )
+    return saved, debts
+
+
+@router.get("/debt-payoff")
+async def debt_payoff(
+    db: Session = Depends(get_db),
+    user_id: str = Depends(get_current_user_id),
+    step_key: str = Query("debt"),
+    strategy: PayoffStrategy | None = Query(
+        default=None, description="default: the step's saved strategy, else avalanche"
+    ),
+    extra: list[float] | None = Query(
+        default=None,
+        description="extra monthly contribution; repeat to compare several "
+        "(default: the step's saved contributing_per_month)",
+    ),
+    horizon_months: int = Query(360, ge=1, le=600),
+    anchor: str | None = Query(default=None, description="month the schedule starts from, YYYY-MM (default: current month)"),
+):
+    """Amortize the user's debts month by month for one or more extra contributions.
+
+    Every debt gets its ``total_payment`` as a minimum; the extra contribution
+    and any minimums freed by cleared debts go to debts in avalanche (highest
+    rate) or snowball (smallest balance) order.
+    """
+    from app.core import debt_payoff as payoff
+
+    if extra is not None and (len(extra) > MAX_PAYOFF_LEVELS or min(extra) < 0):
+        raise HTTPException(
+            status_code=422,
+            detail=f"extra takes up to {MAX_PAYOFF_LEVELS} non-negative amounts",
+        )
+    start_idx = ym_to_index(*parse_anchor(anchor))
+
+    saved, debts = await run_db(db, _payoff_inputs, user_id, step_key, strategy is None or extra is None)
+    if strategy is None:
+        text = saved.get("strategy", (None, None))[1]
+        strategy = text if text in ("avalanche", "snowball") else "avalanche"
+    if extra is None:
+        extra = [max(float(saved.get("contributing_per_month", (0, None))[0] or 0), 0.0)]
+
+    # CPU-bound: keep it off the event loop
+    schedule = await run_in_threadpool(
+        payoff.simulate,
+        [float(d.balance) for d in debts],
+        [float(d.interest_pct) for d in debts],
+        [float(d.total_payment) for d in debts],
+        extra,
+        strategy,
+        horizon_months,
+    )
+    minimum = sum((float(d.total_payment) for d in debts), 0.0)
+
+    def when(months: int) -> dict | None:
+        return _month(start_idx + months) if months >= 0 else None
+
+    scenarios = []
+    for g, amount in enumerate(extra):
+        months = int(schedule.months[g])
+        scenarios.append(
+            {
+                "extra": amount,
+                "monthly_payment": minimum + amount,
+                "months": months if months >= 0 else None,
+                "payoff": when(months),
+                "total_interest": round(float(schedule.interest[g]), 2),
+                "total_paid": round(float(schedule.paid[g]), 2),
+                "balances": schedule.balances[g].round(2).tolist(),
+                "debts": [
+                    {
+                        "id": str(d.id),
+                        "months": int(schedule.debt_months[g, i]) if schedule.debt_months[g, i] >= 0 else None,
+                        "payoff": when(int(schedule.debt_months[g, i])),
+                        "interest": round(float(schedule.debt_interest[g, i]), 2),
+                    }
+                    for i, d in enumerate(debts)
+                ],
+            }
+        )
+
+    return {
+        "strategy": strategy,
+        "start": _month(start_idx),
+        "horizon_months": horizon_months,
+        "total_balance": sum((float(d.balance) for d in debts), 0.0),
+        "minimum_payment": minimum,
+        "order": [{"id": str(debts[i].id), "name": debts[i].name} for i in schedule.order],
+        "scenarios": scenarios,
+    }
+
+
+def _holdings(db: Session, user_id: str, step_key: str) -> list:
+    return (
+        db.query(
+            UserInvestment.id,
+            UserInvestment.name,
+            UserInvestment.kind,
+            UserInvestment.risk,
+            UserInvestment.monthly_amount,
+            UserInvestment.current_invested,
+            UserInvestment.average_return,
+        )
+        .filter(UserInvestment.user_id == user_id, UserInvestment.step_key == step_key)
+        .order_by(UserInvestment.updated_at.desc())
+        .all()
+    )
+
+
+def _cents(values) -> list[float]:
+    return values.round(2).tolist()
+
+
+@router.get("/investment-projection", dependencies=[Depends(user_data_etag())])
+async def investment_projection(
+    db: Session = Depends(get_db),
+    user_id: str = Depends(get_current_user_id),
+    step_key: str = Query("invest"),
+    years: int = Query(20, ge=1, le=50),
+    paths: int = Query(5000, ge=100, le=100_000),
+    seed: int = Query(0, ge=0),
+    step_months: int = Query(12, ge=1, le=120, description="spacing of the returned checkpoints"),
+    target: float | None = Query(default=None, gt=0, description="portfolio value to estimate the odds of reaching"),
+):
+    """Seeded Monte Carlo of the user's investments: p10/p50/p90 value by checkpoint.
+
+    Each holding grows at its ``average_return`` on average, with volatility
+    from its risk level (or kind), and receives its ``monthly_amount`` every
+    month. The same seed and inputs give the same answer, so the response is
+    cached on the user's data version like the other reads.
+    """
+    from app.core import investment_projection as projection
+
+    holdings = await run_db(db, _holdings, user_id, step_key)
+    months = years * 12
+    vols = [projection.volatility(h.kind, h.risk) for h in holdings]
+
+    # CPU-bound: keep it off the event loop
+    result = await run_in_threadpool(
+        projection.simulate,
+        [float(h.current_invested) for h in holdings],
+        [float(h.monthly_amount) for h in holdings],
+        [float(h.average_return) for h in holdings],
+        vols,
+        months,
+        paths,
+        seed=seed,
+        step=step_months,
+        target=target,
+        chunk_paths=projection.chunk_size(months, len(holdings), settings.MONTE_CARLO_CHUNK_MB << 20),
+    )
+
+    return {
+        "years": years,
+        "paths": paths,
+        "seed": seed,
+        "months": result.months.tolist(),
+        "p10": _cents(result.p10),
+        "p50": _cents(result.p50),
+        "p90": _cents(result.p90),
+        "mean": _cents(result.mean),
+        "contributed": _cents(result.contributed),
+        "target": None
+        if target is None
+        else {
+            "amount": target,
+            "probability": float(result.hit[-1]),
+            "probability_by_month": result.hit.tolist(),
+        },
+        "holdings": [
+            {
+                "id": str(h.id),
+                "name": h.name,
+                "kind": h.kind,
+                "risk": h.risk,
+                "average_return": float(h.average_return),
+                "volatility": vol,
+            }
+            for h, vol in zip(holdings, vols)
+        ],
+    }
+
+
+async def _portfolio_value(db: Session, holdings: list, start: date, end: date, today: date) -> dict:
+    import numpy as np
+
+    from app.core import valuation
+
+    symbols_of = [valuation_store.holding_symbol(h.symbol, h.preset_id) for h in holdings]
+    symbols = sorted({s for s in symbols_of if s})
+
+    seed_start = start - timedelta(days=VALUATION_SEED_DAYS)
+    stale, rows = await run_db(db, market_prices.load_many, symbols, seed_start, end, today)
+    for symbol in stale:
+        try:
+            rows[symbol] = await market.ensure_covered(db, symbol, seed_start, end, today)
+        except ProviderError:
+            pass  # valued flat at current_invested, listed as unpriced
+
+    priced = [s for s in symbols if rows.get(s)]
+    column = {s: j for j, s in enumerate(priced)}
+    prices = valuation.price_matrix(
+        np.datetime64(start),
+        (end - start).days + 1,
+        [
+            (np.array([d for d, _ in rows[s]], dtype="datetime64[D]"), np.array([c for _, c in rows[s]]))
+            for s in priced
+        ],
+    )
+
+    held = [h for h, s in enumerate(symbols_of) if s in column]
+    unpriced = [h for h, s in enumerate(symbols_of) if s not in column]
+    values, units = valuation.value_series(
+        prices,
+        np.array([column[symbols_of[h]] for h in held], dtype=np.int64),
+        np.array([holdings[h].current_invested for h in held], dtype=float),
+    )
+    values += sum((holdings[h].current_invested for h in unpriced), 0.0)
+
+    return {
+        "start": start,
+        "end": end,
+        "dates": np.datetime_as_string(np.arange(start, end + timedelta(days=1), dtype="datetime64[D]")).tolist(),
+        "values": values.round(2).tolist(),
+        "holdings": [
+            {
+                "id": holdings[h].id,
+                "name": holdings[h].name,
+                "symbol": symbols_of[h],
+                "units": float(u),
+                "value": holdings[h].current_invested,
+            }
+            for h, u in zip(held, units)
+        ],
+        "unpriced": [
+            {
+                "id": holdings[h].id,
+                "name": holdings[h].name,
+                "symbol": symbols_of[h],
+                "value": holdings[h].current_invested,
+            }
+            for h in unpriced
+        ],
+    }
+
+
+@router.get("/portfolio-value")
+async def portfolio_value(
+    db: Session = Depends(get_db),
+    user_id: str = Depends(get_current_user_id),
+    step_key: str = Query("invest"),
+    start: date | None = Query(default=None, description="default: a year before end"),
+    end: date | None = Query(default=None, description="default: today (UTC)"),
+):
+    """Daily value of the user's current holdings from stored closes, as dates[]/values[].
+
+    Holdings follow their ``symbol`` or their preset's listing. Each is
+    sized to be worth ``current_invested`` at ``end`` and held constant
+    back to ``start``. Holdings with no price series count flat at
+    ``current_invested`` and are listed under ``unpriced``. Results are cached
+    per user and range until the user's data changes or the day rolls over.
+    """
+    today = datetime.now(timezone.utc).date()
+    end = min(end or today, today)
+    start = start or end - timedelta(days=365)
+    if start > end or (end - start).days > market.MAX_RANGE_DAYS:
+        raise HTTPException(
+            status_code=422,
+            detail=f"start must be before end, at most {market.MAX_RANGE_DAYS} days apart",
+        )
+
+    version, holdings = await run_db(db, valuation_store.load_holdings, user_id, step_key)
+    key = (user_id, step_key, start, end)
+    body = valuation_store.cached(key, version, today)
+    if body is None:
+        body = orjson.dumps(await _portfolio_value(db, holdings, start, end, today))
+        valuation_store.remember(key, version, today, body)
+    return Response(content=body, media_type="application/json")
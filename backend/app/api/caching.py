@@ -0,0 +1,74 @@
+from fastapi import Depends, HTTPException, Request, Response
+from sqlalchemy.orm import Session
+
+from app.api.deps import get_current_user_id, get_db, run_db
+from app.crud.data_version import read_versions
+
+
+def etag_matches(request: Request, etag: str) -> bool:
+    """True if the request's If-None-Match already names ``etag``."""
+    header = request.headers.get("if-none-match")
+    if not header:
+        return False
+    if header.strip() == "*":
+        return True
+
+    # weak comparison, as RFC 9110 prescribes for If-None-Match
+    def opaque(tag: str) -> str:
+        tag = tag.strip()
+        return tag[2:] if tag.startswith("W/") else tag
+
+    return opaque(etag) in {opaque(t) for t in header.split(",")}
+
+
+def not_modified(etag: str) -> Response:
+    return Response(status_code=304, headers={"ETag": etag, "Cache-Control": "no-cache"})
+
+
+def set_etag(response: Response, etag: str) -> None:
+    response.headers["ETag"] = etag
+    # clients may keep the body but must revalidate before reusing it
+    response.headers["Cache-Control"] = "no-cache"
+
+
+def data_etag(db: Session, user_id: str, catalog: str | None = None) -> str:
+    """Weak ETag of ``user_id``'s data version (and ``catalog``'s, if given)."""
+    user_version, catalog_version = read_versions(db, user_id, catalog)
+    return f'W/"{user_id}.{user_version}' + (f".{catalog_version}" if catalog else "") + '"'
+
+
+def check_etag(request: Request, response: Response, etag: str) -> None:
+    """304 (as an HTTPException) if If-None-Match names ``etag``; else tag ``response``."""
+    headers = {"ETag": etag, "Cache-Control": "no-cache", "Vary": "Authorization"}
+    if etag_matches(request, etag):
+        raise HTTPException(status_code=304, headers=headers)
+    response.headers.update(headers)
+
+
+def user_data_etag(catalog: str | None = None):
+    """Dependency: conditional GET keyed on the caller's data version.
+
+    Reads the version (one primary-key lookup) before the handler runs. A
+    matching If-None-Match ends the request with 304 right there, so no
+    entity query or serialization happens. Otherwise the weak ETag is added
+    to the response. The version is read *before* the data, so a concurrent
+    write can only make the body newer than its tag, never older.
+
+    Pass ``catalog`` when the body also depends on a shared catalog
+    (e.g. roadmap steps); its version is folded into the tag.
+
+    Handlers that must pick the session's transaction settings first
+    (/me/bootstrap) call data_etag and check_etag themselves instead.
+    """
+
+    async def dependency(
+        request: Request,
+        response: Response,
+        db: Session = Depends(get_db),
+        user_id: str = Depends(get_current_user_id),
+    ) -> str:
+        etag = await run_db(db, data_etag, user_id, catalog)
+        check_etag(request, response, etag)
+        return etag
+
+    return dependency
@@ -1,41 +1,181 @@
-from fastapi import APIRouter, Depends, HTTPException, Query
+import base64
+import json
+from datetime import date
+from decimal import Decimal
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response
+from fastapi.concurrency import run_in_threadpool
+from pydantic import ValidationError
+from sqlalchemy import func, insert, select, tuple_
 from sqlalchemy.orm import Session
-from uuid import UUID
+from uuid import UUID, uuid4
 
-from app.api.deps import get_db
-from app.models import Entry
-from app.schemas.entry import EntryCreate, EntryUpdate, EntryOut
+from app.api.caching import user_data_etag
+from app.api.deps import db_route, get_current_user_id, get_db, run_db
+from app.api.rows import FIELDS_DESCRIPTION, columns, json_rows, parse_fields
+from app.crud.entry import (
+    RollupKey,
+    RollupSnapshot,
+    add_to_rollup,
+    apply_rollup_change,
+    find_duplicates,
+    unarchive_entry,
+    rollup_snapshot,
+)
+from app.core.categorizer import categorize
+from app.core.dedupe import Duplicate, OnDuplicate, fingerprint
+from app.core.config import settings
+from app.core.fx import RateNotFound, storable, to_base
+from app.crud import categorization, fx_rates
+from app.crud.categorization import Mapping, mapping
+from app.crud.data_version import bump_data_version
+from app.models import Entry, User
+from app.schemas.entry import (
+    EntryBulkResult,
+    EntryBulkRowResult,
+    EntryCategorizeRequest,
+    EntryCategorizeResult,
+    EntryCreate,
+    EntryUpdate,
+    EntryOut,
+)
 
 router = APIRouter(prefix="/entries", tags=["entries"])
 
+# POST /entries/bulk limits. Bigger imports must be split by the client; this
+# keeps one request's memory and transaction bounded.
+MAX_BULK_ENTRIES = 5000
+MAX_BULK_LINE_BYTES = 64 * 1024          # one NDJSON row
+MAX_BULK_BODY_BYTES = 4 * 1024 * 1024    # a whole JSON-array body
 
-@router.get("", response_model=list[EntryOut])
+# Default date window for near-duplicate matching on import: banks can post
+# the same transaction a day or two apart between exports.
+DUPLICATE_TOLERANCE_DAYS = 3
+
+# Listing pages are ordered by (date desc, id desc); the cursor for the next
+# page is returned in this header so the body stays a plain list.
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+
+
+def encode_cursor(entry) -> str:
+    """Cursor after ``entry`` (an Entry or any row with ``date`` and ``id``)."""
+    raw = json.dumps([entry.date.isoformat(), str(entry.id)]).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> tuple[date, UUID]:
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        d, entry_id = json.loads(raw)
+        return date.fromisoformat(d), UUID(entry_id)
+    except (ValueError, TypeError):
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+
+
+def page(q, limit: int, cursor: str | None) -> tuple[list, str | None]:
+    """Keyset page of ``q``: rows after ``cursor`` in (date desc, id desc) order,
+    plus the cursor of the following page (None on the last page).
+
+    Every page costs the same index range scan, however deep it is.
+    """
+    if cursor is not None:
+        after_date, after_id = decode_cursor(cursor)
+        # the plain date bound is implied by the row comparison, but only it
+        # lets the planner skip the partitions of later years
+        q = q.filter(Entry.date <= after_date, tuple_(Entry.date, Entry.id) < (after_date, after_id))
+
+    rows = q.order_by(Entry.date.desc(), Entry.id.desc()).limit(limit + 1).all()
+
+    if len(rows) > limit:
+        rows = rows[:limit]
+        return rows, encode_cursor(rows[-1])
+    return rows, None
+
+
+def paginate(q, response: Response, limit: int, cursor: str | None) -> list:
+    rows, next_cursor = page(q, limit, cursor)
+    if next_cursor is not None:
+        response.headers[NEXT_CURSOR_HEADER] = next_cursor
+    return rows
+
+
+def filter_period(q, year: int | None, month: int | None):
+    """Restrict ``q`` to a year or a month of one, as a date range.
+
+    entries is partitioned by date, and only a range on ``date`` (not the
+    denormalized year/month columns) lets the planner prune partitions, so
+    a year or a month reads one partition. A month without a year matches
+    that month of every year.
+    """
+    if year is None:
+        return q if month is None else q.filter(Entry.month == month)
+    if month is None:
+        return q.filter(Entry.date >= date(year, 1, 1), Entry.date < date(year + 1, 1, 1))
+    end = date(year + 1, 1, 1) if month == 12 else date(year, month + 1, 1)
+    return q.filter(Entry.date >= date(year, month, 1), Entry.date < end)
+
+
+def base_amount_error(base: Decimal) -> str | None:
+    """Why a converted amount cannot be stored (None if it can)."""
+    if not storable(base):
+        return f"amount: too large once converted to {settings.BASE_CURRENCY}"
+    return None
+
+
+def amount_base(db: Session, currency: str, amount, d: date) -> Decimal:
+    """``amount`` converted to the base currency for storing; 422 if the rate is missing or it overflows."""
+    try:
+        base = fx_rates.amount_base(db, currency, amount, d)
+    except RateNotFound as e:
+        raise HTTPException(status_code=422, detail=str(e))
+    error = base_amount_error(base)
+    if error:
+        raise HTTPException(status_code=422, detail=error)
+    return base
+
+
+def entry_columns(names: list[str]) -> list:
+    """Columns for an EntryOut projection, plus the keys the cursor is built from."""
+    return columns(Entry, names + [k for k in ("date", "id") if k not in names])
+
+
+@router.get("", response_model=list[EntryOut], dependencies=[Depends(user_data_etag())])
+@db_route
 def list_entries(
+    response: Response,
     db: Session = Depends(get_db),
-    year: int | None = Query(default=None),
-    month: int | None = Query(default=None),
+    user_id: str = Depends(get_current_user_id),
+    year: int | None = Query(default=None, ge=1, le=9998),
+    month: int | None = Query(default=None, ge=1, le=12),
     type: str | None = Query(default=None),
-    limit: int = Query(default=100, le=500),
+    limit: int = Query(default=100, ge=1, le=500),
+    cursor: str | None = Query(default=None, description=f"value of {NEXT_CURSOR_HEADER} from the previous page"),
+    fields: str | None = Query(default=None, description=FIELDS_DESCRIPTION),
 ):
-    q = db.query(Entry).filter(Entry.is_deleted == False) # noqa: E712
+    names = parse_fields(fields, EntryOut)
+    q = db.query(*entry_columns(names)).filter(
+        Entry.is_deleted == False,  # noqa: E712
+        Entry.user_id == user_id,
+    )
 
-    if year is not None:
-        q = q.filter(Entry.year == year)
-    if month is not None:
-        q = q.filter(Entry.month == month)
+    q = filter_period(q, year, month)
     if type is not None:
         q = q.filter(Entry.type == type)
 
-    return q.order_by(Entry.date.desc()).limit(limit).all()
+    return json_rows(paginate(q, response, limit, cursor), names, response)
 
 
 @router.post("", response_model=EntryOut)
-def create_entry(payload: EntryCreate, db: Session = Depends(get_db)):
+@db_route
+def create_entry(
+    payload: EntryCreate,
+    db: Session = Depends(get_db),
+    user_id: str = Depends(get_current_user_id),
+):
     y = payload.date.year
     m = payload.date.month
 
     entry = Entry(
-        user_id=payload.user_id,   # ✅ ADD THIS
+        user_id=user_id,
         date=payload.date,
         year=y,
         month=m,
@@ -44,20 +184,277 @@ def create_entry(payload: EntryCreate, db: Session = Depends(get_db)):
         category=payload.category,
         amount=payload.amount,
         currency=payload.currency,
+        amount_base=amount_base(db, payload.currency, payload.amount, payload.date),
         notes=payload.notes,
+        fingerprint=fingerprint(payload.type, payload.amount, payload.name),
     )
     db.add(entry)
+    apply_rollup_change(db, None, rollup_snapshot(entry))
+    version = bump_data_version(db, user_id)
     db.commit()
+    categorization.record(user_id, version, added=[mapping(entry)])
     db.refresh(entry)
     return entry
 
 
+async def _iter_bulk_rows(request: Request):
+    """Yield raw rows from an NDJSON stream or a JSON array body.
+
+    NDJSON (``application/x-ndjson``) is parsed line by line as it arrives, so
+    only one row is buffered at a time; a JSON array is read whole, up to
+    MAX_BULK_BODY_BYTES.
+    """
+    content_type = request.headers.get("content-type", "")
+
+    if content_type.startswith("application/x-ndjson"):
+        buffer = b""
+        async for chunk in request.stream():
+            buffer += chunk
+            *lines, buffer = buffer.split(b"\n")
+            if len(buffer) > MAX_BULK_LINE_BYTES:
+                raise HTTPException(status_code=413, detail="NDJSON row too large")
+            for line in lines:
+                if line.strip():
+                    yield line
+        if buffer.strip():
+            yield buffer
+        return
+
+    body = bytearray()
+    async for chunk in request.stream():
+        body += chunk
+        if len(body) > MAX_BULK_BODY_BYTES:
+            raise HTTPException(
+                status_code=413,
+                detail="Body too large, send application/x-ndjson or split the batch",
+            )
+
+    try:
+        data = json.loads(body)
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Body must be a JSON array of entries")
+    if not isinstance(data, list):
+        raise HTTPException(status_code=400, detail="Body must be a JSON array of entries")
+
+    for item in data:
+        yield item
+
+
+def _parse_bulk_row(raw) -> EntryCreate:
+    if isinstance(raw, (bytes, bytearray)):
+        return EntryCreate.model_validate_json(raw)
+    return EntryCreate.model_validate(raw)
+
+
+def _format_validation_error(exc: ValidationError) -> str:
+    return "; ".join(
+        f"{'.'.join(str(p) for p in err['loc']) or 'row'}: {err['msg']}"
+        for err in exc.errors()
+    )
+
+
+def _insert_entries(
+    db: Session,
+    user_id: str,
+    rows: list[tuple[int, EntryCreate]],
+    on_duplicate: OnDuplicate = "insert",
+    tolerance_days: int = 0,
+) -> list[EntryBulkRowResult]:
+    """Insert validated rows for ``user_id`` in one transaction.
+
+    Unless ``on_duplicate`` is "insert", rows are first matched against the
+    user's live entries by fingerprint (see find_duplicates): "skip" leaves
+    exact duplicates out, "flag" inserts them; near duplicates (same
+    fingerprint within ``tolerance_days``) are inserted and flagged either way.
+    """
+    if not rows:
+        return []
+
+    user = select(User.id).where(User.id == user_id)
+    if on_duplicate != "insert":
+        # one import per user at a time, so two overlapping uploads cannot both miss each other
+        user = user.with_for_update()
+    # a token can outlive its account; report that instead of an FK error
+    if db.scalar(user) is None:
+        return [EntryBulkRowResult(index=index, ok=False, error="user_id: unknown user") for index, _ in rows]
+
+    fingerprints = [fingerprint(p.type, p.amount, p.name) for _, p in rows]
+    rates = fx_rates.rates_for(db, [(p.currency, p.date) for _, p in rows])
+    duplicates: list[Duplicate | None] = [None] * len(rows)
+    if on_duplicate != "insert":
+        incoming = [(fp, p.date) for fp, (_, p) in zip(fingerprints, rows)]
+        duplicates = find_duplicates(db, user_id, incoming, tolerance_days)
+
+    results: list[EntryBulkRowResult] = []
+    values: list[dict] = []
+    snapshots: list[RollupSnapshot] = []
+    mappings: list[Mapping] = []
+
+    for (index, p), fp, dup in zip(rows, fingerprints, duplicates):
+        flags = {"duplicate": dup.kind, "duplicate_of": dup.entry_id} if dup else {}
+        if dup and dup.kind == "exact" and on_duplicate == "skip":
+            results.append(EntryBulkRowResult(index=index, ok=False, error="duplicate", **flags))
+            continue
+
+        rate = rates[(p.currency.upper(), p.date)]
+        if rate is None:
+            error = f"currency: no {p.currency.upper()} rate on or shortly before {p.date.isoformat()}"
+            results.append(EntryBulkRowResult(index=index, ok=False, error=error))
+            continue
+        base = to_base(p.amount, rate)
+        error = base_amount_error(base)
+        if error:
+            results.append(EntryBulkRowResult(index=index, ok=False, error=error))
+            continue
+
+        entry_id = uuid4()
+        values.append(
+            {
+                "id": entry_id,
+                "user_id": user_id,
+                "date": p.date,
+                "year": p.date.year,
+                "month": p.date.month,
+                "type": p.type,
+                "name": p.name,
+                "category": p.category,
+                "amount": p.amount,
+                "currency": p.currency,
+                "amount_base": base,
+                "notes": p.notes,
+                "fingerprint": fp,
+            }
+        )
+        snapshots.append(
+            RollupSnapshot(
+                RollupKey(user_id, p.date.year, p.date.month, p.type, p.category),
+                base,
+            )
+        )
+        mappings.append((p.type, p.name, p.category))
+        results.append(EntryBulkRowResult(index=index, ok=True, id=entry_id, **flags))
+
+    if values:
+        try:
+            # executemany of a Core insert is sent as multi-row INSERT ... VALUES batches
+            db.execute(insert(Entry), values)
+            add_to_rollup(db, snapshots)
+            version = bump_data_version(db, user_id)
+            db.commit()
+        except Exception:
+            db.rollback()
+            raise
+        categorization.record(user_id, version, added=mappings)
+
+    return results
+
+
+@router.post("/bulk", response_model=EntryBulkResult)
+async def bulk_create_entries(
+    request: Request,
+    db: Session = Depends(get_db),
+    user_id: str = Depends(get_current_user_id),
+    on_duplicate: OnDuplicate = Query(
+        default="skip",
+        description="rows matching an existing entry: skip them, insert and flag them, or insert without checking",
+    ),
+    date_tolerance_days: int = Query(
+        default=DUPLICATE_TOLERANCE_DAYS,
+        ge=0,
+        le=31,
+        description="flag same merchant and amount this many days apart as near duplicates",
+    ),
+):
+    """Create up to MAX_BULK_ENTRIES entries in one transaction.
+
+    Accepts a JSON array of EntryCreate objects or an NDJSON stream of them.
+    Every row is validated; invalid rows are reported by index and skipped,
+    valid rows are inserted together with their rollup updates. Rows already
+    in the ledger (a re-imported, overlapping bank export) are handled per
+    ``on_duplicate``; see _insert_entries.
+    """
+    results: list[EntryBulkRowResult] = []
+    valid: list[tuple[int, EntryCreate]] = []
+
+    index = 0
+    async for raw in _iter_bulk_rows(request):
+        if index >= MAX_BULK_ENTRIES:
+            raise HTTPException(
+                status_code=413,
+                detail=f"At most {MAX_BULK_ENTRIES} entries per request",
+            )
+        try:
+            valid.append((index, _parse_bulk_row(raw)))
+        except ValidationError as e:
+            results.append(
+                EntryBulkRowResult(index=index, ok=False, error=_format_validation_error(e))
+            )
+        index += 1
+
+    results.extend(await run_db(db, _insert_entries, user_id, valid, on_duplicate, date_tolerance_days))
+    results.sort(key=lambda r: r.index)
+
+    inserted = sum(1 for r in results if r.ok)
+    skipped = sum(1 for r in results if not r.ok and r.duplicate)
+    return EntryBulkResult(
+        inserted=inserted,
+        skipped=skipped,
+        failed=len(results) - inserted - skipped,
+        results=results,
+    )
+
+
+@router.post("/categorize", response_model=EntryCategorizeResult)
+async def categorize_entries(
+    payload: EntryCategorizeRequest,
+    db: Session = Depends(get_db),
+    user_id: str = Depends(get_current_user_id),
+):
+    """Suggested category for each (name, type), e.g. the rows of a statement being imported.
+
+    The user's own entries come first: a merchant they filed before is filed
+    the same way again. Otherwise the global merchant rules apply, and
+    ``Other`` when nothing matches. ``sources[i]`` says which one decided.
+    """
+    if len(payload.items) > MAX_BULK_ENTRIES:
+        raise HTTPException(
+            status_code=413,
+            detail=f"At most {MAX_BULK_ENTRIES} items per request",
+        )
+
+    model = await run_db(db, categorization.user_model, user_id)
+    categories, sources = await run_in_threadpool(
+        categorize,
+        [item.name for item in payload.items],
+        [item.type for item in payload.items],
+        model,
+    )
+    return EntryCategorizeResult(categories=categories, sources=sources)
+
+
 @router.patch("/{entry_id}", response_model=EntryOut)
-def update_entry(entry_id: UUID, payload: EntryUpdate, db: Session = Depends(get_db)):
-    entry = db.query(Entry).filter(Entry.id == entry_id, Entry.is_deleted == False).first()  # noqa: E712
+@db_route
+def update_entry(
+    entry_id: UUID,
+    payload: EntryUpdate,
+    db: Session = Depends(get_db),
+    user_id: str = Depends(get_current_user_id),
+):
+    entry = (
+        db.query(Entry)
+        .filter(
+            Entry.id == entry_id,
+            Entry.user_id == user_id,
+            Entry.is_deleted == False,  # noqa: E712
+        )
+        .with_for_update()
+        .first()
+    )
     if not entry:
         raise HTTPException(status_code=404, detail="Entry not found")
 
+    before = rollup_snapshot(entry)
+    learned = mapping(entry)
     data = payload.model_dump(exclude_unset=True)
 
     # If date changes, recalc month/year
@@ -67,20 +464,39 @@ def update_entry(entry_id: UUID, payload: EntryUpdate, db: Session = Depends(get
 
     for k, v in data.items():
         setattr(entry, k, v)
+    entry.fingerprint = fingerprint(entry.type, entry.amount, entry.name)
+    if data.keys() & {"date", "amount", "currency"}:
+        entry.amount_base = amount_base(db, entry.currency, entry.amount, entry.date)
 
+    apply_rollup_change(db, before, rollup_snapshot(entry))
+    version = bump_data_version(db, user_id)
     db.commit()
+    categorization.record(user_id, version, removed=[learned], added=[mapping(entry)])
     db.refresh(entry)
     return entry
 
 
 
 @router.put("/{entry_id}", response_model=EntryOut)
-def replace_entry(entry_id: UUID, payload: EntryCreate, db: Session = Depends(get_db)):
-    entry = db.query(Entry).filter(Entry.id == entry_id).first()
+@db_route
+def replace_entry(
+    entry_id: UUID,
+    payload: EntryCreate,
+    db: Session = Depends(get_db),
+    user_id: str = Depends(get_current_user_id),
+):
+    entry = (
+        db.query(Entry)
+        .filter(Entry.id == entry_id, Entry.user_id == user_id)
+        .with_for_update()
+        .first()
+    )
     if not entry:
         raise HTTPException(status_code=404, detail="Entry not found")
 
-    # ✅ keep entry.user_id as-is (don’t overwrite)
+    before = rollup_snapshot(entry)
+    learned = mapping(entry)
+
     entry.date = payload.date
     entry.type = payload.type
     entry.name = payload.name
@@ -90,46 +506,92 @@ def replace_entry(entry_id: UUID, payload: EntryCreate, db: Session = Depends(ge
     entry.notes = payload.notes
     entry.year = payload.date.year
     entry.month = payload.date.month
+    entry.fingerprint = fingerprint(payload.type, payload.amount, payload.name)
+    entry.amount_base = amount_base(db, payload.currency, payload.amount, payload.date)
 
+    apply_rollup_change(db, before, rollup_snapshot(entry))
+    version = bump_data_version(db, user_id)
     db.commit()
+    categorization.record(user_id, version, removed=[learned], added=[mapping(entry)])
     db.refresh(entry)
     return entry
 
 @router.delete("/{entry_id}")
-def delete_entry(entry_id: UUID, db: Session = Depends(get_db)):
-    
-    
-    print("Attempting to delete entry with ID:", entry_id)
-    entry = db.query(Entry).filter(Entry.id == str(entry_id)).first()
+@db_route
+def delete_entry(entry_id: UUID, db: Session = Depends(get_db), user_id: str = Depends(get_current_user_id)):
+    entry = (
+        db.query(Entry)
+        .filter(Entry.id == entry_id, Entry.user_id == user_id)
+        .with_for_update()
+        .first()
+    )
     if not entry:
         raise HTTPException(status_code=404, detail="Entry not found")
 
+    if entry.is_deleted:
+        # nothing changes, so ETags and the categorizer cache stay valid
+        return {"deleted": True, "id": str(entry_id), "mode": "soft"}
+
+    before = rollup_snapshot(entry)
+    learned = mapping(entry)
     entry.is_deleted = True
+    entry.deleted_at = func.now()
+    apply_rollup_change(db, before, None)
+    version = bump_data_version(db, user_id)
     db.commit()
+    categorization.record(user_id, version, removed=[learned])
     return {"deleted": True, "id": str(entry_id), "mode": "soft"}
 
 
-@router.get("/by-user", response_model=list[EntryOut])
+@router.post("/{entry_id}/restore", response_model=EntryOut)
+@db_route
+def restore_entry(entry_id: UUID, db: Session = Depends(get_db), user_id: str = Depends(get_current_user_id)):
+    """Undo a delete, including one already moved to entries_archive by compaction."""
+    entry = (
+        db.query(Entry)
+        .filter(Entry.id == entry_id, Entry.user_id == user_id)
+        .with_for_update()
+        .first()
+    )
+    if entry is None:
+        entry = unarchive_entry(db, user_id, entry_id)
+    if entry is None:
+        raise HTTPException(status_code=404, detail="Entry not found")
+    if not entry.is_deleted:
+        return entry
+
+    entry.is_deleted = False
+    entry.deleted_at = None
+    apply_rollup_change(db, None, rollup_snapshot(entry))
+    version = bump_data_version(db, user_id)
+    db.commit()
+    categorization.record(user_id, version, added=[mapping(entry)])
+    db.refresh(entry)
+    return entry
+
+
+@router.get("/by-user", response_model=list[EntryOut], dependencies=[Depends(user_data_etag())])
+@db_route
 def list_entries_by_user(
-    user_id: str = Query(...),
+    response: Response,
+    user_id: str = Depends(get_current_user_id),
     db: Session = Depends(get_db),
-    year: int | None = Query(default=None),
-    month: int | None = Query(default=None),
+    year: int | None = Query(default=None, ge=1, le=9998),
+    month: int | None = Query(default=None, ge=1, le=12),
     type: str | None = Query(default=None),
-    limit: int = Query(default=100, le=500),
+    limit: int = Query(default=100, ge=1, le=500),
+    cursor: str | None = Query(default=None, description=f"value of {NEXT_CURSOR_HEADER} from the previous page"),
+    fields: str | None = Query(default=None, description=FIELDS_DESCRIPTION),
 ):
-    q = db.query(Entry).filter(
+    names = parse_fields(fields, EntryOut)
+    q = db.query(*entry_columns(names)).filter(
         Entry.is_deleted == False,  # noqa: E712
         Entry.user_id == user_id,
     )
 
-    if year is not None:
-        q = q.filter(Entry.year == year)
-
-    if month is not None:
-        q = q.filter(Entry.month == month)
+    q = filter_period(q, year, month)
 
     if type is not None:
         q = q.filter(Entry.type == type)
 
-    return q.order_by(Entry.date.desc()).limit(limit).all()
\ No newline at end of file
+    return json_rows(paginate(q, response, limit, cursor), names, response)
\ No newline at end of file
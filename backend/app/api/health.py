@@ -0,0 +1,70 @@
+import time
+
+from fastapi import APIRouter
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import JSONResponse
+from sqlalchemy import text
+
+from app.core.config import settings
+from app.db.pool_stats import all_stats
+from app.db.session import engine
+
+router = APIRouter(tags=["health"])
+
+
+@router.get("/health")
+def health():
+    return {"status": "ok"}
+
+
+def _sync_ping() -> None:
+    with engine.connect() as conn:
+        conn.execute(text("SELECT 1"))
+
+
+async def _ping() -> None:
+    if settings.DB_ASYNC:
+        from app.db.async_session import async_engine
+
+        async with async_engine.connect() as conn:
+            await conn.execute(text("SELECT 1"))
+    else:
+        await run_in_threadpool(_sync_ping)
+
+
+def _pools() -> dict:
+    pools = {"sync": engine.pool}
+    if settings.DB_ASYNC:
+        from app.db.async_session import async_engine
+
+        pools["async"] = async_engine.sync_engine.pool
+
+    return {name: stats.snapshot(pools.get(name)) for name, stats in all_stats().items()}
+
+
+@router.get("/health/db")
+async def health_db():
+    """Database reachability plus live pool counters for sizing the pools."""
+    started = time.perf_counter()
+    error = None
+    try:
+        await _ping()
+    except Exception as e:  # report, don't raise: this is a probe
+        error = f"{type(e).__name__}: {e}"
+    ping_ms = (time.perf_counter() - started) * 1000
+
+    body = {
+        "status": "ok" if error is None else "error",
+        "mode": "async" if settings.DB_ASYNC else "sync",
+        "ping_ms": ping_ms,
+        "error": error,
+        "config": {
+            "pool_size": settings.DB_POOL_SIZE,
+            "max_overflow": settings.DB_MAX_OVERFLOW,
+            "pool_timeout": settings.DB_POOL_TIMEOUT,
+            "pool_recycle": settings.DB_POOL_RECYCLE,
+            "pgbouncer": settings.DB_PGBOUNCER,
+        },
+        "pools": _pools(),
+    }
+    return JSONResponse(body, status_code=200 if error is None else 503)
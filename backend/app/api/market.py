@@ -0,0 +1,119 @@
+import asyncio
+from datetime import date, datetime, timedelta, timezone
+
+import orjson
+from fastapi import APIRouter, Depends, HTTPException, Query, Response
+from fastapi.concurrency import run_in_threadpool
+from sqlalchemy.orm import Session
+
+from app.api.deps import db_session, get_current_user_id, get_db, run_db
+from app.core.price_providers import ProviderError, get_provider
+from app.crud import market_prices
+
+router = APIRouter(prefix="/market", tags=["market"])
+
+MAX_RANGE_DAYS = 10 * 366
+SYMBOL_PATTERN = r"^[A-Za-z0-9.^=\-]{1,20}$"
+
+# symbol -> the refresh currently running for it in this worker
+_inflight: dict[str, asyncio.Task] = {}
+
+
+async def _refresh(symbol: str, start: date, end: date, today: date) -> None:
+    # its own session: the task may outlive the request that started it
+    async with db_session() as db:
+        coverage = await run_db(db, market_prices.lock_coverage, symbol)
+        plan = market_prices.plan_fetch(coverage, start, end, today)
+        if not plan:
+            return  # another worker fetched it while we waited for the lock
+
+        provider = get_provider()
+        prices = []
+        for a, b in plan:
+            prices += await run_in_threadpool(provider.fetch, symbol, a, b)
+        await run_db(db, market_prices.store, symbol, coverage, plan, prices)
+
+
+async def _run_refresh(symbol: str, start: date, end: date, today: date) -> None:
+    try:
+        await _refresh(symbol, start, end, today)
+    finally:
+        _inflight.pop(symbol, None)
+
+
+async def refresh(symbol: str, start: date, end: date, today: date) -> None:
+    """Fetch what the store lacks of [start, end], at most once at a time per symbol.
+
+    Requests arriving while a refresh of the same symbol is running wait for
+    it instead of starting their own; the caller re-checks coverage after.
+    Across workers the symbol's row lock does the same job.
+    """
+    task = _inflight.get(symbol)
+    if task is None:
+        task = asyncio.ensure_future(_run_refresh(symbol, start, end, today))
+        _inflight[symbol] = task
+    # shielded: a disconnecting client must not cancel a fetch others wait on
+    await asyncio.shield(task)
+
+
+async def ensure_covered(db, symbol: str, start: date, end: date, today: date) -> list:
+    """Stored (date, close) rows of [start, end], refreshing the store first if it lacks any.
+
+    Raises ProviderError when the provider fails.
+    """
+    plan, rows = await run_db(db, market_prices.load, symbol, start, end, today)
+    if not plan:
+        return rows
+
+    # give the connection back while the provider is called
+    await run_db(db, Session.rollback)
+    # twice: the first may only have waited on someone else's narrower range
+    for _ in range(2):
+        await refresh(symbol, start, end, today)
+        plan, rows = await run_db(db, market_prices.load, symbol, start, end, today)
+        if not plan:
+            break
+    return rows
+
+
+@router.get("/prices", dependencies=[Depends(get_current_user_id)])
+async def prices(
+    db: Session = Depends(get_db),
+    symbol: str = Query(..., pattern=SYMBOL_PATTERN, description="e.g. XIU.TO"),
+    start: date | None = Query(default=None, description="default: a year before end"),
+    end: date | None = Query(default=None, description="default: today (UTC)"),
+):
+    """Daily closes for ``symbol`` as parallel ``dates``/``closes`` arrays.
+
+    Served from the shared market_prices table. Only dates never asked of the
+    provider are fetched (plus the last stored day once a day), so a symbol
+    costs one upstream call per day however many users chart it.
+    """
+    symbol = symbol.upper()
+    today = datetime.now(timezone.utc).date()
+    end = min(end or today, today)
+    start = start or end - timedelta(days=365)
+    if start > end or (end - start).days > MAX_RANGE_DAYS:
+        raise HTTPException(status_code=422, detail=f"start must be before end, at most {MAX_RANGE_DAYS} days apart")
+
+    try:
+        rows = await ensure_covered(db, symbol, start, end, today)
+    except ProviderError as e:
+        raise HTTPException(status_code=502, detail=str(e))
+
+    closes = [close for _, close in rows]
+    body = {
+        "symbol": symbol,
+        "start": start,
+        "end": end,
+        "dates": [d for d, _ in rows],
+        "closes": closes,
+        "last": closes[-1] if closes else None,
+        "prev_close": closes[-2] if len(closes) > 1 else None,
+        "as_of": rows[-1][0] if rows else None,
+    }
+    return Response(
+        content=orjson.dumps(body),
+        media_type="application/json",
+        headers={"Cache-Control": "private, max-age=300"},
+    )
@@ -0,0 +1,113 @@
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response
+from sqlalchemy.orm import Session
+
+from app.api.analytics import compute_summary
+from app.api.caching import check_etag, data_etag
+from app.api.deps import db_route, get_current_user_id, get_db
+from app.api.entries import page
+from app.api.user_roadmap import user_roadmap_steps
+from app.crud.roadmap_catalog import CATALOG_NAME
+from app.models import Entry, UserDebt, UserInvestment, UserSavingGoal, UserStepMetric
+from app.schemas.bootstrap import BootstrapOut
+
+router = APIRouter(prefix="/me", tags=["me"])
+
+SECTIONS = ("entries", "summary", "roadmap", "metrics", "debts", "goals", "investments")
+
+# Every section reads the same MVCC snapshot, so the dashboard never shows
+# e.g. an entry whose effect is missing from the summary.
+SNAPSHOT = {"isolation_level": "REPEATABLE READ", "postgresql_readonly": True}
+
+
+def parse_include(include: list[str] | None) -> list[str]:
+    """Accept ``include=a,b`` as well as ``include=a&include=b``; default is everything."""
+    if not include:
+        return list(SECTIONS)
+
+    wanted = {part.strip() for value in include for part in value.split(",") if part.strip()}
+    unknown = wanted - set(SECTIONS)
+    if unknown:
+        raise HTTPException(
+            status_code=422,
+            detail=f"Unknown include section(s): {', '.join(sorted(unknown))}; expected {', '.join(SECTIONS)}",
+        )
+    return [s for s in SECTIONS if s in wanted]
+
+
+@router.get(
+    "/bootstrap",
+    response_model=BootstrapOut,
+    response_model_exclude_none=True,
+)
+@db_route
+def bootstrap(
+    request: Request,
+    response: Response,
+    db: Session = Depends(get_db),
+    user_id: str = Depends(get_current_user_id),
+    include: list[str] | None = Query(default=None, description=f"sections to return: {', '.join(SECTIONS)}"),
+    entries_limit: int = Query(default=100, ge=1, le=500),
+    summary_months: int = Query(default=3, ge=1, le=24),
+):
+    """Everything the dashboard needs on first paint, in one request.
+
+    All sections share one pooled connection and one read-only snapshot
+    transaction instead of a request, session and checkout each.
+    """
+    sections = parse_include(include)
+    # the snapshot has to be chosen before the session's first statement,
+    # so the ETag is checked here, from the same snapshot as the body
+    db.connection(execution_options=SNAPSHOT)
+    check_etag(request, response, data_etag(db, user_id, CATALOG_NAME))
+
+    data: dict = {}
+
+    if "entries" in sections:
+        q = db.query(Entry).filter(
+            Entry.is_deleted == False,  # noqa: E712
+            Entry.user_id == user_id,
+        )
+        data["entries"], data["entries_next_cursor"] = page(q, entries_limit, None)
+
+    if "summary" in sections:
+        data["summary"] = compute_summary(db, user_id, summary_months)
+
+    if "roadmap" in sections:
+        data["roadmap"] = user_roadmap_steps(db, user_id)
+
+    if "metrics" in sections:
+        data["metrics"] = (
+            db.query(UserStepMetric)
+            .filter(UserStepMetric.user_id == user_id)
+            .order_by(UserStepMetric.updated_at.desc())
+            .all()
+        )
+
+    if "debts" in sections:
+        data["debts"] = (
+            db.query(UserDebt)
+            .filter(UserDebt.user_id == user_id)
+            .order_by(UserDebt.updated_at.desc())
+            .all()
+        )
+
+    if "goals" in sections:
+        data["goals"] = (
+            db.query(UserSavingGoal)
+            .filter(UserSavingGoal.user_id == user_id)
+            .order_by(UserSavingGoal.created_at.asc())
+            .all()
+        )
+
+    if "investments" in sections:
+        data["investments"] = (
+            db.query(UserInvestment)
+            .filter(UserInvestment.user_id == user_id)
+            .order_by(UserInvestment.updated_at.desc())
+            .all()
+        )
+
+    # serialize while the rows are still loaded, then end the snapshot
+    out = BootstrapOut.model_validate(data, from_attributes=True)
+    db.rollback()
+    return out
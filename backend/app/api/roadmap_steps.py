@@ -1,22 +1,34 @@
-from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response
 from sqlalchemy.orm import Session
-from app.api.deps import get_db
+from app.api.caching import etag_matches, not_modified, set_etag
+from app.api.deps import db_route, get_db, run_db
+from app.crud import roadmap_catalog
+from app.crud.user_progress import provision_progress
 from app.models import RoadmapStep
 from app.schemas.roadmap_step import RoadmapStepCreate, RoadmapStepUpdate, RoadmapStepOut
 
 router = APIRouter(prefix="/roadmap-steps", tags=["roadmap_steps"])
 
 @router.get("", response_model=list[RoadmapStepOut])
-def list_steps(
+async def list_steps(
+    request: Request,
+    response: Response,
     db: Session = Depends(get_db),
     active_only: bool = Query(default=True),
 ):
-    q = db.query(RoadmapStep)
-    if active_only:
-        q = q.filter(RoadmapStep.is_active == True)  # noqa: E712
-    return q.order_by(RoadmapStep.step_order.asc()).all()
+    # served from the per-worker catalog cache; the DB is only touched to
+    # re-check the catalog version every CATALOG_RECHECK_SECONDS
+    catalog = roadmap_catalog.peek() or await run_db(db, roadmap_catalog.load)
+
+    etag = catalog.etag(active_only)
+    if etag_matches(request, etag):
+        return not_modified(etag)
+
+    set_etag(response, etag)
+    return catalog.select(active_only)
 
 @router.post("", response_model=RoadmapStepOut)
+@db_route
 def create_step(payload: RoadmapStepCreate, db: Session = Depends(get_db)):
     exists = db.query(RoadmapStep).filter(RoadmapStep.key == payload.key).first()
     if exists:
@@ -24,11 +36,16 @@ def create_step(payload: RoadmapStepCreate, db: Session = Depends(get_db)):
 
     step = RoadmapStep(**payload.model_dump())
     db.add(step)
+    db.flush()
+    provision_progress(db, step_key=step.key)
+    roadmap_catalog.bump_version(db)
     db.commit()
+    roadmap_catalog.invalidate()
     db.refresh(step)
     return step
 
 @router.patch("/{step_id}", response_model=RoadmapStepOut)
+@db_route
 def update_step(step_id, payload: RoadmapStepUpdate, db: Session = Depends(get_db)):
     step = db.query(RoadmapStep).filter(RoadmapStep.id == step_id).first()
     if not step:
@@ -38,15 +55,20 @@ def update_step(step_id, payload: RoadmapStepUpdate, db: Session = Depends(get_d
     for k, v in data.items():
         setattr(step, k, v)
 
+    roadmap_catalog.bump_version(db)
     db.commit()
+    roadmap_catalog.invalidate()
     db.refresh(step)
     return step
 
 @router.delete("/{step_id}")
+@db_route
 def delete_step(step_id, db: Session = Depends(get_db)):
     step = db.query(RoadmapStep).filter(RoadmapStep.id == step_id).first()
     if not step:
         raise HTTPException(status_code=404, detail="Step not found")
     db.delete(step)
+    roadmap_catalog.bump_version(db)
     db.commit()
-    return {"deleted": True, "id": str(step_id)}
\ No newline at end of file
+    roadmap_catalog.invalidate()
+    return {"deleted": True, "id": str(step_id)}
@@ -0,0 +1,57 @@
+"""Column-projected list responses.
+
+List endpoints select only the columns their ``*Out`` schema (or the
+``fields=`` subset of it) needs, as plain rows, and encode them straight to
+JSON with orjson. No ORM instances are built and the response is not
+re-validated through ``response_model``, which stays on the route for the
+OpenAPI schema only.
+"""
+from collections.abc import Iterable, Sequence
+
+import orjson
+from fastapi import HTTPException, Response
+from pydantic import BaseModel
+from sqlalchemy import Float, Numeric, cast
+
+FIELDS_DESCRIPTION = "comma-separated subset of the response fields, e.g. id,date,amount (default: all)"
+
+
+def parse_fields(fields: str | None, schema: type[BaseModel]) -> list[str]:
+    """Field names to return, in schema order; 400 on names the schema lacks."""
+    if not fields:
+        return list(schema.model_fields)
+
+    wanted = {f.strip() for f in fields.split(",") if f.strip()}
+    unknown = sorted(wanted - schema.model_fields.keys())
+    if unknown or not wanted:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Unknown fields: {', '.join(unknown) or fields!r}",
+        )
+    return [name for name in schema.model_fields if name in wanted]
+
+
+def columns(model, names: Iterable[str]) -> list:
+    """Mapped columns for ``names``; Numeric ones are cast to float like the schemas."""
+    out = []
+    for name in names:
+        col = getattr(model, name)
+        if isinstance(col.type, Numeric) and not isinstance(col.type, Float):
+            col = cast(col, Float).label(name)
+        out.append(col)
+    return out
+
+
+def json_rows(rows: Iterable[Sequence], names: Sequence[str], response: Response) -> Response:
+    """Encode ``rows`` as a JSON list of objects keyed by ``names``.
+
+    Rows may carry extra trailing columns (e.g. pagination keys) that are not
+    emitted. Headers already set on the injected ``response`` (ETag, cursor)
+    are carried over.
+    """
+    body = orjson.dumps([dict(zip(names, row)) for row in rows])
+    out = Response(content=body, media_type="application/json")
+    for key, value in response.headers.items():
+        if key not in ("content-length", "content-type"):
+            out.headers.append(key, value)
+    return out
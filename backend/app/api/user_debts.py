@@ -1,40 +1,60 @@
-from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi import APIRouter, Depends, HTTPException, Query, Response
 from sqlalchemy.orm import Session
 from uuid import UUID
 
-from app.api.deps import get_db
+from app.api.caching import user_data_etag
+from app.api.deps import db_route, get_current_user_id, get_db
+from app.api.rows import FIELDS_DESCRIPTION, columns, json_rows, parse_fields
+from app.crud.data_version import bump_data_version
 from app.models import UserDebt
 from app.schemas.user_debt import UserDebtOut, UserDebtCreate, UserDebtPatch
 
 router = APIRouter(prefix="/user-debts", tags=["user_debts"])
 
 
-@router.get("", response_model=list[UserDebtOut])
+@router.get("", response_model=list[UserDebtOut], dependencies=[Depends(user_data_etag())])
+@db_route
 def list_debts(
+    response: Response,
     db: Session = Depends(get_db),
-    user_id: str = Query(...),
+    user_id: str = Depends(get_current_user_id),
     step_key: str = Query(...),
+    fields: str | None = Query(default=None, description=FIELDS_DESCRIPTION),
 ):
-    return (
-        db.query(UserDebt)
+    names = parse_fields(fields, UserDebtOut)
+    rows = (
+        db.query(*columns(UserDebt, names))
         .filter(UserDebt.user_id == user_id, UserDebt.step_key == step_key)
         .order_by(UserDebt.updated_at.desc())
         .all()
     )
+    return json_rows(rows, names, response)
 
 
 @router.post("", response_model=UserDebtOut)
-def create_debt(payload: UserDebtCreate, db: Session = Depends(get_db)):
-    row = UserDebt(**payload.model_dump())
+@db_route
+def create_debt(
+    payload: UserDebtCreate,
+    db: Session = Depends(get_db),
+    user_id: str = Depends(get_current_user_id),
+):
+    row = UserDebt(**{**payload.model_dump(), "user_id": user_id})
     db.add(row)
+    bump_data_version(db, user_id)
     db.commit()
     db.refresh(row)
     return row
 
 
 @router.patch("/{debt_id}", response_model=UserDebtOut)
-def patch_debt(debt_id: UUID, payload: UserDebtPatch, db: Session = Depends(get_db)):
-    row = db.query(UserDebt).filter(UserDebt.id == debt_id).first()
+@db_route
+def patch_debt(
+    debt_id: UUID,
+    payload: UserDebtPatch,
+    db: Session = Depends(get_db),
+    user_id: str = Depends(get_current_user_id),
+):
+    row = db.query(UserDebt).filter(UserDebt.id == debt_id, UserDebt.user_id == user_id).first()
     if not row:
         raise HTTPException(status_code=404, detail="Debt not found")
 
@@ -43,17 +63,21 @@ def patch_debt(debt_id: UUID, payload: UserDebtPatch, db: Session = Depends(get_
         if v is not None:
             setattr(row, k, v)
 
+    bump_data_version(db, user_id)
+
     db.commit()
     db.refresh(row)
     return row
 
 
 @router.delete("/{debt_id}")
-def delete_debt(debt_id: UUID, db: Session = Depends(get_db)):
-    row = db.query(UserDebt).filter(UserDebt.id == debt_id).first()
+@db_route
+def delete_debt(debt_id: UUID, db: Session = Depends(get_db), user_id: str = Depends(get_current_user_id)):
+    row = db.query(UserDebt).filter(UserDebt.id == debt_id, UserDebt.user_id == user_id).first()
     if not row:
         raise HTTPException(status_code=404, detail="Debt not found")
 
     db.delete(row)
+    bump_data_version(db, user_id)
     db.commit()
     return {"deleted": True, "id": str(debt_id)}
\ No newline at end of file
@@ -1,7 +1,11 @@
-from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi import APIRouter, Depends, HTTPException, Query, Response
 from sqlalchemy.orm import Session
 
-from app.api.deps import get_db
+from app.api.caching import user_data_etag
+from app.api.deps import db_route, get_current_user_id, get_db
+from app.api.rows import FIELDS_DESCRIPTION, columns, json_rows, parse_fields
+from app.crud import portfolio_valuation
+from app.crud.data_version import bump_data_version
 from app.models import UserInvestment
 from app.schemas.user_investments import (
     UserInvestmentCreate,
@@ -11,14 +15,18 @@ from app.schemas.user_investments import (
 router = APIRouter(prefix="/user-investments", tags=["user_investments"])
 
 
-@router.get("", response_model=list[UserInvestmentOut])
+@router.get("", response_model=list[UserInvestmentOut], dependencies=[Depends(user_data_etag())])
+@db_route
 def list_user_investments(
+    response: Response,
     db: Session = Depends(get_db),
-    user_id: str = Query(...),
+    user_id: str = Depends(get_current_user_id),
     step_key: str = Query(default="invest"),
+    fields: str | None = Query(default=None, description=FIELDS_DESCRIPTION),
 ):
-    return (
-        db.query(UserInvestment)
+    names = parse_fields(fields, UserInvestmentOut)
+    rows = (
+        db.query(*columns(UserInvestment, names))
         .filter(
             UserInvestment.user_id == user_id,
             UserInvestment.step_key == step_key,
@@ -26,37 +34,65 @@ def list_user_investments(
         .order_by(UserInvestment.updated_at.desc())
         .all()
     )
+    return json_rows(rows, names, response)
 
 
 @router.post("", response_model=UserInvestmentOut)
-def create_user_investment(payload: UserInvestmentCreate, db: Session = Depends(get_db)):
-    row = UserInvestment(**payload.model_dump())
+@db_route
+def create_user_investment(
+    payload: UserInvestmentCreate,
+    db: Session = Depends(get_db),
+    user_id: str = Depends(get_current_user_id),
+):
+    row = UserInvestment(**{**payload.model_dump(), "user_id": user_id})
     db.add(row)
+    bump_data_version(db, user_id)
     db.commit()
+    portfolio_valuation.invalidate(user_id)
     db.refresh(row)
     return row
 
 
 @router.patch("/{investment_id}", response_model=UserInvestmentOut)
-def patch_user_investment(investment_id: str, payload: UserInvestmentPatch, db: Session = Depends(get_db)):
-    row = db.query(UserInvestment).filter(UserInvestment.id == investment_id).first()
+@db_route
+def patch_user_investment(
+    investment_id: str,
+    payload: UserInvestmentPatch,
+    db: Session = Depends(get_db),
+    user_id: str = Depends(get_current_user_id),
+):
+    row = (
+        db.query(UserInvestment)
+        .filter(UserInvestment.id == investment_id, UserInvestment.user_id == user_id)
+        .first()
+    )
     if not row:
         raise HTTPException(status_code=404, detail="Investment not found")
 
     for key, value in payload.model_dump(exclude_unset=True).items():
         setattr(row, key, value)
 
+    bump_data_version(db, user_id)
+
     db.commit()
+    portfolio_valuation.invalidate(user_id)
     db.refresh(row)
     return row
 
 
 @router.delete("/{investment_id}")
-def delete_user_investment(investment_id: str, db: Session = Depends(get_db)):
-    row = db.query(UserInvestment).filter(UserInvestment.id == investment_id).first()
+@db_route
+def delete_user_investment(investment_id: str, db: Session = Depends(get_db), user_id: str = Depends(get_current_user_id)):
+    row = (
+        db.query(UserInvestment)
+        .filter(UserInvestment.id == investment_id, UserInvestment.user_id == user_id)
+        .first()
+    )
     if not row:
         raise HTTPException(status_code=404, detail="Investment not found")
 
     db.delete(row)
+    bump_data_version(db, user_id)
     db.commit()
+    portfolio_valuation.invalidate(user_id)
     return {"deleted": True, "id": investment_id}
\ No newline at end of file
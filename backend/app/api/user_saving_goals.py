@@ -1,8 +1,11 @@
 from uuid import UUID
-from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi import APIRouter, Depends, HTTPException, Query, Response
 from sqlalchemy.orm import Session
 
-from app.api.deps import get_db
+from app.api.caching import user_data_etag
+from app.api.deps import db_route, get_current_user_id, get_db
+from app.api.rows import FIELDS_DESCRIPTION, columns, json_rows, parse_fields
+from app.crud.data_version import bump_data_version
 from app.models import UserSavingGoal
 from app.schemas.user_saving_goal import (
     UserSavingGoalCreate,
@@ -13,14 +16,18 @@ from app.schemas.user_saving_goal import (
 router = APIRouter(prefix="/user-saving-goals", tags=["user_saving_goals"])
 
 
-@router.get("", response_model=list[UserSavingGoalOut])
+@router.get("", response_model=list[UserSavingGoalOut], dependencies=[Depends(user_data_etag())])
+@db_route
 def list_user_saving_goals(
+    response: Response,
     db: Session = Depends(get_db),
-    user_id: str = Query(...),
+    user_id: str = Depends(get_current_user_id),
     step_key: str = Query(default="automate"),
+    fields: str | None = Query(default=None, description=FIELDS_DESCRIPTION),
 ):
-    return (
-        db.query(UserSavingGoal)
+    names = parse_fields(fields, UserSavingGoalOut)
+    rows = (
+        db.query(*columns(UserSavingGoal, names))
         .filter(
             UserSavingGoal.user_id == user_id,
             UserSavingGoal.step_key == step_key,
@@ -28,27 +35,37 @@ def list_user_saving_goals(
         .order_by(UserSavingGoal.created_at.asc())
         .all()
     )
+    return json_rows(rows, names, response)
 
 
 @router.post("", response_model=UserSavingGoalOut)
+@db_route
 def create_user_saving_goal(
     payload: UserSavingGoalCreate,
     db: Session = Depends(get_db),
+    user_id: str = Depends(get_current_user_id),
 ):
-    row = UserSavingGoal(**payload.model_dump())
+    row = UserSavingGoal(**{**payload.model_dump(), "user_id": user_id})
     db.add(row)
+    bump_data_version(db, user_id)
     db.commit()
     db.refresh(row)
     return row
 
 
 @router.patch("/{goal_id}", response_model=UserSavingGoalOut)
+@db_route
 def patch_user_saving_goal(
     goal_id: UUID,
     payload: UserSavingGoalPatch,
     db: Session = Depends(get_db),
+    user_id: str = Depends(get_current_user_id),
 ):
-    row = db.query(UserSavingGoal).filter(UserSavingGoal.id == goal_id).first()
+    row = (
+        db.query(UserSavingGoal)
+        .filter(UserSavingGoal.id == goal_id, UserSavingGoal.user_id == user_id)
+        .first()
+    )
     if not row:
         raise HTTPException(status_code=404, detail="Goal not found")
 
@@ -57,20 +74,29 @@ def patch_user_saving_goal(
     for key, value in patch.items():
         setattr(row, key, value)
 
+    bump_data_version(db, user_id)
+
     db.commit()
     db.refresh(row)
     return row
 
 
 @router.delete("/{goal_id}")
+@db_route
 def delete_user_saving_goal(
     goal_id: UUID,
     db: Session = Depends(get_db),
+    user_id: str = Depends(get_current_user_id),
 ):
-    row = db.query(UserSavingGoal).filter(UserSavingGoal.id == goal_id).first()
+    row = (
+        db.query(UserSavingGoal)
+        .filter(UserSavingGoal.id == goal_id, UserSavingGoal.user_id == user_id)
+        .first()
+    )
     if not row:
         raise HTTPException(status_code=404, detail="Goal not found")
 
     db.delete(row)
+    bump_data_version(db, user_id)
     db.commit()
     return {"deleted": True, "id": str(goal_id)}
\ No newline at end of file
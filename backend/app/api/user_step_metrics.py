@@ -1,77 +1,53 @@
-from fastapi import APIRouter, Depends, Query
+from fastapi import APIRouter, Depends, Query, Response
 from sqlalchemy.orm import Session
 
-from app.api.deps import get_db
+from app.api.caching import user_data_etag
+from app.api.deps import db_route, get_current_user_id, get_db
+from app.api.rows import FIELDS_DESCRIPTION, columns, json_rows, parse_fields
+from app.crud.step_metrics import upsert_metrics
+from app.crud.data_version import bump_data_version
 from app.models import UserStepMetric
 from app.schemas.user_step_metric import UserStepMetricOut, UserStepMetricUpsert
 
 router = APIRouter(prefix="/user-step-metrics", tags=["user_step_metrics"])
 
-@router.get("", response_model=list[UserStepMetricOut])
+@router.get("", response_model=list[UserStepMetricOut], dependencies=[Depends(user_data_etag())])
+@db_route
 def list_metrics(
+    response: Response,
     db: Session = Depends(get_db),
-    user_id: str = Query(...),
+    user_id: str = Depends(get_current_user_id),
     step_key: str | None = Query(default=None),
+    fields: str | None = Query(default=None, description=FIELDS_DESCRIPTION),
 ):
-    q = db.query(UserStepMetric).filter(UserStepMetric.user_id == user_id)
+    names = parse_fields(fields, UserStepMetricOut)
+    q = db.query(*columns(UserStepMetric, names)).filter(UserStepMetric.user_id == user_id)
     if step_key is not None:
         q = q.filter(UserStepMetric.step_key == step_key)
-    return q.order_by(UserStepMetric.updated_at.desc()).all()
+    return json_rows(q.order_by(UserStepMetric.updated_at.desc()).all(), names, response)
 
 @router.put("", response_model=UserStepMetricOut)
-def upsert_metric(payload: UserStepMetricUpsert, db: Session = Depends(get_db)):
-    row = (
-        db.query(UserStepMetric)
-        .filter(
-            UserStepMetric.user_id == payload.user_id,
-            UserStepMetric.step_key == payload.step_key,
-            UserStepMetric.metric_key == payload.metric_key,
-        )
-        .first()
-    )
-
-    if row:
-        row.value_num = payload.value_num
-        # ✅ only overwrite when client sends it
-        if payload.value_text is not None:
-            row.value_text = payload.value_text
-    else:
-        row = UserStepMetric(**payload.model_dump())
-        db.add(row)
-
+@db_route
+def upsert_metric(
+    payload: UserStepMetricUpsert,
+    db: Session = Depends(get_db),
+    user_id: str = Depends(get_current_user_id),
+):
+    # ✅ value_text is only overwritten when the client sends it
+    (row,) = upsert_metrics(db, user_id, [payload])
+    bump_data_version(db, user_id)
     db.commit()
-    db.refresh(row)
     return row
 
 
-
 @router.put("/bulk", response_model=list[UserStepMetricOut])
-def bulk_upsert(payload: list[UserStepMetricUpsert], db: Session = Depends(get_db)):
-    out: list[UserStepMetric] = []
-
-    for item in payload:
-        row = (
-            db.query(UserStepMetric)
-            .filter(
-                UserStepMetric.user_id == item.user_id,
-                UserStepMetric.step_key == item.step_key,
-                UserStepMetric.metric_key == item.metric_key,
-            )
-            .first()
-        )
-
-        if row:
-            row.value_num = item.value_num
-            if item.value_text is not None:
-                row.value_text = item.value_text
-        else:
-            row = UserStepMetric(**item.model_dump())
-            db.add(row)
-
-        out.append(row)
-
+@db_route
+def bulk_upsert(
+    payload: list[UserStepMetricUpsert],
+    db: Session = Depends(get_db),
+    user_id: str = Depends(get_current_user_id),
+):
+    rows = upsert_metrics(db, user_id, payload)
+    bump_data_version(db, user_id)
     db.commit()
-    for r in out:
-        db.refresh(r)
-
-    return out
\ No newline at end of file
+    return rows
@@ -1,16 +1,20 @@
-from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi import APIRouter, Depends, HTTPException
 from sqlalchemy.orm import Session
 
-from app.api.deps import get_db
+from app.api.caching import user_data_etag
+from app.api.deps import db_route, get_current_user_id, get_db
+from app.crud.user_progress import upsert_progress
+from app.crud.data_version import bump_data_version
 from app.models import UserStepProgress
 from app.schemas.user_step_progress import UserStepProgressOut, UserStepProgressUpsert
 
 router = APIRouter(prefix="/user-steps-progress", tags=["user_steps_progress"])
 
-@router.get("", response_model=list[UserStepProgressOut])
+@router.get("", response_model=list[UserStepProgressOut], dependencies=[Depends(user_data_etag())])
+@db_route
 def list_user_progress(
     db: Session = Depends(get_db),
-    user_id: str = Query(...),
+    user_id: str = Depends(get_current_user_id),
 ):
     return (
         db.query(UserStepProgress)
@@ -19,11 +23,16 @@ def list_user_progress(
         .all()
     )
 
-@router.get("/{step_key}", response_model=UserStepProgressOut)
+@router.get(
+    "/{step_key}",
+    response_model=UserStepProgressOut,
+    dependencies=[Depends(user_data_etag())],
+)
+@db_route
 def get_step_progress(
     step_key: str,
     db: Session = Depends(get_db),
-    user_id: str = Query(...),
+    user_id: str = Depends(get_current_user_id),
 ):
     row = (
         db.query(UserStepProgress)
@@ -35,28 +44,23 @@ def get_step_progress(
     return row
 
 @router.put("", response_model=UserStepProgressOut)
-def upsert_step_progress(payload: UserStepProgressUpsert, db: Session = Depends(get_db)):
-    row = (
-        db.query(UserStepProgress)
-        .filter(UserStepProgress.user_id == payload.user_id, UserStepProgress.step_key == payload.step_key)
-        .first()
-    )
-
-    if row:
-        row.progress = payload.progress
-    else:
-        row = UserStepProgress(**payload.model_dump())
-        db.add(row)
-
+@db_route
+def upsert_step_progress(
+    payload: UserStepProgressUpsert,
+    db: Session = Depends(get_db),
+    user_id: str = Depends(get_current_user_id),
+):
+    row = upsert_progress(db, user_id, payload.step_key, payload.progress)
+    bump_data_version(db, user_id)
     db.commit()
-    db.refresh(row)
     return row
 
 @router.delete("/{step_key}")
+@db_route
 def delete_step_progress(
     step_key: str,
     db: Session = Depends(get_db),
-    user_id: str = Query(...),
+    user_id: str = Depends(get_current_user_id),
 ):
     row = (
         db.query(UserStepProgress)
@@ -67,5 +71,6 @@ def delete_step_progress(
         raise HTTPException(status_code=404, detail="Progress not found")
 
     db.delete(row)
+    bump_data_version(db, user_id)
     db.commit()
     return {"deleted": True, "user_id": user_id, "step_key": step_key}
\ No newline at end of file
@@ -1,42 +1,121 @@
 from fastapi import APIRouter, Depends, HTTPException, status
 from sqlalchemy.orm import Session
 
-from app.api.deps import get_db
+from app.api.deps import get_db, run_db
+from app.crud.user_progress import provision_progress
 from app.models import User
-from app.schemas.user import UserCreate, UserLogin, UserOut
-from app.core.security import hash_password, verify_password
+from app.schemas.user import AuthOut, RefreshIn, UserCreate, UserLogin
+from app.core.config import settings
+from app.core.security import (
+    HashPoolSaturated,
+    hash_password_async,
+    verify_and_update_async,
+)
+from app.core.tokens import (
+    InvalidToken,
+    create_access_token,
+    create_refresh_token,
+    decode_token,
+)
 
 router = APIRouter(prefix="/users", tags=["users"])
 
 
-@router.post("/signup", response_model=UserOut, status_code=status.HTTP_201_CREATED)
-def signup(payload: UserCreate, db: Session = Depends(get_db)):
-    email = payload.email.lower().strip()
-
-    existing = db.query(User).filter(User.email == email).first()
-    if existing:
-        raise HTTPException(status_code=400, detail="Email already exists")
+def _find_user(db: Session, email: str) -> User | None:
+    return db.query(User).filter(User.email == email).first()
 
-    user = User(
-        email=email,
-        hashed_password=hash_password(payload.password),
-    )
 
+def _create_user(db: Session, email: str, hashed_password: str) -> User:
+    user = User(email=email, hashed_password=hashed_password)
     db.add(user)
+    db.flush()
+    provision_progress(db, user_id=user.id)
     db.commit()
     db.refresh(user)
     return user
 
 
-@router.post("/login", response_model=UserOut)
-def login(payload: UserLogin, db: Session = Depends(get_db)):
+def _set_password_hash(db: Session, user: User, hashed_password: str) -> None:
+    user.hashed_password = hashed_password
+    db.commit()
+    db.refresh(user)
+
+
+def _session(user: User) -> AuthOut:
+    user_id = str(user.id)
+    return AuthOut(
+        id=user_id,
+        email=user.email,
+        access_token=create_access_token(user_id),
+        refresh_token=create_refresh_token(user_id),
+        expires_in=settings.ACCESS_TOKEN_TTL_SECONDS,
+    )
+
+
+def _busy() -> HTTPException:
+    return HTTPException(
+        status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+        detail="Too many sign-in attempts in progress, retry shortly",
+        headers={"Retry-After": "1"},
+    )
+
+
+@router.post("/signup", response_model=AuthOut, status_code=status.HTTP_201_CREATED)
+async def signup(payload: UserCreate, db: Session = Depends(get_db)):
+    email = payload.email.lower().strip()
+
+    existing = await run_db(db, _find_user, email)
+    if existing:
+        raise HTTPException(status_code=400, detail="Email already exists")
+
+    # bcrypt runs in the hash process pool, not on a request thread
+    try:
+        hashed = await hash_password_async(payload.password)
+    except HashPoolSaturated:
+        raise _busy()
+
+    user = await run_db(db, _create_user, email, hashed)
+    return _session(user)
+
+
+@router.post("/login", response_model=AuthOut)
+async def login(payload: UserLogin, db: Session = Depends(get_db)):
     email = payload.email.lower().strip()
 
-    user = db.query(User).filter(User.email == email).first()
+    user = await run_db(db, _find_user, email)
     if not user:
         raise HTTPException(status_code=404, detail="User does not exist")
 
-    if not verify_password(payload.password, user.hashed_password):
+    try:
+        ok, new_hash = await verify_and_update_async(payload.password, user.hashed_password)
+    except HashPoolSaturated:
+        raise _busy()
+
+    if not ok:
         raise HTTPException(status_code=401, detail="Incorrect password")
 
-    return user
\ No newline at end of file
+    # stored hash predates the configured cost: upgrade it transparently
+    if new_hash:
+        await run_db(db, _set_password_hash, user, new_hash)
+
+    return _session(user)
+
+
+def _get_user(db: Session, user_id: str) -> User | None:
+    return db.get(User, user_id)
+
+
+@router.post("/refresh", response_model=AuthOut)
+async def refresh(payload: RefreshIn, db: Session = Depends(get_db)):
+    """Trade a refresh token for a new access/refresh pair."""
+    try:
+        user_id = decode_token(payload.refresh_token, expected_typ="refresh")
+    except InvalidToken:
+        raise HTTPException(status_code=401, detail="Invalid or expired refresh token")
+
+    # refresh is rare, so this is the one place a deleted account is noticed
+    user = await run_db(db, _get_user, user_id)
+    if not user:
+        raise HTTPException(status_code=401, detail="User does not exist")
+
+    return _session(user)
@@ -0,0 +1,234 @@
+import re
+from collections import Counter
+from typing import Iterable, Literal
+
+Source = Literal["user", "rule"]
+
+FALLBACK_CATEGORY = "Other"
+
+# Merchant keywords per category, from the CSV importer's client-side map.
+# Matched as whole tokens, so spellings the old substring test caught
+# ("mcdonald" in "mcdonalds") are listed explicitly.
+EXPENSE_RULES: dict[str, list[str]] = {
+    "Travel": [
+        "uber", "lyft", "taxi", "cab", "airbnb", "expedia", "booking", "flight",
+        "westjet", "air canada", "gas", "petro", "petro canada", "shell", "esso",
+        "parking", "toll",
+    ],
+    "Groceries": [
+        "wal mart", "walmart", "costco", "superstore", "loblaws", "nofrills",
+        "no frills", "freshco", "metro", "sobeys", "whole foods", "food basics",
+        "grocery", "groceries",
+    ],
+    "Food": [
+        "mcdonald", "mcdonalds", "burger", "kfc", "subway", "pizza", "starbucks",
+        "tim hortons", "tims", "coffee", "cafe", "restaurant", "ubereats",
+        "uber eats", "doordash", "skip", "skipthedishes",
+    ],
+    "Shopping": [
+        "amazon", "ebay", "best buy", "apple", "samsung", "sony", "ikea",
+        "home depot", "canadian tire", "winners", "marshalls", "zara", "h m",
+        "nike", "adidas",
+    ],
+    "Utilities": [
+        "internet", "hydro", "electric", "water", "rogers", "bell", "telus",
+        "fido", "freedom", "koodo", "mobile", "wifi", "utility",
+    ],
+    "Rent": ["rent", "lease", "apartment", "condo", "mortgage", "property"],
+    "Transfer": [
+        "transfer", "etransfer", "e transfer", "interac", "deposit", "withdraw",
+        "withdrawal", "atm", "wire", "bank", "cibc", "rbc", "td", "scotia",
+        "payment", "pay",
+    ],
+    "Health": [
+        "pharmacy", "shoppers", "rexall", "clinic", "hospital", "dentist", "medical",
+    ],
+    "Subscriptions": [
+        "netflix", "spotify", "prime", "amazon prime", "icloud", "dropbox",
+        "adobe", "microsoft", "office", "zoom",
+    ],
+    "Insurance": ["insurance", "premium", "coverage", "intact", "aviva", "desjardins"],
+    "Education": [
+        "college", "university", "course", "udemy", "coursera", "tuition", "fees",
+    ],
+    "Entertainment": [
+        "movie", "cinema", "theatre", "imax", "ticketmaster", "steam", "xbox",
+        "playstation",
+    ],
+}
+
+INCOME_RULES: dict[str, list[str]] = {
+    "Salary": ["salary", "payroll", "pay cheque", "paycheque", "direct deposit", "wages"],
+    "Interest": ["interest", "dividend"],
+    "Refund": ["refund", "reversal", "cashback", "cash back", "rebate"],
+    "Transfer": ["transfer", "etransfer", "e transfer", "interac", "wire"],
+    "Freelance": ["upwork", "fiverr", "freelance", "invoice"],
+    "Investment": ["wealthsimple", "questrade", "distribution"],
+}
+
+_WORD = re.compile(r"[a-z0-9]+")
+_END = ""  # trie key of a phrase's value; tokens are never empty
+
+
+def tokens(text: str) -> list[str]:
+    """Lowercase alphanumeric words of ``text``, without pure numbers.
+
+    Store numbers, card suffixes and dates vary between statements of the
+    same merchant ("STARBUCKS #4821 04/12"), so they are not part of a key.
+    """
+    return [t for t in _WORD.findall(text.lower()) if not t.isdigit()]
+
+
+def phrase(text: str) -> tuple[str, ...]:
+    return tuple(tokens(text))
+
+
+def _insert(trie: dict, key: tuple[str, ...], value) -> None:
+    node = trie
+    for t in key:
+        node = node.setdefault(t, {})
+    node[_END] = value
+
+
+def _remove(trie: dict, key: tuple[str, ...]) -> None:
+    node = trie
+    for t in key:
+        node = node.get(t)
+        if node is None:
+            return
+    node.pop(_END, None)
+
+
+def _longest(trie: dict, words: list[str]):
+    """Value of the longest phrase in ``trie`` found in ``words``, the earliest on ties."""
+    best, best_len = None, 0
+    n = len(words)
+    for i in range(n):
+        node = trie.get(words[i])
+        if node is None:
+            continue
+        j = i + 1
+        while True:
+            value = node.get(_END)
+            if value is not None and j - i > best_len:
+                best, best_len = value, j - i
+            if j == n:
+                break
+            node = node.get(words[j])
+            if node is None:
+                break
+            j += 1
+    return best
+
+
+def compile_rules(rules: dict[str, list[str]]) -> dict:
+    """Token trie of ``rules``; a keyword listed twice keeps its first category."""
+    trie: dict = {}
+    for category, keywords in rules.items():
+        for keyword in keywords:
+            node = trie
+            for t in phrase(keyword):
+                node = node.setdefault(t, {})
+            if node is not trie:
+                node.setdefault(_END, category)
+    return trie
+
+
+GLOBAL_TRIES: dict[str, dict] = {
+    "expense": compile_rules(EXPENSE_RULES),
+    "income": compile_rules(INCOME_RULES),
+}
+
+
+class UserModel:
+    """What a user's own entries say each merchant phrase should be filed under.
+
+    Every live entry votes for its category under the phrase of its name; a
+    phrase maps to its most voted category and is matched anywhere in a
+    description, ahead of the global rules. Votes can be added and withdrawn
+    one entry at a time, so a recategorized entry updates one trie node
+    instead of recompiling the model.
+    """
+
+    def __init__(self):
+        self.votes: dict[tuple[str, tuple[str, ...]], Counter] = {}
+        self.tries: dict[str, dict] = {"expense": {}, "income": {}}
+
+    @classmethod
+    def from_counts(cls, rows: Iterable[tuple[str, str, str, int]]) -> "UserModel":
+        """Model of (type, name, category, entry count) rows."""
+        model = cls()
+        touched = set()
+        for type_, name, category, n in rows:
+            key = model._vote(type_, name, category, n)
+            if key is not None:
+                touched.add(key)
+        for key in touched:
+            model._publish(key)
+        return model
+
+    def _vote(self, type_: str, name: str, category: str, n: int):
+        if type_ not in self.tries or category == FALLBACK_CATEGORY:
+            return None  # the fallback carries no information about the merchant
+        words = phrase(name)
+        if not words:
+            return None
+        key = (type_, words)
+        counter = self.votes.setdefault(key, Counter())
+        counter[category] += n
+        if counter[category] <= 0:
+            del counter[category]
+        return key
+
+    def _publish(self, key) -> None:
+        type_, words = key
+        counter = self.votes.get(key)
+        if counter:
+            _insert(self.tries[type_], words, counter.most_common(1)[0][0])
+        else:
+            self.votes.pop(key, None)
+            _remove(self.tries[type_], words)
+
+    def update(self, removed: Iterable[tuple[str, str, str]], added: Iterable[tuple[str, str, str]]) -> None:
+        """Withdraw the votes of ``removed`` and add those of ``added`` (type, name, category)."""
+        touched = set()
+        for sign, mappings in ((-1, removed), (1, added)):
+            for type_, name, category in mappings:
+                key = self._vote(type_, name, category, sign)
+                if key is not None:
+                    touched.add(key)
+        for key in touched:
+            self._publish(key)
+
+
+def categorize(
+    names: list[str],
+    types: list[str],
+    model: UserModel | None = None,
+) -> tuple[list[str], list[Source | None]]:
+    """Category of each description, and whether the user's history or a rule chose it.
+
+    The user's phrases win over the global rules, and within each the
+    longest matching phrase wins. Unmatched descriptions get
+    FALLBACK_CATEGORY with no source. Repeated descriptions in a batch
+    (one merchant on many statement lines) are matched once.
+    """
+    user_tries = model.tries if model is not None else {}
+    categories: list[str] = []
+    sources: list[Source | None] = []
+    seen: dict[tuple[str, str], tuple[str, Source | None]] = {}
+
+    for name, type_ in zip(names, types):
+        hit = seen.get((type_, name))
+        if hit is None:
+            words = tokens(name)
+            category = _longest(user_tries.get(type_, {}), words)
+            if category is not None:
+                hit = (category, "user")
+            else:
+                category = _longest(GLOBAL_TRIES.get(type_, {}), words)
+                hit = (category, "rule") if category is not None else (FALLBACK_CATEGORY, None)
+            seen[(type_, name)] = hit
+        categories.append(hit[0])
+        sources.append(hit[1])
+    return categories, sources
@@ -0,0 +1,88 @@
+import os
+
+
+def env_bool(name: str, default: bool) -> bool:
+    raw = os.getenv(name)
+    if raw is None:
+        return default
+    return raw.strip().lower() in ("1", "true", "yes", "on")
+
+
+class Settings:
+    DATABASE_URL: str = os.getenv(
+        "DATABASE_URL",
+        "postgresql+psycopg2://postgres:postgres@db:5432/moneycompass",
+    )
+
+    # Routers run their DB work on AsyncSession + asyncpg by default; set
+    # DB_ASYNC=false to fall back to sync psycopg2 sessions on the threadpool.
+    DB_ASYNC: bool = env_bool("DB_ASYNC", True)
+
+    # Connection pool, per process and per engine (sync / async).
+    DB_POOL_SIZE: int = int(os.getenv("DB_POOL_SIZE", "5"))
+    DB_MAX_OVERFLOW: int = int(os.getenv("DB_MAX_OVERFLOW", "10"))
+    DB_POOL_TIMEOUT: float = float(os.getenv("DB_POOL_TIMEOUT", "30"))
+    DB_POOL_RECYCLE: int = int(os.getenv("DB_POOL_RECYCLE", "1800"))
+    DB_POOL_PRE_PING: bool = env_bool("DB_POOL_PRE_PING", True)
+
+    # Behind PgBouncer (transaction pooling): no client-side pool and no
+    # prepared statements, PgBouncer owns the server connections.
+    DB_PGBOUNCER: bool = env_bool("DB_PGBOUNCER", False)
+
+    # Schema changes go through Alembic (python -m app.db.init_db). Workers
+    # make no DB calls on boot unless this asks them to seed the catalog.
+    SEED_ON_STARTUP: bool = env_bool("SEED_ON_STARTUP", False)
+
+    # Yearly entries partitions are created by init_db and by running
+    # python -m app.db.partitions on a schedule (e.g. monthly from cron);
+    # it creates YEARS_AHEAD years in advance, so a missed run is harmless.
+    # Set this to also have every worker run it in the background on boot.
+    PARTITIONS_ON_STARTUP: bool = env_bool("PARTITIONS_ON_STARTUP", False)
+
+    # Password hashing. Raising BCRYPT_ROUNDS upgrades stored hashes on the
+    # user's next login. HASH_WORKERS=0 hashes on the threadpool instead of
+    # a process pool; HASH_MAX_PENDING caps queued hash jobs before 503s.
+    BCRYPT_ROUNDS: int = int(os.getenv("BCRYPT_ROUNDS", "12"))
+    HASH_WORKERS: int = int(os.getenv("HASH_WORKERS", str(os.cpu_count() or 1)))
+    HASH_MAX_PENDING: int = int(os.getenv("HASH_MAX_PENDING", "64"))
+
+    # How stale a worker's cached roadmap catalog may get before it re-reads
+    # the catalog version (writes on the same worker invalidate immediately).
+    CATALOG_RECHECK_SECONDS: float = float(os.getenv("CATALOG_RECHECK_SECONDS", "5"))
+
+    # Signed session tokens. JWT_SECRET signs new tokens; JWT_OLD_SECRETS
+    # (comma separated) still verify during a key rotation. There is no
+    # default: the app refuses to start without JWT_SECRET unless
+    # JWT_DEV_SECRET=true explicitly allows a well-known local-only key.
+    JWT_SECRET: str = os.getenv("JWT_SECRET", "")
+    JWT_DEV_SECRET: bool = env_bool("JWT_DEV_SECRET", False)
+    JWT_OLD_SECRETS: list[str] = [s for s in os.getenv("JWT_OLD_SECRETS", "").split(",") if s]
+    JWT_ALGORITHM: str = os.getenv("JWT_ALGORITHM", "HS256")
+    ACCESS_TOKEN_TTL_SECONDS: int = int(os.getenv("ACCESS_TOKEN_TTL_SECONDS", str(15 * 60)))
+    REFRESH_TOKEN_TTL_SECONDS: int = int(os.getenv("REFRESH_TOKEN_TTL_SECONDS", str(30 * 24 * 3600)))
+
+    # Working-array budget for one chunk of /analytics/investment-projection
+    # Monte Carlo paths; bigger requests are simulated in several chunks.
+    MONTE_CARLO_CHUNK_MB: int = int(os.getenv("MONTE_CARLO_CHUNK_MB", "64"))
+
+    # Daily closes for /market/prices: "yahoo", or "file" to read
+    # <MARKET_DATA_DIR>/<SYMBOL>.csv (date,close) for offline work and tests.
+    MARKET_PROVIDER: str = os.getenv("MARKET_PROVIDER", "yahoo")
+    MARKET_DATA_DIR: str = os.getenv("MARKET_DATA_DIR", "market_data")
+
+    # python -m app.db.compact_entries: soft-deleted entries older than this
+    # move to entries_archive, ENTRY_COMPACT_BATCH rows per transaction.
+    ENTRY_RETENTION_DAYS: int = int(os.getenv("ENTRY_RETENTION_DAYS", "30"))
+    ENTRY_COMPACT_BATCH: int = int(os.getenv("ENTRY_COMPACT_BATCH", "1000"))
+
+    # Totals are kept in BASE_CURRENCY: every entry stores its amount
+    # converted at the daily rate of its date (entries.amount_base). A date
+    # without a rate (weekend, holiday) takes the latest one at most
+    # FX_MAX_STALE_DAYS older. FX_RATES_FILE is what
+    # python -m app.db.load_fx_rates reads by default (date,currency,rate).
+    BASE_CURRENCY: str = os.getenv("BASE_CURRENCY", "CAD").upper()
+    FX_MAX_STALE_DAYS: int = int(os.getenv("FX_MAX_STALE_DAYS", "7"))
+    FX_RATES_FILE: str = os.getenv("FX_RATES_FILE", "fx_rates.csv")
+
+
+settings = Settings()
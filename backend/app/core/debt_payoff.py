@@ -0,0 +1,104 @@
+from typing import Literal, NamedTuple
+
+import numpy as np
+
+Strategy = Literal["avalanche", "snowball"]
+
+PAID_OFF = 0.005  # balances under half a cent count as cleared
+
+
+class PayoffSchedule(NamedTuple):
+    """Result of simulate(); one row per contribution level (G), one column per debt (D)."""
+
+    order: np.ndarray          # (D,) debt indices in payoff priority order
+    months: np.ndarray         # (G,) months until debt-free, -1 if not within the horizon
+    interest: np.ndarray       # (G,) total interest charged
+    paid: np.ndarray           # (G,) total paid
+    debt_months: np.ndarray    # (G, D) month each debt was cleared, -1 if never
+    debt_interest: np.ndarray  # (G, D) interest charged per debt
+    balances: np.ndarray       # (G, T + 1) total balance at the end of each month, [:, 0] = today
+
+
+def payoff_order(balances: np.ndarray, rates: np.ndarray, strategy: Strategy) -> np.ndarray:
+    """Debt indices in the order extra money goes to them (np.lexsort keys: last is primary)."""
+    if strategy == "avalanche":
+        return np.lexsort((-balances, -rates))  # highest rate first, bigger balance breaks ties
+    return np.lexsort((-rates, balances))  # smallest balance first, higher rate breaks ties
+
+
+def simulate(
+    balances,
+    interest_pct,
+    minimums,
+    extras,
+    strategy: Strategy = "avalanche",
+    horizon: int = 360,
+) -> PayoffSchedule:
+    """Month-by-month amortization of every debt under every extra contribution at once.
+
+    Each month interest accrues (APR / 12), every debt gets its minimum payment,
+    and the rest of the budget -- the sum of all minimums plus the extra
+    contribution -- rolls down the priority list, so minimums freed by cleared
+    debts keep working. All arithmetic is on (G, D) arrays; the only Python
+    loop is over months, and it stops once every scenario is debt-free.
+    """
+    balances = np.asarray(balances, dtype=float)
+    rates = np.asarray(interest_pct, dtype=float) / 100 / 12
+    order = payoff_order(balances, rates, strategy)
+
+    # work in priority order so the rollover is a cumulative sum along axis 1
+    start = balances[order]
+    rate = rates[order]
+    minimum = np.asarray(minimums, dtype=float)[order]
+    extras = np.asarray(extras, dtype=float)
+    budget = minimum.sum() + extras
+
+    levels, debts = len(extras), len(start)
+    bal = np.broadcast_to(start, (levels, debts)).copy()
+    bal *= bal > PAID_OFF
+    cleared_at_start = bal == 0
+    interest = np.zeros((levels, debts))
+    open_months = np.zeros((levels, debts), dtype=int)  # months each debt ended with a balance
+    series = np.empty((levels, horizon + 1))
+    series[:, 0] = bal.sum(axis=1)
+
+    last = horizon if series[:, 0].any() else 0
+    for month in range(1, last + 1):
+        accrued = bal * rate
+        bal += accrued
+        interest += accrued
+
+        paid = np.minimum(bal, minimum)
+        bal -= paid
+        left = budget - paid.sum(axis=1)
+
+        # debt j gets whatever is left after every debt ahead of it is cleared
+        ahead = np.cumsum(bal, axis=1) - bal
+        bal -= np.clip(left[:, None] - ahead, 0, bal)
+        bal *= bal > PAID_OFF
+
+        open_months += bal > 0
+        series[:, month] = bal.sum(axis=1)
+        if not series[:, month].any():
+            last = month
+            break
+
+    series = series[:, : last + 1]
+    cleared = series[:, -1] == 0
+    months = np.where(cleared, np.argmax(series == 0, axis=1), -1)
+    total_interest = interest.sum(axis=1)
+
+    # a cleared debt stays at zero, so it was cleared the month after its last open one
+    debt_months = np.where(cleared_at_start, 0, np.where(open_months < last, open_months + 1, -1))
+
+    # map per-debt columns back to the caller's order
+    unorder = np.argsort(order)
+    return PayoffSchedule(
+        order=order,
+        months=months,
+        interest=total_interest,
+        paid=series[:, 0] + total_interest - series[:, -1],
+        debt_months=debt_months[:, unorder],
+        debt_interest=interest[:, unorder],
+        balances=series,
+    )
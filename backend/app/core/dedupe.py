@@ -0,0 +1,85 @@
+import hashlib
+import re
+from collections import defaultdict
+from collections.abc import Iterable
+from datetime import date
+from decimal import ROUND_HALF_UP, Decimal
+from typing import Literal, NamedTuple
+from uuid import UUID
+
+OnDuplicate = Literal["skip", "flag", "insert"]
+
+_WORD = re.compile(r"[a-z0-9]+")
+_CENTS = Decimal("0.01")
+
+
+def normalize_name(name: str) -> str:
+    """Lowercase words of ``name`` joined by single spaces, punctuation dropped.
+
+    The same as ``trim(regexp_replace(lower(name), '[^a-z0-9]+', ' ', 'g'))``
+    in Postgres, which the backfill migration relies on.
+    """
+    return " ".join(_WORD.findall(name.lower()))
+
+
+def fingerprint(type_: str, amount, name: str) -> str:
+    """md5 hex of ``type|amount|normalized name``, amount with two decimals.
+
+    The amount is rounded half away from zero, as numeric(12, 2) stores it,
+    so a raw payload (10.125) and the stored row (10.13) hash alike.
+
+    Together with user_id and date (the other columns of the index it is
+    looked up through) it identifies a transaction the way a bank export
+    does, so re-imported rows can be found without comparing names.
+    """
+    amount = Decimal(str(amount)).quantize(_CENTS, rounding=ROUND_HALF_UP)
+    return hashlib.md5(f"{type_}|{amount}|{normalize_name(name)}".encode()).hexdigest()
+
+
+class Duplicate(NamedTuple):
+    kind: Literal["exact", "near"]
+    entry_id: UUID
+
+
+def match_duplicates(
+    incoming: list[tuple[str, date]],
+    existing: Iterable[tuple[UUID, str, date]],
+    tolerance_days: int,
+) -> list[Duplicate | None]:
+    """Pair each incoming (fingerprint, date) with at most one existing (id, fingerprint, date).
+
+    An existing row is used once, so a statement with two identical coffees
+    against a ledger holding one of them matches one and keeps the other.
+    Exact (same date) matches are made first over the whole batch; the rest
+    then take the nearest unused row with the same fingerprint within
+    ``tolerance_days`` (a bank posting a day later on the next export).
+    """
+    by_fingerprint: dict[str, list[tuple[date, UUID]]] = defaultdict(list)
+    for entry_id, fp, d in existing:
+        by_fingerprint[fp].append((d, entry_id))
+
+    used: set[UUID] = set()
+    out: list[Duplicate | None] = [None] * len(incoming)
+
+    for i, (fp, d) in enumerate(incoming):
+        for existing_date, entry_id in by_fingerprint.get(fp, ()):
+            if existing_date == d and entry_id not in used:
+                used.add(entry_id)
+                out[i] = Duplicate("exact", entry_id)
+                break
+
+    if tolerance_days > 0:
+        for i, (fp, d) in enumerate(incoming):
+            if out[i] is not None:
+                continue
+            near = [
+                (abs((existing_date - d).days), existing_date, entry_id)
+                for existing_date, entry_id in by_fingerprint.get(fp, ())
+                if entry_id not in used and abs((existing_date - d).days) <= tolerance_days
+            ]
+            if near:
+                entry_id = min(near)[2]
+                used.add(entry_id)
+                out[i] = Duplicate("near", entry_id)
+
+    return out
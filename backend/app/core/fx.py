@@ -0,0 +1,42 @@
+from bisect import bisect_right
+from datetime import date
+from decimal import ROUND_HALF_UP, Decimal
+
+_CENTS = Decimal("0.01")
+
+# largest value entries.amount / amount_base (numeric(12, 2)) can hold
+MAX_AMOUNT = Decimal("9999999999.99")
+
+
+class RateNotFound(Exception):
+    """No usable exchange rate for a currency on a date."""
+
+
+def pick_rate(rates: list[tuple[date, Decimal]], d: date, max_stale_days: int) -> Decimal | None:
+    """The rate in effect on ``d``: the latest of ``rates`` (date order) on or before it.
+
+    Markets publish no rate for weekends and holidays, so an older one is
+    used, but not one more than ``max_stale_days`` old. None if there is none.
+    """
+    i = bisect_right(rates, d, key=lambda r: r[0])
+    if i == 0:
+        return None
+    rate_date, rate = rates[i - 1]
+    if (d - rate_date).days > max_stale_days:
+        return None
+    return rate
+
+
+def cents(amount) -> Decimal:
+    """``amount`` rounded to cents half away from zero, as Postgres round() and numeric(12, 2) do."""
+    return Decimal(str(amount)).quantize(_CENTS, rounding=ROUND_HALF_UP)
+
+
+def to_base(amount, rate: Decimal) -> Decimal:
+    """``amount`` times ``rate``, rounded to cents."""
+    return cents(Decimal(str(amount)) * rate)
+
+
+def storable(amount: Decimal) -> bool:
+    """Whether a cents-rounded ``amount`` fits numeric(12, 2)."""
+    return abs(amount) <= MAX_AMOUNT
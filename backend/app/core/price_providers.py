@@ -0,0 +1,108 @@
+import csv
+import json
+import math
+import urllib.error
+import urllib.parse
+import urllib.request
+from datetime import date, datetime, time, timedelta, timezone
+from functools import lru_cache
+from pathlib import Path
+from typing import Protocol
+
+from app.core.config import settings
+
+
+class ProviderError(Exception):
+    """The upstream price source failed or does not know the symbol."""
+
+
+class PriceProvider(Protocol):
+    def fetch(self, symbol: str, start: date, end: date) -> list[tuple[date, float]]:
+        """Daily closes for ``symbol`` with start <= date <= end, oldest first."""
+        ...
+
+
+class YahooProvider:
+    """Daily closes from Yahoo's chart API, the source the Next.js route used."""
+
+    URL = "https://query1.finance.yahoo.com/v8/finance/chart/{symbol}"
+
+    def __init__(self, timeout: float = 10.0):
+        self.timeout = timeout
+
+    def fetch(self, symbol: str, start: date, end: date) -> list[tuple[date, float]]:
+        def epoch(d: date) -> int:
+            return int(datetime.combine(d, time.min, tzinfo=timezone.utc).timestamp())
+
+        query = urllib.parse.urlencode(
+            {
+                "period1": epoch(start),
+                "period2": epoch(end + timedelta(days=1)),
+                "interval": "1d",
+                "includePrePost": "false",
+                "events": "div|split",
+            }
+        )
+        request = urllib.request.Request(
+            f"{self.URL.format(symbol=urllib.parse.quote(symbol))}?{query}",
+            headers={"User-Agent": "Mozilla/5.0", "Accept": "application/json"},
+        )
+        try:
+            with urllib.request.urlopen(request, timeout=self.timeout) as r:
+                data = json.load(r)
+        except (urllib.error.URLError, TimeoutError, ValueError) as e:
+            raise ProviderError(f"Yahoo request for {symbol} failed: {e}") from e
+
+        result = ((data.get("chart") or {}).get("result") or [None])[0]
+        if not result:
+            raise ProviderError(f"Yahoo has no chart for {symbol}")
+
+        timestamps = result.get("timestamp") or []
+        closes = ((result.get("indicators") or {}).get("quote") or [{}])[0].get("close") or []
+
+        out = []
+        for ts, close in zip(timestamps, closes):
+            if close is None or math.isnan(close):
+                continue
+            d = datetime.fromtimestamp(ts, tz=timezone.utc).date()
+            if start <= d <= end:
+                out.append((d, float(close)))
+        return out
+
+
+class FileProvider:
+    """Closes from ``<directory>/<SYMBOL>.csv`` files with ``date,close`` rows.
+
+    For offline development and tests: no network, deterministic data.
+    """
+
+    def __init__(self, directory: str | Path):
+        self.directory = Path(directory)
+
+    def fetch(self, symbol: str, start: date, end: date) -> list[tuple[date, float]]:
+        path = self.directory / f"{symbol}.csv"
+        if not path.is_file():
+            raise ProviderError(f"No price file for {symbol}")
+
+        out = []
+        with path.open(newline="") as f:
+            for row in csv.DictReader(f):
+                d = date.fromisoformat(row["date"])
+                if start <= d <= end:
+                    out.append((d, float(row["close"])))
+        out.sort()
+        return out
+
+
+PROVIDERS = {
+    "yahoo": lambda: YahooProvider(),
+    "file": lambda: FileProvider(settings.MARKET_DATA_DIR),
+}
+
+
+@lru_cache(maxsize=1)
+def get_provider() -> PriceProvider:
+    try:
+        return PROVIDERS[settings.MARKET_PROVIDER]()
+    except KeyError:
+        raise ValueError(f"Unknown MARKET_PROVIDER {settings.MARKET_PROVIDER!r}") from None
@@ -1,12 +1,87 @@
+import asyncio
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+
+from fastapi.concurrency import run_in_threadpool
 from passlib.context import CryptContext
 
+from app.core.config import settings
+
 pwd_context = CryptContext(
     schemes=["bcrypt_sha256"],
     deprecated="auto",
+    bcrypt_sha256__rounds=settings.BCRYPT_ROUNDS,
 )
 
+
 def hash_password(password: str) -> str:
     return pwd_context.hash(password)
 
+
 def verify_password(plain_password: str, hashed_password: str) -> bool:
-    return pwd_context.verify(plain_password, hashed_password)
\ No newline at end of file
+    return pwd_context.verify(plain_password, hashed_password)
+
+
+def verify_and_update(plain_password: str, hashed_password: str) -> tuple[bool, str | None]:
+    """Verify, and return a new hash when the stored one uses outdated settings."""
+    return pwd_context.verify_and_update(plain_password, hashed_password)
+
+
+class HashPoolSaturated(Exception):
+    """More hash jobs are waiting than HASH_MAX_PENDING allows."""
+
+
+_executor: ProcessPoolExecutor | None = None
+_in_flight = 0
+
+
+def _get_executor() -> ProcessPoolExecutor:
+    # created on first use so importing the app never forks; the workers
+    # start from a clean forkserver (spawn where there is none) rather than
+    # a fork of a process already running the event loop, engine pools and
+    # threadpool threads
+    global _executor
+    if _executor is None:
+        method = "forkserver" if "forkserver" in multiprocessing.get_all_start_methods() else "spawn"
+        _executor = ProcessPoolExecutor(
+            max_workers=settings.HASH_WORKERS,
+            mp_context=multiprocessing.get_context(method),
+        )
+    return _executor
+
+
+def shutdown_hash_pool() -> None:
+    global _executor
+    if _executor is not None:
+        _executor.shutdown(wait=False, cancel_futures=True)
+        _executor = None
+
+
+async def _run_hash_job(fn, *args):
+    """Run a CPU-bound hash job off the event loop with bounded admission.
+
+    At most HASH_WORKERS jobs run at once and HASH_MAX_PENDING more may wait;
+    beyond that HashPoolSaturated is raised straight away so callers can shed
+    load instead of stalling every other request.
+    """
+    global _in_flight
+    workers = max(settings.HASH_WORKERS, 1)
+    if _in_flight >= workers + settings.HASH_MAX_PENDING:
+        raise HashPoolSaturated()
+
+    _in_flight += 1
+    try:
+        if settings.HASH_WORKERS <= 0:
+            return await run_in_threadpool(fn, *args)
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(_get_executor(), fn, *args)
+    finally:
+        _in_flight -= 1
+
+
+async def hash_password_async(password: str) -> str:
+    return await _run_hash_job(hash_password, password)
+
+
+async def verify_and_update_async(plain_password: str, hashed_password: str) -> tuple[bool, str | None]:
+    return await _run_hash_job(verify_and_update, plain_password, hashed_password)
@@ -0,0 +1,93 @@
+import hashlib
+import time
+from functools import lru_cache
+
+from jose import JWTError, jwt
+
+from app.core.config import settings
+
+
+class InvalidToken(Exception):
+    """Token is malformed, badly signed, expired or of the wrong type."""
+
+
+def _kid(secret: str) -> str:
+    return hashlib.sha256(secret.encode()).hexdigest()[:8]
+
+
+# anyone can sign with this one, so it is only ever used when JWT_DEV_SECRET asks for it
+DEV_SECRET = "dev-only-change-me"
+
+
+def _signing_secret() -> str:
+    if settings.JWT_SECRET:
+        return settings.JWT_SECRET
+    if settings.JWT_DEV_SECRET:
+        return DEV_SECRET
+    raise RuntimeError("JWT_SECRET is not set (set JWT_DEV_SECRET=true to use an insecure local key)")
+
+
+# checked on import, so a worker without a signing key fails to boot
+_SECRET = _signing_secret()
+
+# kid -> secret, built once; verification never touches the database
+_KEYS: dict[str, str] = {_kid(secret): secret for secret in [*settings.JWT_OLD_SECRETS, _SECRET]}
+_CURRENT_KID = _kid(_SECRET)
+
+
+def _issue(user_id: str, typ: str, ttl: int) -> str:
+    now = int(time.time())
+    claims = {"sub": user_id, "typ": typ, "iat": now, "exp": now + ttl}
+    return jwt.encode(
+        claims,
+        _KEYS[_CURRENT_KID],
+        algorithm=settings.JWT_ALGORITHM,
+        headers={"kid": _CURRENT_KID},
+    )
+
+
+def create_access_token(user_id: str) -> str:
+    return _issue(user_id, "access", settings.ACCESS_TOKEN_TTL_SECONDS)
+
+
+def create_refresh_token(user_id: str) -> str:
+    return _issue(user_id, "refresh", settings.REFRESH_TOKEN_TTL_SECONDS)
+
+
+@lru_cache(maxsize=4096)
+def _verified_claims(token: str) -> tuple[str, str, int]:
+    """Signature check + decode, cached per token string.
+
+    Clients reuse one access token for many requests, so after the first
+    request only the expiry comparison in decode_token runs. Failures raise
+    and are therefore never cached.
+    """
+    try:
+        kid = jwt.get_unverified_header(token).get("kid")
+        key = _KEYS.get(kid)
+        if key is None:
+            raise InvalidToken("unknown signing key")
+        # expiry is checked by the caller so cached entries still age out
+        claims = jwt.decode(
+            token,
+            key,
+            algorithms=[settings.JWT_ALGORITHM],
+            options={"verify_exp": False},
+        )
+    except JWTError as e:
+        raise InvalidToken(str(e)) from e
+
+    try:
+        return str(claims["sub"]), str(claims["typ"]), int(claims["exp"])
+    except (KeyError, TypeError, ValueError) as e:
+        raise InvalidToken("missing claims") from e
+
+
+def decode_token(token: str, expected_typ: str = "access") -> str:
+    """Return the user id of a valid, unexpired token of the expected type."""
+    user_id, typ, exp = _verified_claims(token)
+    if typ != expected_typ:
+        raise InvalidToken("wrong token type")
+    if exp <= time.time():
+        raise InvalidToken("token expired")
+    return user_id
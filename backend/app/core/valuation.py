@@ -0,0 +1,45 @@
+import numpy as np
+
+
+def price_matrix(start: np.datetime64, days: int, series: list[tuple[np.ndarray, np.ndarray]]) -> np.ndarray:
+    """(days, S) close of each symbol on every calendar day from ``start``.
+
+    ``series[j]`` is symbol j's (datetime64[D] dates, closes), ascending; it
+    may begin before ``start``, and the last close before it seeds day 0.
+    Days without a close (weekends, holidays) carry the previous close
+    forward; days before a symbol's first close take that first close.
+    NaN only for symbols with no close at all.
+    """
+    P = np.full((days, len(series)), np.nan)
+    for j, (dates, closes) in enumerate(series):
+        if len(dates) == 0:
+            continue
+        offset = (dates - start).astype(np.int64)
+        before = np.flatnonzero(offset < 0)
+        if len(before) and not (offset == 0).any():
+            offset[before[-1]] = 0  # seed day 0 with the last earlier close
+        keep = (offset >= 0) & (offset < days)
+        P[offset[keep], j] = closes[keep]
+
+    # forward fill: each day takes the row of the latest close at or before it
+    rows = np.where(np.isnan(P), 0, np.arange(days)[:, None])
+    np.maximum.accumulate(rows, axis=0, out=rows)
+    P = np.take_along_axis(P, rows, axis=0)
+
+    # back fill whatever precedes a symbol's first close in the range
+    first = np.argmax(~np.isnan(P), axis=0)
+    lead = np.arange(days)[:, None] < first
+    return np.where(lead, P[first, np.arange(P.shape[1])], P)
+
+
+def value_series(prices: np.ndarray, holding_symbol: np.ndarray, amounts: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+    """Daily portfolio value and each holding's units, for holdings priced by ``prices``.
+
+    ``holding_symbol[h]`` is the column of holding h in ``prices``. Units are
+    sized so each holding is worth ``amounts[h]`` on the last day, and held
+    constant over the range, so the series shows what today's positions were
+    worth on each earlier day.
+    """
+    units = amounts / prices[-1, holding_symbol]
+    weights = np.bincount(holding_symbol, weights=units, minlength=prices.shape[1])
+    return prices @ weights, units
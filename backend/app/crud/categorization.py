@@ -0,0 +1,93 @@
+import threading
+from collections import OrderedDict
+from collections.abc import Iterable
+
+from sqlalchemy import func, select, true
+from sqlalchemy.orm import Session
+
+from app.core.categorizer import UserModel
+from app.models import Entry, UserDataVersion
+
+MAX_CACHED = 1024
+
+Mapping = tuple[str, str, str]  # (type, name, category)
+
+
+def mapping(entry: Entry) -> Mapping | None:
+    """What ``entry`` teaches the user's model (None once it is deleted)."""
+    if entry.is_deleted:
+        return None
+    return (entry.type, entry.name, entry.category)
+
+
+def _load(db: Session, user_id: str) -> tuple[int, UserModel]:
+    # one statement, so the version and the counts come from the same snapshot
+    counts = (
+        select(Entry.type, Entry.name, Entry.category, func.count().label("n"))
+        .where(Entry.user_id == user_id, Entry.is_deleted == False)  # noqa: E712
+        .group_by(Entry.type, Entry.name, Entry.category)
+        .subquery()
+    )
+    version = select(
+        func.coalesce(
+            select(UserDataVersion.version).where(UserDataVersion.user_id == user_id).scalar_subquery(),
+            0,
+        ).label("version")
+    ).subquery()
+    rows = db.execute(
+        select(version.c.version, counts.c.type, counts.c.name, counts.c.category, counts.c.n)
+        .select_from(version.outerjoin(counts, true()))
+    ).all()
+
+    model = UserModel.from_counts((r.type, r.name, r.category, r.n) for r in rows if r.n)
+    return int(rows[0].version), model
+
+
+# user_id -> (data version the model reflects, model)
+_lock = threading.Lock()
+_cache: OrderedDict[str, tuple[int, UserModel]] = OrderedDict()
+
+
+def user_model(db: Session, user_id: str) -> UserModel:
+    """``user_id``'s compiled model, rebuilt from their entries if this worker's copy is stale."""
+    version = db.scalar(select(UserDataVersion.version).where(UserDataVersion.user_id == user_id)) or 0
+    with _lock:
+        hit = _cache.get(user_id)
+        if hit is not None and hit[0] == version:
+            _cache.move_to_end(user_id)
+            return hit[1]
+
+    version, model = _load(db, user_id)
+    with _lock:
+        hit = _cache.get(user_id)
+        if hit is None or hit[0] < version:
+            _cache[user_id] = (version, model)
+            _cache.move_to_end(user_id)
+            while len(_cache) > MAX_CACHED:
+                _cache.popitem(last=False)
+    return model
+
+
+def record(
+    user_id: str,
+    version: int,
+    removed: Iterable[Mapping | None] = (),
+    added: Iterable[Mapping | None] = (),
+) -> None:
+    """Apply a committed entries write to this worker's cached model.
+
+    ``version`` is what bump_data_version returned for the write. The change
+    is applied in place only when the cached model is exactly one version
+    behind; if any other write came in between (another worker, or a
+    non-entries write) the model is dropped and rebuilt on next use.
+    """
+    with _lock:
+        hit = _cache.get(user_id)
+        if hit is None:
+            return
+        if hit[0] != version - 1:
+            del _cache[user_id]
+            return
+        model = hit[1]
+        model.update([m for m in removed if m], [m for m in added if m])
+        _cache[user_id] = (version, model)
@@ -0,0 +1,47 @@
+from sqlalchemy import func, select, update
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.orm import Session
+
+from app.models import CatalogVersion, UserDataVersion
+
+
+def bump_data_version(db: Session, user_id: str) -> int:
+    """Mark ``user_id``'s data changed; call inside the transaction that changes it.
+
+    Returns the new version.
+    """
+    stmt = pg_insert(UserDataVersion).values(user_id=user_id, version=1)
+    return db.execute(
+        stmt.on_conflict_do_update(
+            index_elements=["user_id"],
+            set_={"version": UserDataVersion.version + 1, "updated_at": func.now()},
+        ).returning(UserDataVersion.version)
+    ).scalar_one()
+
+
+def bump_all_data_versions(db: Session) -> None:
+    """Invalidate every user's ETags (e.g. after a bulk rebuild of derived data)."""
+    db.execute(update(UserDataVersion).values(version=UserDataVersion.version + 1))
+
+
+def bump_catalog_version(db: Session, name: str) -> None:
+    """Mark the shared catalog ``name`` changed; call inside the transaction that changes it."""
+    stmt = pg_insert(CatalogVersion).values(name=name, version=1)
+    db.execute(
+        stmt.on_conflict_do_update(
+            index_elements=["name"],
+            set_={"version": CatalogVersion.version + 1},
+        )
+    )
+
+
+def read_versions(db: Session, user_id: str, catalog: str | None = None) -> tuple[int, int]:
+    """(user data version, catalog version) in one round-trip; missing rows read as 0."""
+    user_version = select(UserDataVersion.version).where(UserDataVersion.user_id == user_id).scalar_subquery()
+    columns = [func.coalesce(user_version, 0)]
+    if catalog is not None:
+        catalog_version = select(CatalogVersion.version).where(CatalogVersion.name == catalog).scalar_subquery()
+        columns.append(func.coalesce(catalog_version, 0))
+
+    row = db.execute(select(*columns)).one()
+    return int(row[0]), int(row[1]) if catalog is not None else 0
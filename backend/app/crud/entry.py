@@ -0,0 +1,180 @@
+from collections.abc import Iterable
+from datetime import date, timedelta
+from decimal import Decimal
+from typing import NamedTuple
+
+from sqlalchemy import delete, func, insert, select
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.orm import Session
+
+from app.core.dedupe import Duplicate, match_duplicates
+from app.core.fx import to_base
+from app.crud import fx_rates
+from app.models import Entry, EntryArchive, EntryMonthlyRollup
+
+
+class RollupKey(NamedTuple):
+    user_id: str
+    year: int
+    month: int
+    type: str
+    category: str
+
+
+class RollupSnapshot(NamedTuple):
+    key: RollupKey
+    amount: Decimal
+
+
+def rollup_snapshot(entry: Entry) -> RollupSnapshot | None:
+    """What ``entry`` currently contributes to the monthly rollup (None if nothing).
+
+    Rollups total amounts in the base currency, so entries in different
+    currencies add up.
+    """
+    if entry.is_deleted:
+        return None
+
+    key = RollupKey(entry.user_id, int(entry.year), int(entry.month), entry.type, entry.category)
+    return RollupSnapshot(key, Decimal(str(entry.amount_base)))
+
+
+def _rollup_upsert(values: list[dict]):
+    stmt = pg_insert(EntryMonthlyRollup).values(values)
+    return stmt.on_conflict_do_update(
+        index_elements=list(RollupKey._fields),
+        set_={
+            "total": EntryMonthlyRollup.total + stmt.excluded.total,
+            "entry_count": EntryMonthlyRollup.entry_count + stmt.excluded.entry_count,
+            "updated_at": func.now(),
+        },
+    )
+
+
+def _upsert_rollup(db: Session, key: RollupKey, amount: Decimal, count: int) -> None:
+    db.execute(_rollup_upsert([{**key._asdict(), "total": amount, "entry_count": count}]))
+
+    if count < 0:
+        # drop buckets that no longer hold any live entry
+        db.execute(
+            delete(EntryMonthlyRollup).where(
+                *(getattr(EntryMonthlyRollup, f) == v for f, v in key._asdict().items()),
+                EntryMonthlyRollup.entry_count <= 0,
+            )
+        )
+
+
+def apply_rollup_change(
+    db: Session,
+    before: RollupSnapshot | None,
+    after: RollupSnapshot | None,
+) -> None:
+    """Move an entry's contribution from ``before`` to ``after`` in the rollup.
+
+    Runs inside the caller's transaction, so the rollup commits (or rolls back)
+    together with the entry write.
+    """
+    if before == after:
+        return
+
+    if before and after and before.key == after.key:
+        _upsert_rollup(db, after.key, after.amount - before.amount, 0)
+        return
+
+    if before:
+        _upsert_rollup(db, before.key, -before.amount, -1)
+    if after:
+        _upsert_rollup(db, after.key, after.amount, 1)
+
+
+def add_to_rollup(db: Session, snapshots: Iterable[RollupSnapshot | None]) -> None:
+    """Add a batch of new entries to the rollup with a single multi-row upsert."""
+    totals: dict[RollupKey, list] = {}
+    for snap in snapshots:
+        if snap is None:
+            continue
+        bucket = totals.setdefault(snap.key, [Decimal(0), 0])
+        bucket[0] += snap.amount
+        bucket[1] += 1
+
+    if not totals:
+        return
+
+    db.execute(
+        _rollup_upsert(
+            [
+                {**key._asdict(), "total": total, "entry_count": count}
+                for key, (total, count) in totals.items()
+            ]
+        )
+    )
+
+
+def shift_rollup_totals(db: Session, deltas: dict[RollupKey, Decimal]) -> None:
+    """Add ``deltas`` to existing rollup totals without changing entry counts.
+
+    For re-valued entries (see app.db.reconvert_entries): same buckets, new amounts.
+    """
+    values = [
+        {**key._asdict(), "total": delta, "entry_count": 0}
+        for key, delta in deltas.items()
+        if delta
+    ]
+    if values:
+        db.execute(_rollup_upsert(values))
+
+
+def find_duplicates(
+    db: Session,
+    user_id: str,
+    incoming: list[tuple[str, date]],
+    tolerance_days: int,
+) -> list[Duplicate | None]:
+    """Existing live entries that ``incoming`` (fingerprint, date) rows would duplicate.
+
+    One query for the whole batch, answered from the (user_id, fingerprint,
+    date) index: the distinct fingerprints and the batch's date span widened
+    by the tolerance.
+    """
+    if not incoming:
+        return []
+
+    dates = [d for _, d in incoming]
+    slack = timedelta(days=tolerance_days)
+    existing = db.execute(
+        select(Entry.id, Entry.fingerprint, Entry.date).where(
+            Entry.user_id == user_id,
+            Entry.is_deleted == False,  # noqa: E712
+            Entry.fingerprint.in_({fp for fp, _ in incoming}),
+            Entry.date.between(min(dates) - slack, max(dates) + slack),
+        )
+    ).all()
+    return match_duplicates(incoming, existing, tolerance_days)
+
+
+def unarchive_entry(db: Session, user_id: str, entry_id) -> Entry | None:
+    """Move ``entry_id`` from entries_archive back into entries, still soft-deleted.
+
+    Returns the entries row (None if the archive has no such entry of this
+    user); the caller undeletes it like any other soft-deleted entry.
+    app.db.reconvert_entries does not touch the archive, so amount_base is
+    converted again at today's stored rate (kept as archived if there is
+    none), and the restored row adds its current value to the rollup.
+    """
+    archived = (
+        db.query(EntryArchive)
+        .filter(EntryArchive.id == entry_id, EntryArchive.user_id == user_id)
+        .with_for_update()
+        .first()
+    )
+    if archived is None:
+        return None
+
+    values = {c.name: getattr(archived, c.name) for c in Entry.__table__.columns}
+    rate = fx_rates.rates_for(db, [(archived.currency, archived.date)])[(archived.currency.upper(), archived.date)]
+    if rate is not None:
+        values["amount_base"] = to_base(archived.amount, rate)
+    db.execute(insert(Entry).values(values))
+    db.delete(archived)
+    db.flush()
+    return db.query(Entry).filter(Entry.id == entry_id, Entry.date == archived.date).one()
@@ -0,0 +1,82 @@
+from collections import defaultdict
+from collections.abc import Iterable
+from datetime import date, timedelta
+from decimal import Decimal
+
+from sqlalchemy import case, func, literal, select
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.core.fx import RateNotFound, pick_rate, to_base
+from app.models import Entry, FxRate
+
+INSERT_BATCH = 1000  # rows per multi-row upsert (3 bind params each)
+
+
+def rates_for(
+    db: Session,
+    keys: Iterable[tuple[str, date]],
+    max_stale_days: int = settings.FX_MAX_STALE_DAYS,
+) -> dict[tuple[str, date], Decimal | None]:
+    """Rate in effect for each (currency, date), None where there is none.
+
+    One query for the whole batch: the stored rates of the batch's foreign
+    currencies over its date span. The base currency is always 1.
+    """
+    keys = {(currency.upper(), d) for currency, d in keys}
+    out: dict[tuple[str, date], Decimal | None] = {
+        k: Decimal(1) for k in keys if k[0] == settings.BASE_CURRENCY
+    }
+    foreign = keys - out.keys()
+    if not foreign:
+        return out
+
+    dates = [d for _, d in foreign]
+    stored: dict[str, list[tuple[date, Decimal]]] = defaultdict(list)
+    for currency, d, rate in db.execute(
+        select(FxRate.currency, FxRate.date, FxRate.rate)
+        .where(
+            FxRate.currency.in_({c for c, _ in foreign}),
+            FxRate.date.between(min(dates) - timedelta(days=max_stale_days), max(dates)),
+        )
+        .order_by(FxRate.currency, FxRate.date)
+    ):
+        stored[currency].append((d, rate))
+
+    for currency, d in foreign:
+        out[(currency, d)] = pick_rate(stored[currency], d, max_stale_days)
+    return out
+
+
+def amount_base(db: Session, currency: str, amount, d: date) -> Decimal:
+    """``amount`` of ``currency`` on ``d`` in the base currency; RateNotFound without a rate."""
+    rate = rates_for(db, [(currency, d)])[(currency.upper(), d)]
+    if rate is None:
+        raise RateNotFound(f"No {currency.upper()} rate on or shortly before {d.isoformat()}")
+    return to_base(amount, rate)
+
+
+def entry_rate(max_stale_days: int = settings.FX_MAX_STALE_DAYS):
+    """SQL for the rate of each entries row, the same one rates_for picks (NULL if none)."""
+    stored = (
+        select(FxRate.rate)
+        .where(
+            FxRate.currency == func.upper(Entry.currency),
+            FxRate.date <= Entry.date,
+            FxRate.date >= Entry.date - max_stale_days,
+        )
+        .order_by(FxRate.date.desc())
+        .limit(1)
+        .scalar_subquery()
+    )
+    return case((func.upper(Entry.currency) == settings.BASE_CURRENCY, literal(Decimal(1))), else_=stored)
+
+
+def store(db: Session, rates: list[tuple[str, date, Decimal]]) -> None:
+    """Upsert (currency, date, rate) rows; a corrected rate replaces the stored one."""
+    for i in range(0, len(rates), INSERT_BATCH):
+        stmt = pg_insert(FxRate).values(
+            [{"currency": c.upper(), "date": d, "rate": rate} for c, d, rate in rates[i : i + INSERT_BATCH]]
+        )
+        db.execute(stmt.on_conflict_do_update(index_elements=["currency", "date"], set_={"rate": stmt.excluded.rate}))
@@ -0,0 +1,116 @@
+from datetime import date, timedelta
+from typing import NamedTuple
+
+from sqlalchemy import Float, cast, func, select, update
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.orm import Session
+
+from app.models import MarketPrice, MarketSymbol
+
+INSERT_BATCH = 1000  # rows per multi-row upsert (3 bind params each)
+
+
+class Coverage(NamedTuple):
+    covered_from: date | None
+    covered_to: date | None
+
+
+def plan_fetch(coverage: Coverage | None, start: date, end: date, today: date) -> list[tuple[date, date]]:
+    """Ranges of [start, end] the provider still has to be asked for.
+
+    Coverage stays one contiguous range, so a request beyond it also fetches
+    the gap. The last covered day is asked for again once it is in the past,
+    since its close may have been taken intraday.
+    """
+    end = min(end, today)
+    if start > end:
+        return []
+    if coverage is None or coverage.covered_from is None:
+        return [(start, end)]
+
+    ranges = []
+    if start < coverage.covered_from:
+        ranges.append((start, coverage.covered_from - timedelta(days=1)))
+    if end > coverage.covered_to:
+        ranges.append((coverage.covered_to, end))
+    return ranges
+
+
+def load(db: Session, symbol: str, start: date, end: date, today: date) -> tuple[list, list]:
+    """(ranges still to fetch, stored (date, close) rows in [start, end])."""
+    row = db.execute(
+        select(MarketSymbol.covered_from, MarketSymbol.covered_to).where(MarketSymbol.symbol == symbol)
+    ).first()
+    plan = plan_fetch(Coverage(*row) if row else None, start, end, today)
+    if plan:
+        return plan, []
+
+    rows = db.execute(
+        select(MarketPrice.date, cast(MarketPrice.close, Float))
+        .where(MarketPrice.symbol == symbol, MarketPrice.date.between(start, end))
+        .order_by(MarketPrice.date)
+    ).all()
+    return plan, rows
+
+
+def load_many(db: Session, symbols: list[str], start: date, end: date, today: date) -> tuple[list[str], dict]:
+    """load() for several symbols in two queries: (symbols still to fetch, {symbol: rows})."""
+    covered = {
+        symbol: Coverage(covered_from, covered_to)
+        for symbol, covered_from, covered_to in db.execute(
+            select(MarketSymbol.symbol, MarketSymbol.covered_from, MarketSymbol.covered_to).where(
+                MarketSymbol.symbol.in_(symbols)
+            )
+        )
+    }
+    stale = [s for s in symbols if plan_fetch(covered.get(s), start, end, today)]
+
+    rows: dict[str, list] = {s: [] for s in symbols if s not in stale}
+    if rows:
+        for symbol, d, close in db.execute(
+            select(MarketPrice.symbol, MarketPrice.date, cast(MarketPrice.close, Float))
+            .where(MarketPrice.symbol.in_(list(rows)), MarketPrice.date.between(start, end))
+            .order_by(MarketPrice.symbol, MarketPrice.date)
+        ):
+            rows[symbol].append((d, close))
+    return stale, rows
+
+
+def lock_coverage(db: Session, symbol: str) -> Coverage:
+    """Create the symbol's row if needed and lock it until the transaction ends.
+
+    Workers refreshing the same symbol queue here; each re-plans after the
+    lock, so the ones behind the first find the range covered and skip the
+    provider.
+    """
+    db.execute(pg_insert(MarketSymbol).values(symbol=symbol).on_conflict_do_nothing(index_elements=["symbol"]))
+    row = db.execute(
+        select(MarketSymbol.covered_from, MarketSymbol.covered_to)
+        .where(MarketSymbol.symbol == symbol)
+        .with_for_update()
+    ).one()
+    return Coverage(*row)
+
+
+def store(
+    db: Session,
+    symbol: str,
+    coverage: Coverage,
+    fetched: list[tuple[date, date]],
+    prices: list[tuple[date, float]],
+) -> None:
+    """Upsert fetched closes and widen the symbol's coverage to the fetched ranges; commits."""
+    for i in range(0, len(prices), INSERT_BATCH):
+        stmt = pg_insert(MarketPrice).values(
+            [{"symbol": symbol, "date": d, "close": close} for d, close in prices[i : i + INSERT_BATCH]]
+        )
+        db.execute(stmt.on_conflict_do_update(index_elements=["symbol", "date"], set_={"close": stmt.excluded.close}))
+
+    starts = [a for a, _ in fetched] + ([coverage.covered_from] if coverage.covered_from else [])
+    ends = [b for _, b in fetched] + ([coverage.covered_to] if coverage.covered_to else [])
+    db.execute(
+        update(MarketSymbol)
+        .where(MarketSymbol.symbol == symbol)
+        .values(covered_from=min(starts), covered_to=max(ends), fetched_at=func.now())
+    )
+    db.commit()
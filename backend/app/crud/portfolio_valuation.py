@@ -0,0 +1,87 @@
+import threading
+from collections import OrderedDict
+from datetime import date
+
+from sqlalchemy import Float, cast, select
+from sqlalchemy.orm import Session
+
+from app.crud.data_version import read_versions
+from app.models import UserInvestment
+
+# InvestCard presets (preset_id) -> listing; all trade on the TSX
+PRESET_SYMBOLS = {
+    "zcs": "ZCS.TO",
+    "vbal": "VBAL.TO",
+    "xic": "XIC.TO",
+    "vdy": "VDY.TO",
+    "xiu": "XIU.TO",
+    "zlb": "ZLB.TO",
+    "xwd": "XWD.TO",
+    "xei": "XEI.TO",
+    "xdiv": "XDIV.TO",
+    "vfv": "VFV.TO",
+    "xeqt": "XEQT.TO",
+    "xqq": "XQQ.TO",
+    "qqc": "QQC.TO",
+    "hta": "HTA.TO",
+    "zqq": "ZQQ.TO",
+    "znq": "ZNQ.TO",
+    "xcs": "XCS.TO",
+    "tec": "TEC.TO",
+}
+
+MAX_CACHED = 1024
+
+
+def holding_symbol(symbol: str | None, preset_id: str | None) -> str | None:
+    """The price series a holding follows: its own symbol, else its preset's."""
+    if symbol:
+        return symbol.upper()
+    return PRESET_SYMBOLS.get((preset_id or "").lower())
+
+
+def load_holdings(db: Session, user_id: str, step_key: str) -> tuple[int, list]:
+    """(user data version, holdings), the version read first like the ETag dependency does."""
+    version, _ = read_versions(db, user_id)
+    rows = db.execute(
+        select(
+            UserInvestment.id,
+            UserInvestment.name,
+            UserInvestment.symbol,
+            UserInvestment.preset_id,
+            cast(UserInvestment.current_invested, Float).label("current_invested"),
+        )
+        .where(UserInvestment.user_id == user_id, UserInvestment.step_key == step_key)
+        .order_by(UserInvestment.created_at.asc())
+    ).all()
+    return version, rows
+
+
+# (user_id, step_key, start, end) -> (data version, day computed, encoded body)
+_lock = threading.Lock()
+_cache: OrderedDict[tuple, tuple[int, date, bytes]] = OrderedDict()
+
+
+def cached(key: tuple, version: int, today: date) -> bytes | None:
+    """A body computed today from this data version, if one is cached."""
+    with _lock:
+        hit = _cache.get(key)
+        if hit is None or hit[0] != version or hit[1] != today:
+            return None
+        _cache.move_to_end(key)
+        return hit[2]
+
+
+def remember(key: tuple, version: int, today: date, body: bytes) -> None:
+    with _lock:
+        _cache[key] = (version, today, body)
+        _cache.move_to_end(key)
+        while len(_cache) > MAX_CACHED:
+            _cache.popitem(last=False)
+
+
+def invalidate(user_id: str) -> None:
+    """Drop this worker's cached series for ``user_id`` (other workers see the version move)."""
+    with _lock:
+        for key in [k for k in _cache if k[0] == user_id]:
+            del _cache[key]
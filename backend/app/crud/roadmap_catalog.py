@@ -0,0 +1,79 @@
+import threading
+import time
+from typing import NamedTuple
+
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.crud.data_version import bump_catalog_version
+from app.models import CatalogVersion, RoadmapStep
+from app.schemas.roadmap_step import RoadmapStepOut
+
+CATALOG_NAME = "roadmap_steps"
+
+
+class CatalogSnapshot(NamedTuple):
+    version: int
+    steps: tuple[RoadmapStepOut, ...]  # every step, ordered by step_order
+
+    def select(self, active_only: bool) -> list[RoadmapStepOut]:
+        if not active_only:
+            return list(self.steps)
+        return [s for s in self.steps if s.is_active]
+
+    def etag(self, active_only: bool) -> str:
+        return f'"roadmap-{self.version}-{"active" if active_only else "all"}"'
+
+
+_lock = threading.Lock()
+_snapshot: CatalogSnapshot | None = None
+_checked_at = float("-inf")
+_generation = 0  # bumped by invalidate() so an in-flight load cannot mark itself fresh
+
+
+def bump_version(db: Session) -> None:
+    """Mark the catalog changed; call inside the transaction that changes it."""
+    bump_catalog_version(db, CATALOG_NAME)
+
+
+def invalidate() -> None:
+    """Force the next read on this worker to re-check the version."""
+    global _checked_at, _generation
+    with _lock:
+        _generation += 1
+        _checked_at = float("-inf")
+
+
+def peek() -> CatalogSnapshot | None:
+    """The cached catalog if it was verified recently enough, else None."""
+    if time.monotonic() - _checked_at < settings.CATALOG_RECHECK_SECONDS:
+        return _snapshot
+    return None
+
+
+def load(db: Session) -> CatalogSnapshot:
+    """Re-check the catalog version and reload the steps only if it moved.
+
+    The version is read before the rows, so a concurrent write can only make
+    the cached rows newer than their version, which the next check corrects.
+    """
+    global _snapshot, _checked_at
+
+    generation = _generation
+    version = db.scalar(select(CatalogVersion.version).where(CatalogVersion.name == CATALOG_NAME)) or 0
+
+    snapshot = _snapshot
+    if snapshot is None or snapshot.version != version:
+        rows = db.query(RoadmapStep).order_by(RoadmapStep.step_order.asc()).all()
+        snapshot = CatalogSnapshot(version, tuple(RoadmapStepOut.model_validate(r) for r in rows))
+
+    with _lock:
+        _snapshot = snapshot
+        if generation == _generation:
+            _checked_at = time.monotonic()
+    return snapshot
+
+
+def get(db: Session) -> CatalogSnapshot:
+    return peek() or load(db)
@@ -0,0 +1,58 @@
+from collections.abc import Iterable
+from uuid import uuid4
+
+from sqlalchemy import func
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.orm import Session
+
+from app.models import UserStepMetric
+from app.schemas.user_step_metric import UserStepMetricUpsert
+
+_RETURNING = (
+    UserStepMetric.id,
+    UserStepMetric.user_id,
+    UserStepMetric.step_key,
+    UserStepMetric.metric_key,
+    UserStepMetric.value_num,
+    UserStepMetric.value_text,
+)
+
+
+def upsert_metrics(db: Session, user_id: str, items: Iterable[UserStepMetricUpsert]) -> list[dict]:
+    """Upsert a batch of metrics for one user in a single statement.
+
+    ``INSERT ... ON CONFLICT (uq_user_step_metric) DO UPDATE ... RETURNING``:
+    value_num always takes the new value, value_text only when one was sent.
+    Returns one row per item, in input order. Runs in the caller's transaction.
+    """
+    items = list(items)
+    if not items:
+        return []
+
+    # Postgres refuses to update the same row twice in one statement, so
+    # repeated keys are merged first with the same rules the upsert applies.
+    merged: dict[tuple[str, str], dict] = {}
+    for item in items:
+        key = (item.step_key, item.metric_key)
+        prev = merged.get(key)
+        merged[key] = {
+            "id": prev["id"] if prev else uuid4(),
+            "user_id": user_id,
+            "step_key": item.step_key,
+            "metric_key": item.metric_key,
+            "value_num": item.value_num,
+            "value_text": item.value_text if item.value_text is not None or prev is None else prev["value_text"],
+        }
+
+    stmt = pg_insert(UserStepMetric).values(list(merged.values()))
+    stmt = stmt.on_conflict_do_update(
+        index_elements=["user_id", "step_key", "metric_key"],
+        set_={
+            "value_num": stmt.excluded.value_num,
+            "value_text": func.coalesce(stmt.excluded.value_text, UserStepMetric.value_text),
+            "updated_at": func.now(),
+        },
+    ).returning(*_RETURNING)
+
+    rows = {(r["step_key"], r["metric_key"]): dict(r) for r in db.execute(stmt).mappings()}
+    return [rows[(item.step_key, item.metric_key)] for item in items]
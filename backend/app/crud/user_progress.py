@@ -0,0 +1,54 @@
+from uuid import uuid4
+
+from sqlalchemy import func, literal, select, true
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.orm import Session
+
+from app.models import RoadmapStep, User, UserStepProgress
+
+
+def provision_progress(db: Session, user_id: str | None = None, step_key: str | None = None) -> int:
+    """Create missing progress rows (progress 0) in one statement.
+
+    ``INSERT ... SELECT ... ON CONFLICT DO NOTHING`` against uq_user_step, so
+    it is idempotent and safe under concurrency. Narrow it to one user
+    (signup) and/or one step (new catalog step); with neither it backfills
+    every user x step pair. Runs in the caller's transaction.
+    """
+    # INSERT ... SELECT skips the Python-side uuid default, so mint ids in SQL
+    source = (
+        select(func.gen_random_uuid(), User.id, RoadmapStep.key, literal(0))
+        .select_from(User)
+        .join(RoadmapStep, true())
+    )
+    if user_id is not None:
+        source = source.where(User.id == user_id)
+    if step_key is not None:
+        source = source.where(RoadmapStep.key == step_key)
+
+    stmt = (
+        pg_insert(UserStepProgress)
+        .from_select(["id", "user_id", "step_key", "progress"], source)
+        .on_conflict_do_nothing(index_elements=["user_id", "step_key"])
+    )
+    return db.execute(stmt).rowcount
+
+
+def upsert_progress(db: Session, user_id: str, step_key: str, progress: int) -> dict:
+    """Set one step's progress with a single ``ON CONFLICT (uq_user_step) DO UPDATE``."""
+    stmt = pg_insert(UserStepProgress).values(
+        id=uuid4(),
+        user_id=user_id,
+        step_key=step_key,
+        progress=progress,
+    )
+    stmt = stmt.on_conflict_do_update(
+        index_elements=["user_id", "step_key"],
+        set_={"progress": stmt.excluded.progress, "updated_at": func.now()},
+    ).returning(
+        UserStepProgress.id,
+        UserStepProgress.user_id,
+        UserStepProgress.step_key,
+        UserStepProgress.progress,
+    )
+    return dict(db.execute(stmt).mappings().one())
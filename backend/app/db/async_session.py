@@ -0,0 +1,52 @@
+# backend/app/db/async_session.py
+from sqlalchemy.engine import URL, make_url
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+from sqlalchemy.pool import AsyncAdaptedQueuePool
+
+from app.core.config import settings
+from app.db.pool_stats import attach_events, stats_for
+from app.db.session import pool_options
+
+ASYNC_DRIVERS = {"postgresql": "asyncpg", "sqlite": "aiosqlite"}
+
+
+def async_url(url: str) -> tuple[URL, dict]:
+    """Point a sync SQLAlchemy URL at the matching async driver.
+
+    asyncpg does not understand libpq's ``sslmode``, so it is moved into the
+    ``ssl`` connect argument.
+    """
+    parsed = make_url(url)
+    dialect = parsed.get_backend_name()
+    connect_args: dict = {}
+
+    sslmode = parsed.query.get("sslmode")
+    if sslmode or "neon.tech" in (parsed.host or ""):
+        connect_args["ssl"] = sslmode or "require"
+        parsed = parsed.difference_update_query(["sslmode"])
+
+    if dialect in ASYNC_DRIVERS:
+        parsed = parsed.set(drivername=f"{dialect}+{ASYNC_DRIVERS[dialect]}")
+    return parsed, connect_args
+
+
+ASYNC_DATABASE_URL, _connect_args = async_url(settings.DATABASE_URL)
+
+if settings.DB_PGBOUNCER and ASYNC_DATABASE_URL.get_backend_name() == "postgresql":
+    # PgBouncer in transaction mode cannot keep per-connection prepared statements
+    _connect_args.update(statement_cache_size=0, prepared_statement_cache_size=0)
+
+async_engine = create_async_engine(
+    ASYNC_DATABASE_URL,
+    connect_args=_connect_args,
+    **pool_options(AsyncAdaptedQueuePool, "async"),
+)
+attach_events(async_engine.sync_engine, stats_for("async"))
+
+# expire_on_commit=False: handlers return ORM rows after commit and FastAPI
+# serializes them outside the session, where no lazy IO is allowed.
+AsyncSessionLocal = async_sessionmaker(
+    async_engine,
+    autoflush=False,
+    expire_on_commit=False,
+)
@@ -0,0 +1,45 @@
+from pathlib import Path
+
+from alembic import command
+from alembic.config import Config
+from sqlalchemy import inspect
+
+from app.db import partitions, seed_expense_buckets
+from app.db.seed_roadmap import seed
+from app.db.session import Base, engine
+
+ALEMBIC_INI = Path(__file__).resolve().parents[2] / "alembic.ini"
+
+# The schema the app's old create_all-at-import produced: the models as of
+# this revision, the last one before migrations became the only way in.
+LEGACY_REVISION = "c51cc2070bd4"
+
+
+def migrate() -> None:
+    """Bring the schema to the latest Alembic revision.
+
+    An empty database gets the current models created and is stamped at
+    head. One with tables but never stamped was created by the old
+    create_all-at-import; it is stamped at LEGACY_REVISION and upgraded
+    from there, so it gets every later column, backfill and table.
+    Everything else goes through ``alembic upgrade head``.
+    """
+    cfg = Config(str(ALEMBIC_INI))
+    tables = inspect(engine).get_table_names()
+
+    if not tables:
+        Base.metadata.create_all(bind=engine)
+        command.stamp(cfg, "head")
+        return
+
+    if "alembic_version" not in tables:
+        command.stamp(cfg, LEGACY_REVISION)
+    command.upgrade(cfg, "head")
+
+
+if __name__ == "__main__":
+    migrate()
+    partitions.ensure()
+    inserted = seed()
+    buckets = seed_expense_buckets.seed()
+    print(f"✅ Database ready ({inserted} roadmap steps, {buckets} expense buckets seeded)")
@@ -0,0 +1,70 @@
+import argparse
+import csv
+from datetime import date, timedelta
+from decimal import Decimal, InvalidOperation
+from pathlib import Path
+
+from app.core.config import settings
+from app.crud import fx_rates
+from app.db.reconvert_entries import reconvert
+from app.db.session import SessionLocal
+
+
+def read_rates(path: str | Path) -> list[tuple[str, date, Decimal]]:
+    """(currency, date, rate) rows of a ``date,currency,rate`` CSV file.
+
+    ``rate`` is units of the base currency per one unit of ``currency``
+    (for a CAD base, USD around 1.37). Raises ValueError naming the line
+    of the first bad row.
+    """
+    out = []
+    with Path(path).open(newline="") as f:
+        for line, row in enumerate(csv.DictReader(f), start=2):
+            try:
+                currency = row["currency"].strip().upper()
+                rate = Decimal(row["rate"])
+                out.append((currency, date.fromisoformat(row["date"].strip()), rate))
+            except (KeyError, AttributeError, ValueError, InvalidOperation) as e:
+                raise ValueError(f"{path}:{line}: expected date,currency,rate ({e})") from e
+            if not currency or len(currency) > 8 or not rate > 0:
+                raise ValueError(f"{path}:{line}: bad currency or rate")
+    return out
+
+
+def load(path: str | Path) -> list[tuple[str, date, Decimal]]:
+    """Upsert the rates of ``path`` into fx_rates; returns them."""
+    rates = read_rates(path)
+    db = SessionLocal()
+    try:
+        fx_rates.store(db, rates)
+        db.commit()
+    except Exception:
+        db.rollback()
+        raise
+    finally:
+        db.close()
+    return rates
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Load daily exchange rates into fx_rates")
+    parser.add_argument("path", nargs="?", default=settings.FX_RATES_FILE, help="date,currency,rate CSV file")
+    parser.add_argument(
+        "--reconvert",
+        action="store_true",
+        help="then re-convert the entries the loaded rates apply to",
+    )
+    args = parser.parse_args()
+
+    rates = load(args.path)
+    print(f"✅ Loaded {len(rates)} {settings.BASE_CURRENCY} rates from {args.path}")
+
+    if args.reconvert:
+        spans: dict[str, tuple[date, date]] = {}
+        for currency, d, _ in rates:
+            lo, hi = spans.get(currency, (d, d))
+            spans[currency] = (min(lo, d), max(hi, d))
+        for currency, (lo, hi) in sorted(spans.items()):
+            # a rate also stands in for the days after it that have none
+            changed, missing, overflow = reconvert(currency, lo, hi + timedelta(days=settings.FX_MAX_STALE_DAYS))
+            print(f"✅ {currency}: re-converted {changed} entries ({missing} without a rate, {overflow} too large)")
@@ -0,0 +1,154 @@
+import argparse
+from datetime import date
+
+from sqlalchemy import text
+from sqlalchemy.orm import Session
+
+from app.db.session import SessionLocal
+
+PARENT = "entries"
+DEFAULT_PARTITION = "entries_default"
+YEARS_AHEAD = 2
+
+# serializes partition changes across workers and cron runs
+_LOCK_KEY = 0x656E7472  # "entr"
+
+
+def partition_name(year: int) -> str:
+    return f"{PARENT}_y{year}"
+
+
+def _is_postgres(db: Session) -> bool:
+    return db.get_bind().dialect.name == "postgresql"
+
+
+def yearly_partitions(db: Session) -> dict[int, str]:
+    """year -> partition name of every yearly partition attached to entries."""
+    names = db.scalars(
+        text(
+            "SELECT c.relname FROM pg_inherits i JOIN pg_class c ON c.oid = i.inhrelid "
+            "WHERE i.inhparent = CAST(:parent AS regclass)"
+        ),
+        {"parent": PARENT},
+    ).all()
+    prefix = f"{PARENT}_y"
+    return {int(n[len(prefix):]): n for n in names if n.startswith(prefix) and n[len(prefix):].isdigit()}
+
+
+def _create_partition(db: Session, year: int) -> None:
+    """Attach a partition for ``year``, taking over any of its rows from the default partition.
+
+    Postgres refuses to add a partition whose range the default partition
+    holds rows for, so those rows are moved into the new table first; the
+    default is normally empty and this is a no-op move. Writes to the
+    default partition wait until the transaction ends, so no row can land
+    in (or change within) that range between the move and the ATTACH.
+    """
+    name = partition_name(year)
+    bounds = {"lo": date(year, 1, 1), "hi": date(year + 1, 1, 1)}
+    db.execute(text(f"CREATE TABLE {name} (LIKE {PARENT} INCLUDING DEFAULTS INCLUDING CONSTRAINTS)"))
+    # EXCLUSIVE still lets readers in
+    db.execute(text(f"LOCK TABLE {DEFAULT_PARTITION} IN EXCLUSIVE MODE"))
+    db.execute(
+        text(
+            f"WITH moved AS (DELETE FROM {DEFAULT_PARTITION} WHERE date >= :lo AND date < :hi RETURNING *) "
+            f"INSERT INTO {name} SELECT * FROM moved"
+        ),
+        bounds,
+    )
+    # the parent's indexes are created on the new partition as it is attached
+    db.execute(
+        text(
+            f"ALTER TABLE {PARENT} ATTACH PARTITION {name} "
+            f"FOR VALUES FROM ('{bounds['lo'].isoformat()}') TO ('{bounds['hi'].isoformat()}')"
+        )
+    )
+
+
+def ensure_partitions(db: Session, years_ahead: int = YEARS_AHEAD, today: date | None = None) -> list[str]:
+    """Create the yearly partitions entries will need; returns the ones created.
+
+    That is this year through ``years_ahead`` years out, plus every year the
+    default partition has rows for (entries dated before the first
+    partition or too far ahead). Idempotent and safe to run from every
+    worker and from cron. Does nothing outside Postgres.
+    """
+    if not _is_postgres(db):
+        return []
+
+    today = today or date.today()
+    db.execute(text("SELECT pg_advisory_xact_lock(:key)"), {"key": _LOCK_KEY})
+
+    # a schema made by create_all has the partitioned parent only
+    db.execute(text(f"CREATE TABLE IF NOT EXISTS {DEFAULT_PARTITION} PARTITION OF {PARENT} DEFAULT"))
+
+    existing = yearly_partitions(db)
+    stray = db.scalars(
+        text(f"SELECT DISTINCT CAST(extract(year FROM date) AS integer) FROM {DEFAULT_PARTITION}")
+    ).all()
+    wanted = set(range(today.year, today.year + years_ahead + 1)) | set(stray)
+
+    created = []
+    for year in sorted(wanted - existing.keys()):
+        _create_partition(db, year)
+        created.append(partition_name(year))
+    db.commit()
+    return created
+
+
+def ensure(years_ahead: int = YEARS_AHEAD) -> list[str]:
+    """ensure_partitions in a session of its own, for startup and init_db."""
+    db = SessionLocal()
+    try:
+        return ensure_partitions(db, years_ahead)
+    except Exception:
+        db.rollback()
+        raise
+    finally:
+        db.close()
+
+
+def move_to_tablespace(db: Session, before_year: int, tablespace: str) -> list[str]:
+    """Move the yearly partitions older than ``before_year`` (and their indexes) to ``tablespace``.
+
+    For putting closed years on cheaper storage. Each move rewrites the
+    partition under an exclusive lock on that partition only, which old
+    years can afford; other years and the parent stay available.
+    """
+    if not _is_postgres(db):
+        return []
+
+    quote = db.get_bind().dialect.identifier_preparer.quote
+    moved = []
+    for year, name in sorted(yearly_partitions(db).items()):
+        if year >= before_year:
+            continue
+        current = db.scalar(text("SELECT tablespace FROM pg_tables WHERE tablename = :name"), {"name": name})
+        if current == tablespace:
+            continue
+        db.execute(text(f"ALTER TABLE {name} SET TABLESPACE {quote(tablespace)}"))
+        for index in db.scalars(text("SELECT indexname FROM pg_indexes WHERE tablename = :name"), {"name": name}):
+            db.execute(text(f"ALTER INDEX {quote(index)} SET TABLESPACE {quote(tablespace)}"))
+        db.commit()
+        moved.append(name)
+    return moved
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Create upcoming yearly entries partitions")
+    parser.add_argument("--years-ahead", type=int, default=YEARS_AHEAD)
+    parser.add_argument("--tablespace", default=None, help="also move old partitions to this tablespace")
+    parser.add_argument("--before", type=int, default=None, help="years before this one count as old")
+    args = parser.parse_args()
+
+    created = ensure(args.years_ahead)
+    print(f"✅ Entries partitions ready ({', '.join(created) or 'none'} created)")
+
+    if args.tablespace:
+        before = args.before if args.before is not None else date.today().year - 1
+        db = SessionLocal()
+        try:
+            moved = move_to_tablespace(db, before, args.tablespace)
+        finally:
+            db.close()
+        print(f"✅ Moved to {args.tablespace}: {', '.join(moved) or 'none'}")
@@ -0,0 +1,130 @@
+import threading
+import time
+from collections import deque
+
+from sqlalchemy import event, exc
+
+
+class PoolStats:
+    """Live counters for one connection pool.
+
+    Fed by the instrumented pool classes below and by pool events; read by
+    /health/db so pool sizes can be tuned from real numbers.
+    """
+
+    def __init__(self, name: str, recent: int = 1000):
+        self.name = name
+        self._lock = threading.Lock()
+        self._waits: deque[float] = deque(maxlen=recent)
+
+        self.checkouts = 0
+        self.checked_out = 0
+        self.peak_checked_out = 0
+        self.connects = 0
+        self.overflow_connects = 0
+        self.timeouts = 0
+        self.waits = 0
+        self.wait_total = 0.0
+        self.wait_max = 0.0
+
+    def record_wait(self, seconds: float, timed_out: bool = False) -> None:
+        with self._lock:
+            self._waits.append(seconds)
+            self.waits += 1
+            self.wait_total += seconds
+            self.wait_max = max(self.wait_max, seconds)
+            if timed_out:
+                self.timeouts += 1
+
+    def on_checkout(self) -> None:
+        with self._lock:
+            self.checkouts += 1
+            self.checked_out += 1
+            self.peak_checked_out = max(self.peak_checked_out, self.checked_out)
+
+    def on_checkin(self) -> None:
+        with self._lock:
+            self.checked_out = max(self.checked_out - 1, 0)
+
+    def on_connect(self, overflow: bool) -> None:
+        with self._lock:
+            self.connects += 1
+            if overflow:
+                self.overflow_connects += 1
+
+    def snapshot(self, pool=None) -> dict:
+        with self._lock:
+            waits = sorted(self._waits)
+            out = {
+                "checkouts": self.checkouts,
+                "checked_out": self.checked_out,
+                "peak_checked_out": self.peak_checked_out,
+                "connects": self.connects,
+                "overflow_connects": self.overflow_connects,
+                "timeouts": self.timeouts,
+                "wait_ms": {
+                    "avg": (self.wait_total / self.waits * 1000) if self.waits else 0.0,
+                    "p50": _pct(waits, 50) * 1000,
+                    "p99": _pct(waits, 99) * 1000,
+                    "max": self.wait_max * 1000,
+                },
+            }
+
+        if pool is not None:
+            out["pool"] = {"class": type(pool).__name__, "status": pool.status()}
+            for attr in ("size", "overflow", "checkedin"):
+                fn = getattr(pool, attr, None)
+                if callable(fn):
+                    out["pool"][attr] = fn()
+        return out
+
+
+def _pct(ordered: list[float], pct: float) -> float:
+    if not ordered:
+        return 0.0
+    return ordered[min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))]
+
+
+_registry: dict[str, PoolStats] = {}
+
+
+def stats_for(name: str) -> PoolStats:
+    return _registry.setdefault(name, PoolStats(name))
+
+
+def all_stats() -> dict[str, PoolStats]:
+    return dict(_registry)
+
+
+def instrumented_pool(base: type, stats: PoolStats) -> type:
+    """Subclass a pool class so every checkout records how long it waited."""
+
+    def _do_get(self):
+        started = time.perf_counter()
+        try:
+            conn = base._do_get(self)
+        except Exception as e:
+            stats.record_wait(time.perf_counter() - started, timed_out=isinstance(e, exc.TimeoutError))
+            raise
+        stats.record_wait(time.perf_counter() - started)
+        return conn
+
+    return type(f"Instrumented{base.__name__}", (base,), {"_do_get": _do_get, "stats": stats})
+
+
+def attach_events(engine, stats: PoolStats) -> None:
+    """Count checkouts/checkins/connects on an Engine (sync_engine for async ones)."""
+
+    @event.listens_for(engine, "checkout")
+    def _checkout(dbapi_conn, record, proxy):
+        stats.on_checkout()
+
+    @event.listens_for(engine, "checkin")
+    def _checkin(dbapi_conn, record):
+        stats.on_checkin()
+
+    @event.listens_for(engine, "connect")
+    def _connect(dbapi_conn, record):
+        # QueuePool bumps its overflow counter before opening the connection
+        overflow = getattr(engine.pool, "overflow", None)
+        stats.on_connect(overflow is not None and overflow() > 0)
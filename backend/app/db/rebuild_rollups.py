@@ -0,0 +1,63 @@
+import argparse
+
+from sqlalchemy import delete, func, insert, select
+
+from app.crud.data_version import bump_all_data_versions, bump_data_version
+from app.db.session import SessionLocal
+from app.models import Entry, EntryMonthlyRollup
+
+
+def rebuild(user_id: str | None = None) -> int:
+    """Recompute entry_monthly_rollups from the entries table.
+
+    Backfills the rollup after the migration and repairs drift; pass a user_id
+    to rebuild a single user. Returns the number of rollup rows written.
+    """
+    db = SessionLocal()
+    try:
+        clear = delete(EntryMonthlyRollup)
+        source = (
+            select(
+                Entry.user_id,
+                Entry.year,
+                Entry.month,
+                Entry.type,
+                Entry.category,
+                func.sum(Entry.amount_base),
+                func.count(),
+            )
+            .where(Entry.is_deleted == False)  # noqa: E712
+            .group_by(Entry.user_id, Entry.year, Entry.month, Entry.type, Entry.category)
+        )
+        if user_id is not None:
+            clear = clear.where(EntryMonthlyRollup.user_id == user_id)
+            source = source.where(Entry.user_id == user_id)
+
+        db.execute(clear)
+        result = db.execute(
+            insert(EntryMonthlyRollup).from_select(
+                ["user_id", "year", "month", "type", "category", "total", "entry_count"],
+                source,
+            )
+        )
+        # summaries read the rollup, so cached responses are stale now
+        if user_id is not None:
+            bump_data_version(db, user_id)
+        else:
+            bump_all_data_versions(db)
+        db.commit()
+        return result.rowcount
+    except Exception:
+        db.rollback()
+        raise
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Rebuild entry_monthly_rollups from entries")
+    parser.add_argument("--user-id", default=None, help="only rebuild this user")
+    args = parser.parse_args()
+
+    rows = rebuild(args.user_id)
+    print(f"✅ Rebuilt entry_monthly_rollups ({rows} rows)")
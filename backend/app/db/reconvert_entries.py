@@ -0,0 +1,121 @@
+import argparse
+from collections import defaultdict
+from datetime import date
+from decimal import Decimal
+
+from sqlalchemy import func, select, update
+
+from app.core.config import settings
+from app.core.fx import storable
+from app.crud.data_version import bump_data_version
+from app.crud.entry import RollupKey, shift_rollup_totals
+from app.crud.fx_rates import entry_rate
+from app.db.session import SessionLocal
+from app.models import Entry
+
+
+def _months(first: date, last: date):
+    """[lo, hi) date windows covering first..last, one per calendar month."""
+    lo = first
+    while lo <= last:
+        hi = date(lo.year + 1, 1, 1) if lo.month == 12 else date(lo.year, lo.month + 1, 1)
+        yield lo, hi
+        lo = hi
+
+
+def reconvert(
+    currency: str | None = None,
+    start: date | None = None,
+    end: date | None = None,
+    max_stale_days: int = settings.FX_MAX_STALE_DAYS,
+) -> tuple[int, int, int]:
+    """Re-set entries.amount_base from the stored rates, e.g. after rates were loaded or corrected.
+
+    Optionally only entries in ``currency`` and dated ``start``..``end``.
+    Works one calendar month at a time, each its own transaction (and one
+    yearly partition): the month's rows whose converted amount changed are
+    locked and updated, and the difference is moved into the rollups in the
+    same transaction, so totals never disagree with the entries. Entries
+    without a usable rate, or whose converted amount would not fit
+    numeric(12, 2), keep their amount and are counted instead of failing
+    the run. Returns (entries changed, entries without a rate, entries
+    too large to convert).
+    """
+    converted = func.round(Entry.amount * entry_rate(max_stale_days), 2).label("converted")
+    scope = []
+    if currency is not None:
+        scope.append(func.upper(Entry.currency) == currency.upper())
+    if start is not None:
+        scope.append(Entry.date >= start)
+    if end is not None:
+        scope.append(Entry.date <= end)
+
+    changed = missing = overflow = 0
+    db = SessionLocal()
+    try:
+        first, last = db.execute(select(func.min(Entry.date), func.max(Entry.date)).where(*scope)).one()
+        if first is None:
+            return 0, 0, 0
+
+        for lo, hi in _months(first, last):
+            rows = db.execute(
+                select(
+                    Entry.id,
+                    Entry.date,
+                    Entry.user_id,
+                    Entry.year,
+                    Entry.month,
+                    Entry.type,
+                    Entry.category,
+                    Entry.is_deleted,
+                    Entry.amount_base,
+                    converted,
+                )
+                .where(*scope, Entry.date >= lo, Entry.date < hi, converted.is_distinct_from(Entry.amount_base))
+                .with_for_update(of=Entry)
+            ).all()
+
+            values = []
+            deltas: dict[RollupKey, Decimal] = defaultdict(Decimal)
+            users = set()
+            for r in rows:
+                if r.converted is None:
+                    missing += 1
+                    continue
+                if not storable(Decimal(str(r.converted))):
+                    overflow += 1
+                    continue
+                values.append({"id": r.id, "date": r.date, "amount_base": r.converted})
+                users.add(r.user_id)
+                if not r.is_deleted:
+                    key = RollupKey(r.user_id, r.year, r.month, r.type, r.category)
+                    deltas[key] += Decimal(str(r.converted)) - Decimal(str(r.amount_base))
+
+            if values:
+                # by primary key, so each UPDATE stays in the month's partition
+                db.execute(update(Entry), values)
+                shift_rollup_totals(db, deltas)
+                for user_id in users:
+                    bump_data_version(db, user_id)
+                changed += len(values)
+            db.commit()
+        return changed, missing, overflow
+    except Exception:
+        db.rollback()
+        raise
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Re-convert entries to the base currency from fx_rates")
+    parser.add_argument("--currency", default=None, help="only entries in this currency")
+    parser.add_argument("--from", dest="start", type=date.fromisoformat, default=None, help="first date, YYYY-MM-DD")
+    parser.add_argument("--to", dest="end", type=date.fromisoformat, default=None, help="last date, YYYY-MM-DD")
+    args = parser.parse_args()
+
+    changed, missing, overflow = reconvert(args.currency, args.start, args.end)
+    print(
+        f"✅ Re-converted {changed} entries to {settings.BASE_CURRENCY} "
+        f"({missing} without a rate, {overflow} too large to convert)"
+    )
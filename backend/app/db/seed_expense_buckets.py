@@ -0,0 +1,48 @@
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+
+from app.db.session import SessionLocal
+from app.crud.data_version import bump_catalog_version
+from app.models import ExpenseBucket
+
+CATALOG_NAME = "expense_buckets"
+
+# bucket (a FullFundSeed field) -> entry categories counted toward it, lowercased
+BUCKETS = {
+    "rent": ["rent", "mortgage", "housing"],
+    "utilities": ["utilities", "hydro", "electricity", "water", "heating"],
+    "groceries": ["groceries", "food"],
+    "transportation": ["transportation", "travel", "transit", "gas", "fuel"],
+    "phone_internet": ["phone", "internet", "phone / internet", "phone/internet"],
+    "insurance": ["insurance"],
+    "minimum_debt_payments": ["debt", "loan", "credit card", "minimum debt payments"],
+    "essential_medical_costs": ["medical", "health", "pharmacy", "essential medical costs"],
+    "child_essentials": ["child", "kids", "baby", "childcare", "child essentials"],
+    "other_expenses": ["other"],
+}
+
+rows = [{"category": c, "bucket": b} for b, categories in BUCKETS.items() for c in categories]
+
+
+def seed() -> int:
+    """Insert any missing category -> bucket rows; existing categories are left untouched.
+
+    Safe to run on every deploy. Returns the number of rows inserted.
+    """
+    db = SessionLocal()
+    try:
+        stmt = pg_insert(ExpenseBucket).values(rows).on_conflict_do_nothing(index_elements=["category"])
+        inserted = db.execute(stmt).rowcount
+        if inserted:
+            bump_catalog_version(db, CATALOG_NAME)
+        db.commit()
+        return inserted
+    except Exception:
+        db.rollback()
+        raise
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    inserted = seed()
+    print(f"✅ Expense buckets seeded ({inserted} new)")
@@ -1,28 +1,40 @@
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+
 from app.db.session import SessionLocal
+from app.crud import roadmap_catalog
 from app.models import RoadmapStep
 
 steps = [
-    {"key":"starter-fund","title":"Starter Emergency Fund","subtitle":"Build a quick buffer","step_order":1},
-    {"key":"debt","title":"Eliminate High-Interest Debt","subtitle":"Stop interest bleeding","step_order":2},
-    {"key":"insurance","title":"Insurance Protection","subtitle":"Protect your foundation","step_order":3},
-    {"key":"full-fund","title":"Full Emergency Fund","subtitle":"3–6 months essentials","step_order":4},
-    {"key":"automate","title":"Automate Saving","subtitle":"Make it consistent","step_order":5},
-    {"key":"invest","title":"Start Investing","subtitle":"Let money grow","step_order":6},
-    {"key":"income","title":"Increase Income","subtitle":"Fastest lever","step_order":8},
-    {"key":"fi","title":"Financial Independence","subtitle":"Work becomes optional","step_order":9},
+    {"key": "starter-fund", "title": "Starter Emergency Fund", "subtitle": "Build your first safety cushion", "step_order": 1},
+    {"key": "debt", "title": "Eliminate High-Interest Debt", "subtitle": "Reduce costly debt faster", "step_order": 2},
+    {"key": "insurance", "title": "Insurance", "subtitle": "Protect against major financial risks", "step_order": 3},
+    {"key": "full-fund", "title": "Full Emergency Fund", "subtitle": "Save 3 to 6 months of essential expenses", "step_order": 4},
+    {"key": "automate", "title": "Automate Saving", "subtitle": "Make saving consistent and effortless", "step_order": 5},
+    {"key": "invest", "title": "Invest", "subtitle": "Grow your money for the long term", "step_order": 6},
+    {"key": "income", "title": "Increase Income", "subtitle": "Create more room to build wealth", "step_order": 7},
 ]
 
-def seed():
-    db = SessionLocal()
 
-    for s in steps:
-        exists = db.query(RoadmapStep).filter(RoadmapStep.key == s["key"]).first()
-        if not exists:
-            db.add(RoadmapStep(**s))
+def seed() -> int:
+    """Insert any missing roadmap steps; existing keys are left untouched.
+
+    Safe to run on every deploy. Returns the number of steps inserted.
+    """
+    db = SessionLocal()
+    try:
+        stmt = pg_insert(RoadmapStep).values(steps).on_conflict_do_nothing(index_elements=["key"])
+        inserted = db.execute(stmt).rowcount
+        if inserted:
+            roadmap_catalog.bump_version(db)
+        db.commit()
+        return inserted
+    except Exception:
+        db.rollback()
+        raise
+    finally:
+        db.close()
 
-    db.commit()
-    db.close()
-    print("✅ Roadmap steps seeded successfully")
 
 if __name__ == "__main__":
-    seed()
\ No newline at end of file
+    inserted = seed()
+    print(f"✅ Roadmap steps seeded ({inserted} new)")
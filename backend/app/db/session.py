@@ -1,13 +1,47 @@
 # backend/app/db/session.py
-import os
 from sqlalchemy import create_engine
+from sqlalchemy.engine import make_url
 from sqlalchemy.orm import sessionmaker, declarative_base
+from sqlalchemy.pool import NullPool, QueuePool
 
-DATABASE_URL = os.getenv(
-    "DATABASE_URL",
-    "postgresql+psycopg2://postgres:postgres@db:5432/moneycompass"
+from app.core.config import settings
+from app.db.pool_stats import attach_events, instrumented_pool, stats_for
+
+DATABASE_URL = settings.DATABASE_URL
+
+
+def pool_options(queue_pool: type, stats_name: str) -> dict:
+    """create_engine pool arguments from settings, shared by the sync and async engines."""
+    stats = stats_for(stats_name)
+
+    if settings.DB_PGBOUNCER:
+        return {"poolclass": instrumented_pool(NullPool, stats)}
+
+    return {
+        "poolclass": instrumented_pool(queue_pool, stats),
+        "pool_size": settings.DB_POOL_SIZE,
+        "max_overflow": settings.DB_MAX_OVERFLOW,
+        "pool_timeout": settings.DB_POOL_TIMEOUT,
+        "pool_recycle": settings.DB_POOL_RECYCLE,
+        "pool_pre_ping": settings.DB_POOL_PRE_PING,
+    }
+
+
+def _connect_args(url: str) -> dict:
+    parsed = make_url(url)
+    if parsed.get_backend_name() != "postgresql":
+        return {}
+    if "neon.tech" in (parsed.host or "") and "sslmode" not in parsed.query:
+        return {"sslmode": "require"}
+    return {}
+
+
+engine = create_engine(
+    DATABASE_URL,
+    connect_args=_connect_args(DATABASE_URL),
+    **pool_options(QueuePool, "sync"),
 )
+attach_events(engine, stats_for("sync"))
 
-engine = create_engine(DATABASE_URL, pool_pre_ping=True)
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
-Base = declarative_base()
\ No newline at end of file
+Base = declarative_base()
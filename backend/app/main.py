@@ -1,10 +1,13 @@
+import asyncio
+import logging
+from contextlib import asynccontextmanager
+
 from fastapi import FastAPI
-from app.db.session import Base, engine, SessionLocal
-from app import models  # make sure models are registered before create_all
-from app.models import RoadmapStep
-from app.api.entries import router as entries_router
+from fastapi.concurrency import run_in_threadpool
 from fastapi.middleware.cors import CORSMiddleware
-import os
+
+from app.core.config import settings
+from app.api.entries import router as entries_router
 from app.api.roadmap_steps import router as roadmap_steps_router
 from app.api.user_steps_progress import router as user_steps_progress_router
 from app.api.user_step_metrics import router as user_step_metrics_router
@@ -14,80 +17,56 @@ from app.api.user_debts import router as user_debts_router
 from app.api.user_saving_goals import router as user_saving_goals
 from app.api.user_investments import router as user_investments_router
 from app.api.users import router as users_router
-from sqlalchemy.orm import Session
+from app.api.health import router as health_router
+from app.api.me import router as me_router
+from app.api.market import router as market_router
 
-print("✅ RUNNING FASTAPI MAIN.PY FROM:", os.path.abspath(__file__))
+logger = logging.getLogger(__name__)
 
-app = FastAPI()
 
+async def ensure_partitions() -> None:
+    from app.db import partitions
 
-def seed_roadmap_steps():
-    db: Session = SessionLocal()
     try:
-        existing = db.query(RoadmapStep).first()
-        if existing:
-            return
-
-        steps = [
-            {
-                "key": "starter-fund",
-                "title": "Starter Emergency Fund",
-                "subtitle": "Build your first safety cushion",
-                "step_order": 1,
-            },
-            {
-                "key": "debt",
-                "title": "Eliminate High-Interest Debt",
-                "subtitle": "Reduce costly debt faster",
-                "step_order": 2,
-            },
-            {
-                "key": "insurance",
-                "title": "Insurance",
-                "subtitle": "Protect against major financial risks",
-                "step_order": 3,
-            },
-            {
-                "key": "full-fund",
-                "title": "Full Emergency Fund",
-                "subtitle": "Save 3 to 6 months of essential expenses",
-                "step_order": 4,
-            },
-            {
-                "key": "automate",
-                "title": "Automate Saving",
-                "subtitle": "Make saving consistent and effortless",
-                "step_order": 5,
-            },
-            {
-                "key": "invest",
-                "title": "Invest",
-                "subtitle": "Grow your money for the long term",
-                "step_order": 6,
-            },
-            {
-                "key": "income",
-                "title": "Increase Income",
-                "subtitle": "Create more room to build wealth",
-                "step_order": 7,
-            },
-        ]
-
-        for step in steps:
-            db.add(RoadmapStep(**step))
-
-        db.commit()
-        print("✅ Seeded roadmap_steps")
-    except Exception as e:
-        db.rollback()
-        print("❌ Error seeding roadmap_steps:", e)
-        raise
-    finally:
-        db.close()
-
-
-Base.metadata.create_all(bind=engine)
-seed_roadmap_steps()
+        await run_in_threadpool(partitions.ensure)
+    except Exception:
+        logger.exception("Creating entries partitions on startup failed")
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    if settings.SEED_ON_STARTUP:
+        from app.db import seed_expense_buckets, seed_roadmap
+
+        try:
+            await run_in_threadpool(seed_roadmap.seed)
+            await run_in_threadpool(seed_expense_buckets.seed)
+        except Exception:
+            # a briefly unreachable DB must not keep the worker from booting
+            logger.exception("Seeding catalogs on startup failed")
+
+    # off by default: init_db and the scheduled python -m app.db.partitions
+    # create partitions; in the background, so a slow DB never holds up boot
+    partitions_task = asyncio.create_task(ensure_partitions()) if settings.PARTITIONS_ON_STARTUP else None
+
+    yield
+
+    if partitions_task is not None:
+        partitions_task.cancel()
+
+    from app.core.security import shutdown_hash_pool
+    from app.db.session import engine
+
+    shutdown_hash_pool()
+
+    engine.dispose()
+    if settings.DB_ASYNC:
+        from app.db.async_session import async_engine
+
+        await async_engine.dispose()
+
+
+app = FastAPI(lifespan=lifespan)
 
 app.add_middleware(
     CORSMiddleware,
@@ -100,12 +79,10 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["X-Next-Cursor", "ETag"],
 )
 
-@app.get("/health")
-def health():
-    return {"status": "ok"}
-
+app.include_router(health_router)
 app.include_router(entries_router)
 app.include_router(roadmap_steps_router)
 app.include_router(user_steps_progress_router)
@@ -115,4 +92,6 @@ app.include_router(user_roadmap_router)
 app.include_router(user_debts_router)
 app.include_router(user_saving_goals)
 app.include_router(user_investments_router)
-app.include_router(users_router)
\ No newline at end of file
+app.include_router(users_router)
+app.include_router(me_router)
+app.include_router(market_router)
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, String, Date,CheckConstraint, Numeric, ForeignKey, Text, Integer,Boolean, DateTime,UniqueConstraint,DATETIME, func
+from sqlalchemy import BigInteger, Column, String, Date,CheckConstraint, Numeric, ForeignKey, Text, Integer,Boolean, DateTime,UniqueConstraint,DATETIME, Index, func, text
 from sqlalchemy.orm import relationship
 from app.db.session import Base
 from datetime import datetime
@@ -22,10 +22,46 @@ class User(Base):
 
 
 class Entry(Base):
+  """A user's income or expense line.
+
+  Range-partitioned by ``date``, one partition per year (entries_y2025, ...)
+  plus entries_default for dates no partition covers yet; see
+  app.db.partitions. The primary key carries ``date`` because Postgres
+  requires the partition key in it, and queries filter on date ranges so
+  the planner can skip whole years.
+  """
   __tablename__ = "entries"
 
+  __table_args__ = (
+      # keyset pagination of a user's live ledger: ORDER BY date DESC, id DESC
+      Index(
+          "ix_entries_user_date_id_live",
+          "user_id",
+          text("date DESC"),
+          text("id DESC"),
+          postgresql_where=text("is_deleted = false"),
+      ),
+      # duplicate lookup on import: fingerprint equality plus a date range
+      Index(
+          "ix_entries_user_fingerprint_date_live",
+          "user_id",
+          "fingerprint",
+          "date",
+          postgresql_where=text("is_deleted = false"),
+      ),
+      # every read filters is_deleted = false, so deleted rows stay out of these
+      *(
+          Index(f"ix_entries_{column}_live", column, postgresql_where=text("is_deleted = false"))
+          for column in ("date", "year", "month", "type", "category")
+      ),
+      # what app.db.compact_entries looks for: deleted rows by age
+      Index("ix_entries_deleted_at", "deleted_at", postgresql_where=text("is_deleted = true")),
+      {"postgresql_partition_by": "RANGE (date)"},
+  )
+
   id: Mapped[uuid.UUID] = mapped_column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
 
+  # indexed in full, deleted rows included: deleting a user cascades through it
   user_id: Mapped[str] = mapped_column(
       String,
       ForeignKey("users.id", ondelete="CASCADE"),
@@ -33,20 +69,81 @@ class Entry(Base):
       index=True,
   )
   user = relationship("User", back_populates="entries")
-  date: Mapped[object] = mapped_column(Date, nullable=False, index=True)
-  year: Mapped[int] = mapped_column(Integer, nullable=False, index=True)
-  month: Mapped[int] = mapped_column(Integer, nullable=False, index=True)  
-  type: Mapped[str] = mapped_column(String(10), nullable=False, index=True)  
+  date: Mapped[object] = mapped_column(Date, primary_key=True)
+  year: Mapped[int] = mapped_column(Integer, nullable=False)
+  month: Mapped[int] = mapped_column(Integer, nullable=False)
+  type: Mapped[str] = mapped_column(String(10), nullable=False)
   name: Mapped[str] = mapped_column(String(200), nullable=False)
-  category: Mapped[str] = mapped_column(String(100), nullable=False, index=True)
+  category: Mapped[str] = mapped_column(String(100), nullable=False)
   amount: Mapped[float] = mapped_column(Numeric(12, 2), nullable=False)  
   currency: Mapped[str] = mapped_column(String(8), nullable=False, server_default="CAD")
+  # amount in settings.BASE_CURRENCY at the rate of ``date`` (see app.crud.fx_rates);
+  # set by every write, re-set by app.db.reconvert_entries, summed by the rollups
+  amount_base: Mapped[float] = mapped_column(Numeric(12, 2), nullable=False)
   notes: Mapped[str | None] = mapped_column(Text, nullable=True)
+  # app.core.dedupe.fingerprint(type, amount, name), kept in step by every write
+  fingerprint: Mapped[str | None] = mapped_column(String(32), nullable=True)
   is_deleted: Mapped[bool] = mapped_column(Boolean, nullable=False, server_default="false")
+  deleted_at: Mapped[object | None] = mapped_column(DateTime(timezone=True), nullable=True)
   created_at: Mapped[object] = mapped_column(DateTime(timezone=True), server_default=func.now(), nullable=False)
   updated_at: Mapped[object] = mapped_column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now(), nullable=False)
 
 
+class EntryArchive(Base):
+    """Soft-deleted entries moved out of ``entries`` once past the retention window.
+
+    Same columns as Entry, plus when the row was archived. Filled by
+    ``python -m app.db.compact_entries``; POST /entries/{id}/restore moves a
+    row back.
+    """
+    __tablename__ = "entries_archive"
+
+    __table_args__ = (Index("ix_entries_archive_user_deleted_at", "user_id", "deleted_at"),)
+
+    id: Mapped[uuid.UUID] = mapped_column(UUID(as_uuid=True), primary_key=True)
+    user_id: Mapped[str] = mapped_column(String, ForeignKey("users.id", ondelete="CASCADE"), nullable=False)
+    date: Mapped[object] = mapped_column(Date, nullable=False)
+    year: Mapped[int] = mapped_column(Integer, nullable=False)
+    month: Mapped[int] = mapped_column(Integer, nullable=False)
+    type: Mapped[str] = mapped_column(String(10), nullable=False)
+    name: Mapped[str] = mapped_column(String(200), nullable=False)
+    category: Mapped[str] = mapped_column(String(100), nullable=False)
+    amount: Mapped[float] = mapped_column(Numeric(12, 2), nullable=False)
+    currency: Mapped[str] = mapped_column(String(8), nullable=False)
+    amount_base: Mapped[float] = mapped_column(Numeric(12, 2), nullable=False)
+    notes: Mapped[str | None] = mapped_column(Text, nullable=True)
+    fingerprint: Mapped[str | None] = mapped_column(String(32), nullable=True)
+    is_deleted: Mapped[bool] = mapped_column(Boolean, nullable=False)
+    deleted_at: Mapped[object | None] = mapped_column(DateTime(timezone=True), nullable=True)
+    created_at: Mapped[object] = mapped_column(DateTime(timezone=True), nullable=False)
+    updated_at: Mapped[object] = mapped_column(DateTime(timezone=True), nullable=False)
+    archived_at: Mapped[object] = mapped_column(DateTime(timezone=True), server_default=func.now(), nullable=False)
+
+
+class EntryMonthlyRollup(Base):
+    """Per user/month/type/category totals of live entries.
+
+    Maintained incrementally by the entries router (see app.crud.entry) and
+    rebuilt from scratch with ``python -m app.db.rebuild_rollups``.
+    """
+    __tablename__ = "entry_monthly_rollups"
+
+    user_id: Mapped[str] = mapped_column(
+        String,
+        ForeignKey("users.id", ondelete="CASCADE"),
+        primary_key=True,
+    )
+    year: Mapped[int] = mapped_column(Integer, primary_key=True)
+    month: Mapped[int] = mapped_column(Integer, primary_key=True)
+    type: Mapped[str] = mapped_column(String(10), primary_key=True)
+    category: Mapped[str] = mapped_column(String(100), primary_key=True)
+
+    total: Mapped[float] = mapped_column(Numeric(14, 2), nullable=False, server_default="0")
+    entry_count: Mapped[int] = mapped_column(Integer, nullable=False, server_default="0")
+
+    updated_at: Mapped[object] = mapped_column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now(), nullable=False)
+
+
 class RoadmapStep(Base):
     __tablename__ = "roadmap_steps"
 
@@ -67,6 +164,48 @@ class RoadmapStep(Base):
     updated_at: Mapped[object] = mapped_column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now(), nullable=False)
 
 
+class UserDataVersion(Base):
+    """Per-user change counter behind the conditional GETs.
+
+    Every write to a user's data bumps it in the same transaction (see
+    app.crud.data_version); GET responses carry it as a weak ETag.
+    """
+    __tablename__ = "user_data_versions"
+
+    user_id: Mapped[str] = mapped_column(
+        String,
+        ForeignKey("users.id", ondelete="CASCADE"),
+        primary_key=True,
+    )
+    version: Mapped[int] = mapped_column(BigInteger, nullable=False, server_default="0")
+    updated_at: Mapped[object] = mapped_column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now(), nullable=False)
+
+
+class CatalogVersion(Base):
+    """Change counter per shared catalog (e.g. ``roadmap_steps``).
+
+    Bumped in the same transaction as every catalog write; workers compare it
+    against their cached copy to know when to reload (see app.crud.roadmap_catalog).
+    """
+    __tablename__ = "catalog_versions"
+
+    name: Mapped[str] = mapped_column(String(80), primary_key=True)
+    version: Mapped[int] = mapped_column(BigInteger, nullable=False, server_default="1")
+    updated_at: Mapped[object] = mapped_column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now(), nullable=False)
+
+
+class ExpenseBucket(Base):
+    """Which essential-expense bucket an entry category counts toward.
+
+    ``category`` is stored lowercased and trimmed; categories without a row
+    are not essential. Seeded by app.db.seed_expense_buckets.
+    """
+    __tablename__ = "expense_buckets"
+
+    category: Mapped[str] = mapped_column(String(100), primary_key=True)
+    bucket: Mapped[str] = mapped_column(String(40), nullable=False)
+
+
 class UserStepProgress(Base):
     __tablename__ = "user_steps_progress"
 
@@ -210,6 +349,7 @@ class UserInvestment(Base):
 
     website: Mapped[str | None] = mapped_column(Text, nullable=True)
     preset_id: Mapped[str | None] = mapped_column(String(80), nullable=True)
+    symbol: Mapped[str | None] = mapped_column(String(20), nullable=True)  # price series; presets map via preset_id
     is_custom: Mapped[bool | None] = mapped_column(nullable=True, default=False)
 
     created_at: Mapped[object] = mapped_column(
@@ -221,3 +361,44 @@ class UserInvestment(Base):
         onupdate=func.now(),
         nullable=False,
     )
+
+
+class MarketSymbol(Base):
+    """Which dates of a symbol's daily closes have been asked of the price provider.
+
+    covered_from..covered_to is the requested range, not the dates that have
+    a price (weekends and holidays have none), so a range inside it never
+    goes upstream again. covered_to is re-fetched once it is in the past, in
+    case its close was taken intraday.
+    """
+    __tablename__ = "market_symbols"
+
+    symbol: Mapped[str] = mapped_column(String(20), primary_key=True)
+    covered_from: Mapped[object | None] = mapped_column(Date, nullable=True)
+    covered_to: Mapped[object | None] = mapped_column(Date, nullable=True)
+    fetched_at: Mapped[object | None] = mapped_column(DateTime(timezone=True), nullable=True)
+
+
+class MarketPrice(Base):
+    """Daily close of a symbol, shared by every user (see app.api.market)."""
+    __tablename__ = "market_prices"
+
+    symbol: Mapped[str] = mapped_column(
+        String(20),
+        ForeignKey("market_symbols.symbol", ondelete="CASCADE"),
+        primary_key=True,
+    )
+    date: Mapped[object] = mapped_column(Date, primary_key=True)
+    close: Mapped[float] = mapped_column(Numeric(14, 4), nullable=False)
+
+
+class FxRate(Base):
+    """Daily exchange rate: units of settings.BASE_CURRENCY per one unit of ``currency``.
+
+    Shared by every user; loaded with ``python -m app.db.load_fx_rates``.
+    """
+    __tablename__ = "fx_rates"
+
+    currency: Mapped[str] = mapped_column(String(8), primary_key=True)
+    date: Mapped[object] = mapped_column(Date, primary_key=True)
+    rate: Mapped[float] = mapped_column(Numeric(18, 8), nullable=False)
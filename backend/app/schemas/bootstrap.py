@@ -0,0 +1,19 @@
+from pydantic import BaseModel
+
+from app.schemas.entry import EntryOut
+from app.schemas.user_debt import UserDebtOut
+from app.schemas.user_investments import UserInvestmentOut
+from app.schemas.user_roadmap import UserRoadmapStepOut
+from app.schemas.user_saving_goal import UserSavingGoalOut
+from app.schemas.user_step_metric import UserStepMetricOut
+
+class BootstrapOut(BaseModel):
+    # sections not asked for via include= are left out of the response
+    entries: list[EntryOut] | None = None
+    entries_next_cursor: str | None = None
+    summary: dict | None = None
+    roadmap: list[UserRoadmapStepOut] | None = None
+    metrics: list[UserStepMetricOut] | None = None
+    debts: list[UserDebtOut] | None = None
+    goals: list[UserSavingGoalOut] | None = None
+    investments: list[UserInvestmentOut] | None = None
@@ -1,27 +1,40 @@
 from datetime import date
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, Field, field_validator
 from typing import Optional, Literal
 from uuid import UUID
 
+from app.core.fx import MAX_AMOUNT, cents, storable
+
+
+def storable_amount(amount: float | None) -> float | None:
+    """Reject amounts that would not fit entries.amount (numeric(12, 2)) once rounded to cents."""
+    if amount is not None and not storable(cents(amount)):
+        raise ValueError(f"must be at most {MAX_AMOUNT} in absolute value")
+    return amount
+
 class EntryCreate(BaseModel):
-    user_id: str
+    user_id: str | None = None  # ignored: taken from the access token
     date: date
     type: Literal["income", "expense"]
-    name: str
-    category: str
+    name: str = Field(min_length=1, max_length=200)
+    category: str = Field(min_length=1, max_length=100)
     amount: float
-    currency: str = "CAD"
+    currency: str = Field(default="CAD", max_length=8)
     notes: str | None = None
 
+    _amount = field_validator("amount")(storable_amount)
+
 class EntryUpdate(BaseModel):
     date: Optional[date] = None
     type: Optional[Literal["income", "expense"]] = None
     name: Optional[str] = Field(default=None, min_length=1, max_length=200)
     category: Optional[str] = Field(default=None, min_length=1, max_length=100)
     amount: Optional[float] = Field(default=None, gt=0)
-    currency: Optional[str] = None
+    currency: Optional[str] = Field(default=None, max_length=8)
     notes: Optional[str] = None
 
+    _amount = field_validator("amount")(storable_amount)
+
 class EntryOut(BaseModel):
     id: UUID
     date: date
@@ -32,7 +45,33 @@ class EntryOut(BaseModel):
     category: str
     amount: float
     currency: str
+    amount_base: float  # amount in the server's base currency, what totals add up
     notes: Optional[str] = None
 
     class Config:
         from_attributes = True
+
+class EntryBulkRowResult(BaseModel):
+    index: int
+    ok: bool
+    id: Optional[UUID] = None
+    error: Optional[str] = None
+    duplicate: Optional[Literal["exact", "near"]] = None
+    duplicate_of: Optional[UUID] = None
+
+class EntryBulkResult(BaseModel):
+    inserted: int
+    skipped: int = 0  # exact duplicates left out by on_duplicate=skip
+    failed: int
+    results: list[EntryBulkRowResult]
+
+class EntryCategorizeItem(BaseModel):
+    name: str = Field(max_length=200)
+    type: Literal["income", "expense"]
+
+class EntryCategorizeRequest(BaseModel):
+    items: list[EntryCategorizeItem]
+
+class EntryCategorizeResult(BaseModel):
+    categories: list[str]
+    sources: list[Optional[Literal["user", "rule"]]]
@@ -12,4 +12,13 @@ class UserOut(BaseModel):
     model_config = ConfigDict(from_attributes=True)
 
     id: str
-    email: EmailStr
\ No newline at end of file
+    email: EmailStr
+
+class AuthOut(UserOut):
+    access_token: str
+    refresh_token: str
+    token_type: str = "bearer"
+    expires_in: int
+
+class RefreshIn(BaseModel):
+    refresh_token: str
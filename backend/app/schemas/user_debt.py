@@ -14,7 +14,7 @@ class UserDebtOut(BaseModel):
 
 
 class UserDebtCreate(BaseModel):
-    user_id: str
+    user_id: str | None = None  # ignored: taken from the access token
     step_key: str
     name: str
     interest_pct: float = 0
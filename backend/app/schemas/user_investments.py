@@ -1,4 +1,4 @@
-from pydantic import BaseModel
+from pydantic import BaseModel, Field
 from typing import Optional
 from uuid import UUID
 
@@ -15,11 +15,12 @@ class UserInvestmentBase(BaseModel):
     average_return: float
     website: Optional[str] = None
     preset_id: Optional[str] = None
+    symbol: Optional[str] = Field(default=None, max_length=20)
     is_custom: Optional[bool] = False
 
 
 class UserInvestmentCreate(UserInvestmentBase):
-    pass
+    user_id: str | None = None  # ignored: taken from the access token
 
 
 class UserInvestmentPatch(BaseModel):
@@ -32,6 +33,7 @@ class UserInvestmentPatch(BaseModel):
     average_return: Optional[float] = None
     website: Optional[str] = None
     preset_id: Optional[str] = None
+    symbol: Optional[str] = Field(default=None, max_length=20)
     is_custom: Optional[bool] = None
 
 
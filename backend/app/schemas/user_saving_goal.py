@@ -12,7 +12,7 @@ class UserSavingGoalBase(BaseModel):
 
 
 class UserSavingGoalCreate(UserSavingGoalBase):
-    pass
+    user_id: str | None = None  # ignored: taken from the access token
 
 
 class UserSavingGoalPatch(BaseModel):
@@ -12,7 +12,7 @@ class UserStepMetricOut(BaseModel):
     value_text: str | None = None
 
 class UserStepMetricUpsert(BaseModel):
-    user_id: str
+    user_id: str | None = None  # ignored: taken from the access token
     step_key: str
     metric_key: str = Field(min_length=1, max_length=80)
     value_num: float
@@ -11,6 +11,6 @@ class UserStepProgressOut(BaseModel):
         from_attributes = True
 
 class UserStepProgressUpsert(BaseModel):
-    user_id: str
+    user_id: str | None = None  # ignored: taken from the access token
     step_key: str
     progress: int = Field(ge=0, le=100)
\ No newline at end of file
@@ -0,0 +1,89 @@
+"""Per-request cost of bearer-token auth.
+
+Measures decode_token on its own (first sight of a token versus the cached
+path every later request takes) and the end-to-end difference between an
+endpoint with and without the get_current_user_id dependency, driven in
+process through httpx's ASGI transport. No database needed.
+
+    cd backend
+    python -m benchmarks.bench_auth --requests 5000
+"""
+import argparse
+import asyncio
+import time
+
+import httpx
+from fastapi import Depends, FastAPI
+
+from app.api.deps import get_current_user_id
+from app.core import tokens
+
+
+def time_decode(n: int) -> tuple[float, float]:
+    """Microseconds per decode_token call: (uncached, cached)."""
+    fresh = [tokens.create_access_token(f"user-{i}") for i in range(n)]
+    tokens._verified_claims.cache_clear()
+
+    started = time.perf_counter()
+    for t in fresh:
+        tokens.decode_token(t)
+    uncached = (time.perf_counter() - started) / n
+
+    token = fresh[0]
+    tokens.decode_token(token)
+    started = time.perf_counter()
+    for _ in range(n):
+        tokens.decode_token(token)
+    cached = (time.perf_counter() - started) / n
+
+    return uncached * 1e6, cached * 1e6
+
+
+def build_app() -> FastAPI:
+    app = FastAPI()
+
+    @app.get("/open")
+    async def open_route():
+        return {"ok": True}
+
+    @app.get("/authed")
+    async def authed_route(user_id: str = Depends(get_current_user_id)):
+        return {"ok": True}
+
+    return app
+
+
+async def time_requests(app: FastAPI, path: str, headers: dict, n: int) -> float:
+    """Microseconds per request through the full ASGI stack."""
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench", headers=headers) as client:
+        for _ in range(min(n, 200)):
+            await client.get(path)
+
+        started = time.perf_counter()
+        for _ in range(n):
+            res = await client.get(path)
+            assert res.status_code == 200, res.text
+        return (time.perf_counter() - started) / n * 1e6
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--requests", type=int, default=5000)
+    parser.add_argument("--rounds", type=int, default=5, help="alternating rounds; best of each is reported")
+    args = parser.parse_args()
+
+    uncached, cached = time_decode(args.requests)
+    print(f"decode_token  first use {uncached:8.1f} µs   cached {cached:8.1f} µs")
+
+    app = build_app()
+    headers = {"Authorization": f"Bearer {tokens.create_access_token('bench-user')}"}
+    base, authed = float("inf"), float("inf")
+    for _ in range(args.rounds):
+        base = min(base, asyncio.run(time_requests(app, "/open", headers, args.requests)))
+        authed = min(authed, asyncio.run(time_requests(app, "/authed", headers, args.requests)))
+    print(f"request       no auth   {base:8.1f} µs   with auth {authed:8.1f} µs   overhead {authed - base:6.1f} µs")
+
+
+if __name__ == "__main__":
+    main()
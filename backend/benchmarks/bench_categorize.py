@@ -0,0 +1,64 @@
+"""Throughput of the transaction categorizer on statement-like descriptions.
+
+Builds a user model from --learned synthetic merchant mappings and times
+app.core.categorizer.categorize over --rows descriptions made of a
+merchant name, a store number and a city, like bank statement lines. By
+default every line is distinct (--distinct 1.0), so the per-batch memo of
+repeated lines does not flatter the result. No database is needed.
+
+    cd backend
+    python -m benchmarks.bench_categorize --rows 100000 --learned 2000
+"""
+import argparse
+import random
+import statistics
+import time
+
+from app.core import categorizer
+
+CITIES = ["TORONTO ON", "MISSISSAUGA ON", "OTTAWA ON", "VANCOUVER BC", "CALGARY AB", ""]
+SYLLABLES = ["ka", "lo", "mi", "ron", "ta", "vex", "zu", "pra", "del", "qui", "nor", "sha"]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=100_000)
+    parser.add_argument("--learned", type=int, default=2000)
+    parser.add_argument("--distinct", type=float, default=1.0, help="share of lines that are unique")
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    rnd = random.Random(0)
+
+    def word() -> str:
+        return "".join(rnd.choice(SYLLABLES) for _ in range(rnd.randint(2, 4)))
+
+    learned = [f"{word()} {word()}" for _ in range(args.learned)]
+    model = categorizer.UserModel.from_counts(
+        ("expense", name, rnd.choice(list(categorizer.EXPENSE_RULES)), rnd.randint(1, 5)) for name in learned
+    )
+    keywords = [k for ks in categorizer.EXPENSE_RULES.values() for k in ks]
+    merchants = learned + keywords + [word() for _ in range(args.learned)]
+
+    unique = max(1, int(args.rows * args.distinct))
+    lines = [
+        f"{rnd.choice(merchants).upper()} #{i} {rnd.choice(CITIES)}".strip()
+        for i in range(unique)
+    ]
+    names = [lines[i % unique] for i in range(args.rows)]
+    types = ["expense"] * args.rows
+
+    latencies = []
+    for _ in range(args.repeat):
+        started = time.perf_counter()
+        categories, sources = categorizer.categorize(names, types, model)
+        latencies.append(time.perf_counter() - started)
+
+    p50 = statistics.median(latencies)
+    matched = {s: sources.count(s) for s in ("user", "rule", None)}
+    print(f"{args.rows} descriptions, {unique} distinct, {args.learned} learned phrases")
+    print(f"p50 {p50 * 1000:.1f} ms, {args.rows / p50:,.0f} descriptions/s, matched {matched}")
+
+
+if __name__ == "__main__":
+    main()
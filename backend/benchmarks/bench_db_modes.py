@@ -0,0 +1,126 @@
+"""Compare the async (asyncpg) and sync (psycopg2 + threadpool) DB modes.
+
+Starts the API once per mode with DB_ASYNC set accordingly, drives it with
+N concurrent clients for a fixed duration and prints requests/sec and
+latency percentiles. Needs a reachable DATABASE_URL with some data for
+--user-id, plus httpx (``pip install httpx``). Requests carry an access
+token minted for --user-id with the same JWT_SECRET the server reads.
+
+    cd backend
+    python -m benchmarks.bench_db_modes --user-id <id> --clients 500 --seconds 20
+"""
+import argparse
+import asyncio
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+import httpx
+
+from app.core.tokens import create_access_token
+
+
+async def wait_until_up(base_url: str, timeout: float = 30.0) -> None:
+    deadline = time.monotonic() + timeout
+    async with httpx.AsyncClient() as client:
+        while time.monotonic() < deadline:
+            try:
+                if (await client.get(f"{base_url}/health")).status_code == 200:
+                    return
+            except httpx.TransportError:
+                pass
+            await asyncio.sleep(0.2)
+    raise RuntimeError(f"server at {base_url} did not come up")
+
+
+async def drive(url: str, headers: dict, clients: int, seconds: float) -> tuple[int, int, list[float]]:
+    latencies: list[float] = []
+    errors = 0
+    stop_at = time.monotonic() + seconds
+    limits = httpx.Limits(max_connections=clients, max_keepalive_connections=clients)
+
+    async with httpx.AsyncClient(limits=limits, headers=headers, timeout=60.0) as client:
+
+        async def worker() -> None:
+            nonlocal errors
+            while time.monotonic() < stop_at:
+                started = time.perf_counter()
+                try:
+                    res = await client.get(url)
+                    ok = res.status_code < 500
+                except httpx.HTTPError:
+                    ok = False
+                latencies.append(time.perf_counter() - started)
+                if not ok:
+                    errors += 1
+
+        await asyncio.gather(*(worker() for _ in range(clients)))
+
+    return len(latencies), errors, latencies
+
+
+def percentile(values: list[float], pct: float) -> float:
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    idx = min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))
+    return ordered[idx]
+
+
+def run_mode(db_async: bool, args) -> dict:
+    env = {**os.environ, "DB_ASYNC": "true" if db_async else "false"}
+    server = subprocess.Popen(
+        [
+            sys.executable, "-m", "uvicorn", "app.main:app",
+            "--host", "127.0.0.1", "--port", str(args.port),
+            "--workers", str(args.workers), "--log-level", "warning",
+        ],
+        env=env,
+    )
+    base_url = f"http://127.0.0.1:{args.port}"
+    try:
+        asyncio.run(wait_until_up(base_url))
+        url = f"{base_url}{args.path}"
+        headers = {"Authorization": f"Bearer {create_access_token(args.user_id)}"}
+        # short warm-up so pool connections are open before measuring
+        asyncio.run(drive(url, headers, min(args.clients, 50), 2))
+        total, errors, latencies = asyncio.run(drive(url, headers, args.clients, args.seconds))
+    finally:
+        server.terminate()
+        server.wait()
+
+    return {
+        "mode": "async" if db_async else "sync",
+        "requests": total,
+        "errors": errors,
+        "rps": total / args.seconds,
+        "p50_ms": percentile(latencies, 50) * 1000,
+        "p99_ms": percentile(latencies, 99) * 1000,
+        "mean_ms": (statistics.fmean(latencies) * 1000) if latencies else 0.0,
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--user-id", required=True)
+    parser.add_argument("--path", default="/analytics/summary?months=6")
+    parser.add_argument("--clients", type=int, default=500)
+    parser.add_argument("--seconds", type=float, default=20)
+    parser.add_argument("--workers", type=int, default=1)
+    parser.add_argument("--port", type=int, default=8765)
+    args = parser.parse_args()
+
+    results = [run_mode(True, args), run_mode(False, args)]
+
+    print(f"{'mode':<6} {'requests':>9} {'errors':>7} {'req/s':>9} {'p50 ms':>8} {'p99 ms':>8}")
+    for r in results:
+        print(
+            f"{r['mode']:<6} {r['requests']:>9} {r['errors']:>7} {r['rps']:>9.1f} "
+            f"{r['p50_ms']:>8.1f} {r['p99_ms']:>8.1f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,49 @@
+"""Latency of the vectorized debt payoff simulation behind /analytics/debt-payoff.
+
+Generates --debts random debts and runs app.core.debt_payoff.simulate for
+--levels extra-contribution amounts over a --horizon month schedule, with
+minimum payments low enough that most scenarios run the full horizon. No
+database is needed.
+
+    cd backend
+    python -m benchmarks.bench_debt_payoff --debts 20 --levels 50 --horizon 360
+"""
+import argparse
+import statistics
+import time
+
+import numpy as np
+
+from app.core.debt_payoff import simulate
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--debts", type=int, default=20)
+    parser.add_argument("--levels", type=int, default=50)
+    parser.add_argument("--horizon", type=int, default=360)
+    parser.add_argument("--repeat", type=int, default=50)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(0)
+    balances = rng.uniform(500, 20_000, args.debts).round(2)
+    rates = rng.uniform(0, 29.99, args.debts).round(2)
+    minimums = (balances * 0.005).round(2)
+    extras = np.linspace(0, 2_000, args.levels)
+
+    print(f"{'strategy':<10} {'p50 ms':>8} {'mean ms':>8} {'months':>7} {'cleared':>8}")
+    for strategy in ("avalanche", "snowball"):
+        latencies = []
+        for _ in range(args.repeat):
+            started = time.perf_counter()
+            schedule = simulate(balances, rates, minimums, extras, strategy, args.horizon)
+            latencies.append(time.perf_counter() - started)
+        print(
+            f"{strategy:<10} {statistics.median(latencies) * 1000:>8.2f} "
+            f"{statistics.fmean(latencies) * 1000:>8.2f} {schedule.balances.shape[1] - 1:>7} "
+            f"{int((schedule.months >= 0).sum()):>4}/{args.levels:<3}"
+        )
+
+
+if __name__ == "__main__":
+    main()
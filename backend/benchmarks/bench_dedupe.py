@@ -0,0 +1,124 @@
+"""Duplicate check of an import batch against a large ledger.
+
+Seeds --ledger entries for a throwaway user in DATABASE_URL (fingerprints
+filled in, as the entries router does), then times
+app.crud.entry.find_duplicates for a --batch row import of which
+--overlap share are re-imported ledger rows, a third of those posted a day
+later. Prints the latency, how many statements hit the database and what
+was found. The user and its entries are deleted afterwards.
+
+Before timing it checks that a half-cent payload amount fingerprints like
+the value numeric(12, 2) stores for it (10.125 -> 10.13), or re-imports of
+such rows would never match.
+
+    cd backend
+    python -m benchmarks.bench_dedupe --ledger 100000 --batch 5000
+"""
+import argparse
+import random
+import statistics
+import time
+import uuid
+from collections import Counter
+from datetime import date, timedelta
+from decimal import Decimal
+
+from sqlalchemy import event, insert
+
+from app.core.dedupe import fingerprint
+from app.crud.entry import find_duplicates
+from app.db.session import SessionLocal, engine
+from app.models import Entry, User
+
+MERCHANTS = ["STARBUCKS #{}", "LOBLAWS {}", "UBER *TRIP {}", "PETRO CANADA {}", "AMAZON.CA {}", "E-TRANSFER {}"]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--ledger", type=int, default=100_000)
+    parser.add_argument("--batch", type=int, default=5000)
+    parser.add_argument("--overlap", type=float, default=0.5)
+    parser.add_argument("--tolerance", type=int, default=3)
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    for raw, stored in [(10.125, "10.13"), (-10.125, "-10.13"), (2.675, "2.68")]:
+        if fingerprint("expense", raw, "STARBUCKS #12") != fingerprint("expense", Decimal(stored), "STARBUCKS #12"):
+            raise SystemExit(f"fingerprint({raw}) does not match the stored {stored}")
+
+    rnd = random.Random(0)
+    start = date(2020, 1, 1)
+
+    def row(i: int) -> dict:
+        d = start + timedelta(days=rnd.randrange(6 * 365))
+        name = rnd.choice(MERCHANTS).format(rnd.randrange(100))
+        amount = round(rnd.uniform(2, 300), 2)
+        return {"date": d, "name": name, "amount": amount, "fingerprint": fingerprint("expense", amount, name)}
+
+    ledger = [row(i) for i in range(args.ledger)]
+
+    user_id = f"bench-{uuid.uuid4()}"
+    db = SessionLocal()
+    db.add(User(id=user_id, email=f"{user_id}@bench.invalid", hashed_password="-"))
+    for lo in range(0, len(ledger), 10_000):
+        db.execute(
+            insert(Entry),
+            [
+                {
+                    "id": uuid.uuid4(),
+                    "user_id": user_id,
+                    "year": r["date"].year,
+                    "month": r["date"].month,
+                    "type": "expense",
+                    "category": "Other",
+                    "currency": "CAD",
+                    **r,
+                }
+                for r in ledger[lo : lo + 10_000]
+            ],
+        )
+    db.commit()
+
+    # the tail of the ledger re-exported, partly shifted by a day, plus new rows
+    overlap = int(args.batch * args.overlap)
+    batch = []
+    for i, r in enumerate(ledger[-overlap:] if overlap else []):
+        shift = timedelta(days=1) if i % 3 == 0 else timedelta(0)
+        batch.append((r["fingerprint"], r["date"] + shift))
+    batch += [(r["fingerprint"], r["date"]) for r in (row(i) for i in range(args.batch - overlap))]
+
+    statements = 0
+
+    def count(*_):
+        nonlocal statements
+        statements += 1
+
+    try:
+        latencies = []
+        for _ in range(args.repeat):
+            session = SessionLocal()
+            try:
+                statements = 0
+                event.listen(engine, "before_cursor_execute", count)
+                started = time.perf_counter()
+                found = find_duplicates(session, user_id, batch, args.tolerance)
+                latencies.append(time.perf_counter() - started)
+                event.remove(engine, "before_cursor_execute", count)
+            finally:
+                session.close()
+
+        kinds = Counter(d.kind if d else None for d in found)
+        print(f"{args.batch} rows against a {args.ledger} row ledger, tolerance {args.tolerance} days")
+        print(
+            f"p50 {statistics.median(latencies) * 1000:.1f} ms, {statements} statement(s), "
+            f"exact {kinds['exact']}, near {kinds['near']}, new {kinds[None]}"
+        )
+    finally:
+        db.query(Entry).filter(Entry.user_id == user_id).delete()
+        db.query(User).filter(User.id == user_id).delete()
+        db.commit()
+        db.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,47 @@
+"""Time and peak memory of the /analytics/investment-projection Monte Carlo.
+
+Simulates --holdings holdings for --years with --paths paths, once with each
+--chunk-mb working-array budget. 0 means a single chunk. Peak memory is
+measured with tracemalloc, which sees NumPy's allocations. No database is
+needed.
+
+    cd backend
+    python -m benchmarks.bench_investment_projection --paths 100000 --years 30 --chunk-mb 0 16 64
+"""
+import argparse
+import time
+import tracemalloc
+
+import numpy as np
+
+from app.core import investment_projection as projection
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--paths", type=int, default=100_000)
+    parser.add_argument("--years", type=int, default=30)
+    parser.add_argument("--holdings", type=int, default=8)
+    parser.add_argument("--chunk-mb", type=int, nargs="+", default=[16, 64])
+    args = parser.parse_args()
+
+    months = args.years * 12
+    current = np.full(args.holdings, 5_000.0)
+    monthly = np.full(args.holdings, 200.0)
+    returns = np.linspace(3, 9, args.holdings)
+    vols = np.linspace(0.06, 0.25, args.holdings)
+
+    print(f"{'chunk MB':>8} {'paths/chunk':>11} {'seconds':>8} {'peak MB':>8} {'p50 at end':>12}")
+    for mb in args.chunk_mb:
+        chunk = projection.chunk_size(months, args.holdings, mb << 20) if mb else args.paths
+        tracemalloc.start()
+        started = time.perf_counter()
+        result = projection.simulate(current, monthly, returns, vols, months, args.paths, chunk_paths=chunk)
+        elapsed = time.perf_counter() - started
+        peak = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+        print(f"{mb:>8} {min(chunk, args.paths):>11} {elapsed:>8.2f} {peak / 2**20:>8.0f} {result.p50[-1]:>12,.0f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,119 @@
+"""Rows/sec of an entries list page: ORM + response_model vs column rows + orjson.
+
+Seeds --rows entries for a throwaway user in DATABASE_URL and repeatedly
+builds one page of --limit rows in three ways. "orm" loads Entry instances,
+validates them through list[EntryOut] and encodes with the stdlib json, as
+the response_model path did. "columns" selects EntryOut's columns as plain
+rows and encodes them with orjson, as the routers do now. "fields" is the same
+with a narrow ?fields= projection. The user and its entries are deleted
+afterwards.
+
+    cd backend
+    python -m benchmarks.bench_list_rows --rows 2000 --limit 500 --repeat 50
+"""
+import argparse
+import json
+import statistics
+import time
+import uuid
+from datetime import date, timedelta
+
+from fastapi import Response
+from pydantic import TypeAdapter
+from sqlalchemy import insert
+
+from app.api.entries import entry_columns, page
+from app.api.rows import json_rows, parse_fields
+from app.db.session import SessionLocal
+from app.models import Entry, User
+from app.schemas.entry import EntryOut
+
+ENTRY_LIST = TypeAdapter(list[EntryOut])
+
+
+def _base(db, model_or_columns, user_id: str):
+    cols = model_or_columns if isinstance(model_or_columns, list) else [model_or_columns]
+    return db.query(*cols).filter(Entry.user_id == user_id, Entry.is_deleted == False)  # noqa: E712
+
+
+def orm_page(db, user_id: str, limit: int, fields: str | None) -> bytes:
+    rows, _ = page(_base(db, Entry, user_id), limit, None)
+    validated = ENTRY_LIST.validate_python(rows, from_attributes=True)
+    return json.dumps(ENTRY_LIST.dump_python(validated, mode="json")).encode()
+
+
+def column_page(db, user_id: str, limit: int, fields: str | None) -> bytes:
+    names = parse_fields(fields, EntryOut)
+    rows, _ = page(_base(db, entry_columns(names), user_id), limit, None)
+    return json_rows(rows, names, Response()).body
+
+
+def measure(fn, user_id: str, limit: int, repeat: int, fields: str | None = None) -> list[float]:
+    latencies = []
+    for _ in range(repeat):
+        db = SessionLocal()
+        try:
+            started = time.perf_counter()
+            body = fn(db, user_id, limit, fields)
+            latencies.append(time.perf_counter() - started)
+        finally:
+            db.close()
+    assert len(json.loads(body)) == limit
+    return latencies
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=2000)
+    parser.add_argument("--limit", type=int, default=500)
+    parser.add_argument("--repeat", type=int, default=50)
+    parser.add_argument("--fields", default="id,date,amount,category")
+    args = parser.parse_args()
+
+    user_id = f"bench-{uuid.uuid4()}"
+    db = SessionLocal()
+    db.add(User(id=user_id, email=f"{user_id}@bench.invalid", hashed_password="-"))
+    days = [date(2020, 1, 1) + timedelta(days=i % 1500) for i in range(max(args.rows, args.limit))]
+    db.execute(
+        insert(Entry),
+        [
+            {
+                "id": uuid.uuid4(),
+                "user_id": user_id,
+                "date": d,
+                "year": d.year,
+                "month": d.month,
+                "type": "expense",
+                "name": f"bench entry {i}",
+                "category": ("Groceries", "Rent", "Transport")[i % 3],
+                "amount": 10 + i % 97 + 0.25,
+                "currency": "CAD",
+            }
+            for i, d in enumerate(days)
+        ],
+    )
+    db.commit()
+
+    try:
+        print(f"{'path':<8} {'p50 ms':>8} {'mean ms':>8} {'rows/s':>10}")
+        for name, fn, fields in (
+            ("orm", orm_page, None),
+            ("columns", column_page, None),
+            ("fields", column_page, args.fields),
+        ):
+            measure(fn, user_id, args.limit, 3, fields)  # warm up
+            latencies = measure(fn, user_id, args.limit, args.repeat, fields)
+            p50 = statistics.median(latencies)
+            print(
+                f"{name:<8} {p50 * 1000:>8.2f} {statistics.fmean(latencies) * 1000:>8.2f} "
+                f"{args.limit / p50:>10.0f}"
+            )
+    finally:
+        db.query(Entry).filter(Entry.user_id == user_id).delete()
+        db.query(User).filter(User.id == user_id).delete()
+        db.commit()
+        db.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,56 @@
+"""Login hashing throughput versus number of hash workers (cores).
+
+Hashing dominates /users/login, so this drives verify_and_update through the
+same process pool the API uses, once per worker count, and reports
+verifications per second. No database needed.
+
+    cd backend
+    python -m benchmarks.bench_login --jobs 64 --rounds 12
+"""
+import argparse
+import asyncio
+import os
+import time
+
+from app.core import security
+from app.core.config import settings
+
+
+async def run(workers: int, jobs: int, stored_hash: str) -> float:
+    settings.HASH_WORKERS = workers
+    settings.HASH_MAX_PENDING = jobs
+    security.shutdown_hash_pool()
+
+    # warm the pool so process start-up is not measured
+    await asyncio.gather(*(security.verify_and_update_async("password", stored_hash) for _ in range(max(workers, 1))))
+
+    started = time.perf_counter()
+    results = await asyncio.gather(
+        *(security.verify_and_update_async("password", stored_hash) for _ in range(jobs))
+    )
+    elapsed = time.perf_counter() - started
+    assert all(ok for ok, _ in results)
+    return jobs / elapsed
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--jobs", type=int, default=64, help="concurrent logins per measurement")
+    parser.add_argument("--max-workers", type=int, default=os.cpu_count() or 1)
+    args = parser.parse_args()
+
+    stored_hash = security.hash_password("password")
+    print(f"bcrypt_sha256 rounds={settings.BCRYPT_ROUNDS}, {args.jobs} concurrent logins")
+    print(f"{'workers':>7} {'logins/s':>9}")
+
+    counts = [0] + [n for n in (1, 2, 4, 8, 16, 32, 64) if n <= args.max_workers]
+    for workers in counts:
+        rate = asyncio.run(run(workers, args.jobs, stored_hash))
+        label = "thread" if workers == 0 else str(workers)
+        print(f"{label:>7} {rate:>9.1f}")
+
+    security.shutdown_hash_pool()
+
+
+if __name__ == "__main__":
+    main()
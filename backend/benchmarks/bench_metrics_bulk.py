@@ -0,0 +1,118 @@
+"""Round-trips and latency of a bulk step-metrics upsert.
+
+Runs the old per-item path (SELECT per metric, commit, refresh per row)
+and the single INSERT ... ON CONFLICT DO UPDATE ... RETURNING statement
+against DATABASE_URL for a batch of --metrics metrics. It counts the
+statements each sends and reports their latency. It needs a migrated and
+seeded database, and uses a throwaway user that is deleted afterwards.
+
+    cd backend
+    python -m benchmarks.bench_metrics_bulk --metrics 50 --repeat 20
+"""
+import argparse
+import statistics
+import time
+import uuid
+
+from sqlalchemy import event
+
+from app.crud.step_metrics import upsert_metrics
+from app.db.session import SessionLocal, engine
+from app.models import User, UserStepMetric
+from app.schemas.user_step_metric import UserStepMetricUpsert
+
+STEP_KEY = "full-fund"
+
+
+def per_item_upsert(db, user_id: str, items: list[UserStepMetricUpsert]) -> list[UserStepMetric]:
+    """The select-then-insert loop bulk_upsert used before."""
+    out = []
+    for item in items:
+        row = (
+            db.query(UserStepMetric)
+            .filter(
+                UserStepMetric.user_id == user_id,
+                UserStepMetric.step_key == item.step_key,
+                UserStepMetric.metric_key == item.metric_key,
+            )
+            .first()
+        )
+        if row:
+            row.value_num = item.value_num
+            if item.value_text is not None:
+                row.value_text = item.value_text
+        else:
+            row = UserStepMetric(**{**item.model_dump(), "user_id": user_id})
+            db.add(row)
+        out.append(row)
+
+    db.commit()
+    for r in out:
+        db.refresh(r)
+    return out
+
+
+def set_based_upsert(db, user_id: str, items: list[UserStepMetricUpsert]) -> list[dict]:
+    rows = upsert_metrics(db, user_id, items)
+    db.commit()
+    return rows
+
+
+def measure(fn, user_id: str, metrics: int, repeat: int) -> tuple[float, list[float]]:
+    statements = 0
+
+    def count(*_):
+        nonlocal statements
+        statements += 1
+
+    event.listen(engine, "before_cursor_execute", count)
+    latencies = []
+    try:
+        for i in range(repeat):
+            items = [
+                UserStepMetricUpsert(step_key=STEP_KEY, metric_key=f"bench_{m}", value_num=i + m)
+                for m in range(metrics)
+            ]
+            db = SessionLocal()
+            try:
+                started = time.perf_counter()
+                fn(db, user_id, items)
+                latencies.append(time.perf_counter() - started)
+            finally:
+                db.close()
+    finally:
+        event.remove(engine, "before_cursor_execute", count)
+
+    return statements / repeat, latencies
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--metrics", type=int, default=50)
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    user_id = f"bench-{uuid.uuid4()}"
+    db = SessionLocal()
+    db.add(User(id=user_id, email=f"{user_id}@bench.invalid", hashed_password="-"))
+    db.commit()
+
+    try:
+        print(f"{'path':<10} {'stmts/call':>10} {'p50 ms':>8} {'mean ms':>8} {'max ms':>8}")
+        # the first call of each path inserts; the rest update existing rows
+        for name, fn in (("per-item", per_item_upsert), ("set-based", set_based_upsert)):
+            stmts, latencies = measure(fn, user_id, args.metrics, args.repeat)
+            print(
+                f"{name:<10} {stmts:>10.1f} {statistics.median(latencies) * 1000:>8.2f} "
+                f"{statistics.fmean(latencies) * 1000:>8.2f} {max(latencies) * 1000:>8.2f}"
+            )
+            db.query(UserStepMetric).filter(UserStepMetric.user_id == user_id).delete()
+            db.commit()
+    finally:
+        db.query(User).filter(User.id == user_id).delete()
+        db.commit()
+        db.close()
+
+
+if __name__ == "__main__":
+    main()
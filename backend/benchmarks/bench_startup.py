@@ -0,0 +1,78 @@
+"""Track API startup cost: cold import of app.main and time to first request.
+
+Each sample runs in a fresh interpreter so nothing is cached. The import
+sample also reports how many DB connections were opened while importing,
+which should stay at 0.
+
+    cd backend
+    python -m benchmarks.bench_startup --runs 5
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+import urllib.request
+
+IMPORT_PROBE = """
+import json, time
+t = time.perf_counter()
+import app.main
+elapsed = time.perf_counter() - t
+from app.db.pool_stats import all_stats
+print(json.dumps({"import_s": elapsed, "db_connects": sum(s.connects for s in all_stats().values())}))
+"""
+
+
+def cold_import() -> dict:
+    out = subprocess.run(
+        [sys.executable, "-c", IMPORT_PROBE],
+        check=True,
+        capture_output=True,
+        text=True,
+    )
+    return json.loads(out.stdout.strip().splitlines()[-1])
+
+
+def time_to_first_request(port: int, path: str, timeout: float = 60.0) -> float:
+    started = time.perf_counter()
+    server = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "app.main:app", "--host", "127.0.0.1", "--port", str(port), "--log-level", "warning"],
+        env=os.environ.copy(),
+    )
+    try:
+        while time.perf_counter() - started < timeout:
+            try:
+                with urllib.request.urlopen(f"http://127.0.0.1:{port}{path}", timeout=1) as res:
+                    if res.status == 200:
+                        return time.perf_counter() - started
+            except OSError:
+                time.sleep(0.01)
+        raise RuntimeError("server did not answer in time")
+    finally:
+        server.terminate()
+        server.wait()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--port", type=int, default=8766)
+    parser.add_argument("--path", default="/health")
+    args = parser.parse_args()
+
+    imports = [cold_import() for _ in range(args.runs)]
+    firsts = [time_to_first_request(args.port, args.path) for _ in range(args.runs)]
+
+    import_ms = [s["import_s"] * 1000 for s in imports]
+    first_ms = [s * 1000 for s in firsts]
+
+    print(f"cold import of app.main: median {statistics.median(import_ms):.1f} ms, max {max(import_ms):.1f} ms")
+    print(f"db connects during import: {max(s['db_connects'] for s in imports)}")
+    print(f"time to first {args.path}: median {statistics.median(first_ms):.1f} ms, max {max(first_ms):.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
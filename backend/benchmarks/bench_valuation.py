@@ -0,0 +1,57 @@
+"""Time to build a daily portfolio value series from per-symbol closes.
+
+Generates --years of weekday closes for --holdings symbols, each with a
+random 2% of days missing, and times app.core.valuation.price_matrix
+(alignment and forward fill) plus value_series. This is the NumPy part of
+/analytics/portfolio-value; no database is needed.
+
+    cd backend
+    python -m benchmarks.bench_valuation --years 10 --holdings 30
+"""
+import argparse
+import statistics
+import time
+
+import numpy as np
+
+from app.core import valuation
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--years", type=int, default=10)
+    parser.add_argument("--holdings", type=int, default=30)
+    parser.add_argument("--repeat", type=int, default=200)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(0)
+    start = np.datetime64("2016-01-01")
+    days = args.years * 365
+    calendar = np.arange(start - 10, start + days, dtype="datetime64[D]")
+    weekdays = calendar[np.is_busday(calendar)]
+
+    series = []
+    for _ in range(args.holdings):
+        dates = weekdays[rng.random(len(weekdays)) > 0.02]
+        closes = 50 * np.exp(np.cumsum(rng.normal(0.0003, 0.01, len(dates))))
+        series.append((dates, closes))
+    holding_symbol = np.arange(args.holdings)
+    amounts = rng.uniform(500, 20_000, args.holdings)
+
+    latencies = []
+    for _ in range(args.repeat):
+        started = time.perf_counter()
+        prices = valuation.price_matrix(start, days, series)
+        values, _ = valuation.value_series(prices, holding_symbol, amounts)
+        latencies.append(time.perf_counter() - started)
+
+    print(f"{days} days x {args.holdings} holdings")
+    print(
+        f"p50 {statistics.median(latencies) * 1000:.2f} ms, "
+        f"mean {statistics.fmean(latencies) * 1000:.2f} ms, "
+        f"last value {values[-1]:,.2f} (= {amounts.sum():,.2f})"
+    )
+
+
+if __name__ == "__main__":
+    main()
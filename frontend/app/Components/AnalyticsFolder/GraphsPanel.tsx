@@ -13,54 +13,15 @@ import {
   ResponsiveContainer,
   Cell,
 } from "recharts";
-import { listEntries, UiEntry } from "@/lib/bridge";
+import { getTimeseries } from "@/lib/bridge";
 import type { RangeKey } from "./Analytics";
 
-type MonthPoint = {
-  key: string;
-  label: string;
-  year: number;
-  month: number;
-};
-
 type ExpensePoint = { month: string; expense: number };
 type CashflowPoint = { month: string; net: number };
 type CategoryPoint = { category: string; amount: number };
 
 const monthShort = ["Jan", "Feb", "Mar", "Apr", "May", "Jun", "Jul", "Aug", "Sep", "Oct", "Nov", "Dec"];
 
-function ymKey(y: number, m: number) {
-  return `${y}-${String(m).padStart(2, "0")}`;
-}
-
-function addMonths(y: number, m: number, delta: number) {
-  const idx = y * 12 + (m - 1) + delta;
-  const ny = Math.floor(idx / 12);
-  const nm = (idx % 12) + 1;
-  return { year: ny, month: nm };
-}
-
-function buildWindow(anchorYear: number, anchorMonth: number, months: number): MonthPoint[] {
-  const start = addMonths(anchorYear, anchorMonth, -(months - 1));
-  const out: MonthPoint[] = [];
-
-  for (let i = 0; i < months; i++) {
-    const cur = addMonths(start.year, start.month, i);
-    out.push({
-      key: ymKey(cur.year, cur.month),
-      label: monthShort[cur.month - 1],
-      year: cur.year,
-      month: cur.month,
-    });
-  }
-
-  return out;
-}
-
-function sumAmount(entries: UiEntry[]) {
-  return entries.reduce((acc, e) => acc + (Number(e.amount) || 0), 0);
-}
-
 const chartPalette = [
   "#4699ff",
   "#22c55e",
@@ -76,12 +37,10 @@ export default function GraphsPanel({
   userId,
   range,
   anchorDate,
-  limitPerMonth = 500,
 }: {
   userId: string;
   range: RangeKey;
   anchorDate?: Date;
-  limitPerMonth?: number;
 }) {
   const monthsCount = range === "3M" ? 3 : range === "6M" ? 6 : 12;
 
@@ -90,11 +49,6 @@ export default function GraphsPanel({
     return { year: d.getFullYear(), month: d.getMonth() + 1 };
   }, [anchorDate]);
 
-  const windowMonths = useMemo(
-    () => buildWindow(anchor.year, anchor.month, monthsCount),
-    [anchor.year, anchor.month, monthsCount]
-  );
-
   const [loading, setLoading] = useState(true);
   const [err, setErr] = useState<string | null>(null);
 
@@ -110,54 +64,30 @@ export default function GraphsPanel({
         setLoading(true);
         setErr(null);
 
-        const perMonth = await Promise.all(
-          windowMonths.map(async (m) => {
-            const [inc, exp] = await Promise.all([
-              listEntries({
-                userId,
-                year: m.year,
-                month: m.month,
-                type: "income",
-                limit: limitPerMonth,
-              }),
-              listEntries({
-                userId,
-                year: m.year,
-                month: m.month,
-                type: "expense",
-                limit: limitPerMonth,
-              }),
-            ]);
-
-            return { month: m, income: inc, expense: exp };
-          })
-        );
+        // one round-trip: per-month totals (empty months included) + top categories
+        const ts = await getTimeseries({
+          userId,
+          months: monthsCount,
+          anchor,
+          top: 8,
+        });
 
         if (!mounted) return;
 
-        const expSeries: ExpensePoint[] = perMonth.map((x) => ({
-          month: x.month.label,
-          expense: sumAmount(x.expense),
+        const expSeries: ExpensePoint[] = ts.series.map((p) => ({
+          month: monthShort[p.month - 1],
+          expense: p.expense,
         }));
 
-        const netSeries: CashflowPoint[] = perMonth.map((x) => ({
-          month: x.month.label,
-          net: sumAmount(x.income) - sumAmount(x.expense),
+        const netSeries: CashflowPoint[] = ts.series.map((p) => ({
+          month: monthShort[p.month - 1],
+          net: p.net,
         }));
 
-        const categoryMap = new Map<string, number>();
-
-        for (const x of perMonth) {
-          for (const e of x.expense) {
-            const key = e.category || "Other";
-            categoryMap.set(key, (categoryMap.get(key) || 0) + (Number(e.amount) || 0));
-          }
-        }
-
-        const catSeries: CategoryPoint[] = Array.from(categoryMap.entries())
-          .map(([category, amount]) => ({ category, amount }))
-          .sort((a, b) => b.amount - a.amount)
-          .slice(0, 8);
+        const catSeries: CategoryPoint[] = ts.top_categories.map((c) => ({
+          category: c.category,
+          amount: c.amount,
+        }));
 
         setExpenseData(expSeries);
         setCashflowData(netSeries);
@@ -178,7 +108,7 @@ export default function GraphsPanel({
     return () => {
       mounted = false;
     };
-  }, [userId, windowMonths, limitPerMonth]);
+  }, [userId, anchor, monthsCount]);
 
   const money = (n: number) =>
   n.toLocaleString("en-CA", {
@@ -218,7 +148,7 @@ export default function GraphsPanel({
         <div className="graphs-error">
           {err}
           <div className="graphs-error-tip">
-            Tip: confirm <code>/entries/by-user</code> works and user-specific data exists.
+            Tip: confirm <code>/analytics/timeseries</code> works and user-specific data exists.
           </div>
         </div>
       )}
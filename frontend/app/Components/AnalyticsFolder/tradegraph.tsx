@@ -11,6 +11,7 @@ import {
   XAxis,
   YAxis,
 } from "recharts";
+import { getMarketPrices } from "@/lib/bridge";
 
 type RiskKey = "LOW" | "MEDIUM" | "HIGH";
 
@@ -115,19 +116,13 @@ export default function GoogleStyleStockCardWithRisk1Y({
       setErr(null);
 
       try {
-        const r = await fetch(`/api/market?symbol=${encodeURIComponent(symbol)}`);
-        if (!r.ok) {
-          const text = await r.text();
-          throw new Error(`${r.status}: ${text}`);
-        }
-
-        const json = await r.json();
+        const data = await getMarketPrices(symbol);
         if (cancelled) return;
 
-        setPoints(json.points ?? []);
-        setLast(Number(json.last ?? 0));
-        setPrevClose(Number(json.prevClose ?? 0));
-        setAsOf(json.asOf ?? null);
+        setPoints(data.dates.map((t, i) => ({ t, p: Number(data.closes[i].toFixed(2)) })));
+        setLast(Number(data.last ?? 0));
+        setPrevClose(Number(data.prev_close ?? 0));
+        setAsOf(data.as_of ?? null);
       } catch (e: any) {
         if (!cancelled) setErr(e?.message ?? "Failed to load market data");
       } finally {
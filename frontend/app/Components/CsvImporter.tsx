@@ -3,6 +3,7 @@
 import React, { useRef, useState } from "react";
 import { createPortal } from "react-dom";
 import * as XLSX from "xlsx";
+import { categorizeEntries } from "@/lib/bridge";
 import "../CSS/csvImporter.css";
 
 export type ImportedRow = {
@@ -365,6 +366,20 @@ export default function CsvImporter({ onData }: Props) {
     return results;
   };
 
+  // Server categories learn from the user's own entries; keep the local guess if the call fails.
+  const categorizeRows = async (rows: ImportedRow[]): Promise<ImportedRow[]> => {
+    if (!rows.length) return rows;
+    try {
+      const { categories } = await categorizeEntries(
+        rows.map((r) => ({ name: r.name, type: r.amount < 0 ? "expense" : "income" }))
+      );
+      return rows.map((r, i) => ({ ...r, category: categories[i] ?? r.category }));
+    } catch (error) {
+      console.error("Categorization failed:", error);
+      return rows;
+    }
+  };
+
   const handleUpload = async (selectedFile: File) => {
     try {
       const lowerName = selectedFile.name.toLowerCase();
@@ -379,6 +394,8 @@ export default function CsvImporter({ onData }: Props) {
         return;
       }
 
+      results = await categorizeRows(results);
+
       setFile(selectedFile);
       setDraftRows(results);
       setIsOpen(true);
@@ -6,7 +6,10 @@ export async function GET(req: NextRequest) {
   const qs = searchParams.toString();
   const upstream = `${API_URL}/analytics/summary${qs ? `?${qs}` : ""}`;
 
-  const res = await fetch(upstream, { cache: "no-store" });
+  const res = await fetch(upstream, {
+    headers: { Authorization: req.headers.get("authorization") ?? "" },
+    cache: "no-store",
+  });
   const text = await res.text();
 
   if (!res.ok) {
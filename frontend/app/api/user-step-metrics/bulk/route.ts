@@ -7,7 +7,10 @@ export async function PUT(req: NextRequest) {
 
   const res = await fetch(`${API_URL}/user-step-metrics/bulk`, {
     method: "PUT",
-    headers: { "Content-Type": "application/json" },
+    headers: {
+      "Content-Type": "application/json",
+      Authorization: req.headers.get("authorization") ?? "",
+    },
     body,
     cache: "no-store",
   });
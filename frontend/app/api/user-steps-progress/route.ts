@@ -7,7 +7,10 @@ export async function GET(req: NextRequest) {
   const qs = searchParams.toString();
   const upstream = `${API_URL}/user-steps-progress${qs ? `?${qs}` : ""}`;
 
-  const res = await fetch(upstream, { cache: "no-store" });
+  const res = await fetch(upstream, {
+    headers: { Authorization: req.headers.get("authorization") ?? "" },
+    cache: "no-store",
+  });
   const text = await res.text();
 
   if (!res.ok) {
@@ -28,7 +31,10 @@ export async function PUT(req: NextRequest) {
 
   const res = await fetch(`${API_URL}/user-steps-progress`, {
     method: "PUT",
-    headers: { "Content-Type": "application/json" },
+    headers: {
+      "Content-Type": "application/json",
+      Authorization: req.headers.get("authorization") ?? "",
+    },
     body,
     cache: "no-store",
   });
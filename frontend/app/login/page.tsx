@@ -6,6 +6,10 @@ import { useRouter } from "next/navigation";
 type AuthResponse = {
   id: string;
   email: string;
+  access_token: string;
+  refresh_token: string;
+  token_type: string;
+  expires_in: number;
 };
 
 const API_BASE =
@@ -12,11 +12,12 @@ import CsvImporter, { ImportedRow } from ".//Components/CsvImporter";
 
 import {
   listEntriesByUser,
-  createEntryFromUi,
+  bulkCreateEntriesFromUi,
   deleteEntryApi,
   getCurrentUser,
   logoutUser,
   type AuthUser,
+  type BulkRowResult,
 } from "@/lib/bridge";
 import Analytics from "./Components/AnalyticsFolder/Analytics";
 
@@ -319,44 +320,48 @@ export default function Home() {
 
     setEntries((prev) => [...converted, ...prev]);
 
-    const results = await Promise.allSettled(
-      converted.map(async (temp) => {
-        const created = await createEntryFromUi({
+    let results: BulkRowResult[];
+    try {
+      // one request (per 5000 rows) instead of one POST per row
+      results = await bulkCreateEntriesFromUi(
+        converted.map((temp) => ({
           type: temp.type,
           name: temp.name,
           category: temp.category,
           amount: temp.amount,
           date: temp.date,
-        });
-
-        return { tempId: temp.id, created };
-      })
-    );
+        }))
+      );
+    } catch (err) {
+      console.error("CSV import failed:", err);
+      const tempIds = new Set(converted.map((e) => e.id));
+      setEntries((prev) => prev.filter((e) => !tempIds.has(e.id)));
+      return;
+    }
 
     setEntries((prev) => {
-      let next = [...prev];
+      const createdIds = new Map<string, string>();
+      const failedTempIds = new Set<string>();
 
       results.forEach((result) => {
-        if (result.status === "fulfilled") {
-          const { tempId, created } = result.value;
-          next = next.map((e) => (e.id === tempId ? created : e));
+        const temp = converted[result.index];
+        if (!temp) return;
+        if (result.ok && result.id) {
+          createdIds.set(temp.id, result.id);
+        } else {
+          failedTempIds.add(temp.id);
         }
       });
 
-      const failedTempIds = results
-        .map((result, idx) =>
-          result.status === "rejected" ? converted[idx].id : null
-        )
-        .filter((id): id is string => Boolean(id));
-
-      next = next.filter((e) => !failedTempIds.includes(e.id));
-
-      return next;
+      return prev
+        .filter((e) => !failedTempIds.has(e.id))
+        .map((e) => (createdIds.has(e.id) ? { ...e, id: createdIds.get(e.id)! } : e));
     });
 
-    results.forEach((result, idx) => {
-      if (result.status === "rejected") {
-        console.error("CSV row failed to import:", converted[idx], result.reason);
+    results.forEach((result) => {
+      if (result.duplicate === "exact" && !result.ok) return; // already in the ledger
+      if (!result.ok) {
+        console.error("CSV row failed to import:", converted[result.index], result.error);
       }
     });
   };
@@ -120,6 +120,7 @@ export type UiUserInvestment = {
   average_return: number;
   website?: string | null;
   preset_id?: string | null;
+  symbol?: string | null; // price series for valuation; presets map via preset_id
   is_custom?: boolean | null;
 };
 
@@ -143,6 +144,8 @@ type ApiEntryUpdate = Partial<ApiEntryCreate>;
 export type AuthUser = {
   id: string;
   email: string;
+  access_token?: string;
+  refresh_token?: string;
 };
 
 export type LoginPayload = {
@@ -183,6 +186,42 @@ export function logoutUser() {
   localStorage.removeItem(AUTH_STORAGE_KEY);
 }
 
+export function authHeaders(): Record<string, string> {
+  const token = getCurrentUser()?.access_token;
+  return token ? { Authorization: `Bearer ${token}` } : {};
+}
+
+let refreshPromise: Promise<boolean> | null = null;
+
+// Access tokens are short-lived; swap the refresh token for a new pair.
+// Concurrent 401s share one refresh call.
+export function refreshSession(): Promise<boolean> {
+  if (refreshPromise) return refreshPromise;
+
+  refreshPromise = (async () => {
+    const user = getCurrentUser();
+    if (!user?.refresh_token) return false;
+
+    try {
+      const res = await fetch(`${API_URL}/users/refresh`, {
+        method: "POST",
+        headers: { "Content-Type": "application/json" },
+        body: JSON.stringify({ refresh_token: user.refresh_token }),
+      });
+      if (!res.ok) return false;
+
+      saveCurrentUser((await res.json()) as AuthUser);
+      return true;
+    } catch {
+      return false;
+    }
+  })().finally(() => {
+    refreshPromise = null;
+  });
+
+  return refreshPromise;
+}
+
 
 
 function dateToYmd(d: Date): string {
@@ -223,12 +262,21 @@ async function request<T>(path: string, options: RequestInit = {}): Promise<T> {
     headers.set("Content-Type", "application/json");
   }
 
-  try {
-    const res = await fetch(url, {
+  const send = () => {
+    for (const [k, v] of Object.entries(authHeaders())) headers.set(k, v);
+    return fetch(url, {
       ...options,
       method,
       headers,
     });
+  };
+
+  try {
+    let res = await send();
+
+    if (res.status === 401 && (await refreshSession())) {
+      res = await send();
+    }
 
     const text = await res.text();
 
@@ -294,6 +342,94 @@ export async function createEntryFromUi(input: Omit<UiEntry, "id">): Promise<UiE
 
   return apiToUi(created);
 }
+// Server-side cap on rows per POST /entries/bulk (MAX_BULK_ENTRIES in entries.py)
+export const MAX_BULK_ENTRIES = 5000;
+
+export type BulkRowResult = {
+  index: number;
+  ok: boolean;
+  id?: string | null;
+  error?: string | null;
+  // matched an existing entry (exact: same day; near: within the date tolerance)
+  duplicate?: "exact" | "near" | null;
+  duplicate_of?: string | null;
+};
+
+export type BulkCreateResult = {
+  inserted: number;
+  skipped: number;
+  failed: number;
+  results: BulkRowResult[];
+};
+
+export async function bulkCreateEntriesFromUi(
+  inputs: Array<Omit<UiEntry, "id">>,
+  onDuplicate: "skip" | "flag" | "insert" = "skip"
+): Promise<BulkRowResult[]> {
+  const userId = getCurrentUserId();
+  if (!userId) {
+    throw new Error("User not logged in");
+  }
+
+  const out: BulkRowResult[] = [];
+
+  for (let start = 0; start < inputs.length; start += MAX_BULK_ENTRIES) {
+    const chunk = inputs.slice(start, start + MAX_BULK_ENTRIES);
+    const body = chunk
+      .map((input) =>
+        JSON.stringify({
+          user_id: userId,
+          date: dateToYmd(input.date),
+          type: input.type,
+          name: input.name,
+          category: input.category,
+          amount: input.amount,
+          currency: "CAD",
+          notes: null,
+        } satisfies ApiEntryCreate)
+      )
+      .join("\n");
+
+    const res = await request<BulkCreateResult>(`/entries/bulk?on_duplicate=${onDuplicate}`, {
+      method: "POST",
+      body,
+      headers: { "Content-Type": "application/x-ndjson" },
+    });
+
+    for (const r of res.results) {
+      out.push({ ...r, index: r.index + start });
+    }
+  }
+
+  return out;
+}
+
+export type CategorizeItem = {
+  name: string;
+  type: "income" | "expense";
+};
+
+export type CategorizeResult = {
+  categories: string[];
+  // "user": learned from the user's own entries, "rule": a global merchant rule, null: no match
+  sources: Array<"user" | "rule" | null>;
+};
+
+export async function categorizeEntries(items: CategorizeItem[]): Promise<CategorizeResult> {
+  const out: CategorizeResult = { categories: [], sources: [] };
+
+  for (let start = 0; start < items.length; start += MAX_BULK_ENTRIES) {
+    const res = await request<CategorizeResult>("/entries/categorize", {
+      method: "POST",
+      body: JSON.stringify({ items: items.slice(start, start + MAX_BULK_ENTRIES) }),
+    });
+    out.categories.push(...res.categories);
+    out.sources.push(...res.sources);
+  }
+
+  return out;
+}
+
 export async function patchEntryFromUi(id: string, patch: Partial<Omit<UiEntry, "id">>): Promise<UiEntry> {
   const payload: ApiEntryUpdate = {
     ...(patch.date ? { date: dateToYmd(patch.date) } : {}),
@@ -342,6 +478,11 @@ export async function deleteEntryApi(id: string) {
   return request<{ deleted: boolean; id: string }>(`/entries/${id}`, { method: "DELETE" });
 }
 
+// Undo a delete; works after the entry has been archived too.
+export async function restoreEntryApi(id: string): Promise<UiEntry> {
+  return apiToUi(await request<ApiEntry>(`/entries/${id}/restore`, { method: "POST" }));
+}
+
 
 export async function listRoadmapSteps(activeOnly = true): Promise<UiRoadmapStep[]> {
   const qs = new URLSearchParams();
@@ -468,6 +609,88 @@ export async function getSummary(params: {
   return await request<SummaryResponse>(`/analytics/summary?${qs.toString()}`);
 }
 
+export type BootstrapSection =
+  | "entries"
+  | "summary"
+  | "roadmap"
+  | "metrics"
+  | "debts"
+  | "goals"
+  | "investments";
+
+export type BootstrapResponse = {
+  entries?: UiEntry[];
+  entries_next_cursor?: string;
+  summary?: SummaryResponse;
+  roadmap?: UiUserRoadmapStep[];
+  metrics?: UiUserStepMetric[];
+  debts?: UiUserDebt[];
+  goals?: UiUserSavingGoal[];
+  investments?: UiUserInvestment[];
+};
+
+// One request for the dashboard's first paint instead of one per dataset.
+export async function getBootstrap(params?: {
+  include?: BootstrapSection[];
+  entriesLimit?: number;
+  summaryMonths?: 3 | 6 | 12;
+}): Promise<BootstrapResponse> {
+  const qs = new URLSearchParams();
+  if (params?.include?.length) qs.set("include", params.include.join(","));
+  if (params?.entriesLimit != null) qs.set("entries_limit", String(params.entriesLimit));
+  if (params?.summaryMonths != null) qs.set("summary_months", String(params.summaryMonths));
+
+  const data = await request<Omit<BootstrapResponse, "entries"> & { entries?: ApiEntry[] }>(
+    `/me/bootstrap?${qs.toString()}`
+  );
+
+  return { ...data, entries: data.entries?.map(apiToUi) };
+}
+
+export type TimeseriesCategory = {
+  category: string;
+  amount: number;
+};
+
+export type TimeseriesPoint = {
+  year: number;
+  month: number;
+  income: number;
+  expense: number;
+  net: number;
+  top_categories: TimeseriesCategory[];
+};
+
+export type TimeseriesResponse = {
+  months_requested: number;
+  anchor: { year: number; month: number };
+  series: TimeseriesPoint[];
+  top_categories: TimeseriesCategory[];
+};
+
+export async function getTimeseries(params: {
+  months: number;
+  anchor?: { year: number; month: number };
+  top?: number;
+  userId?: string;
+}) {
+  const userId = params.userId ?? getCurrentUserId();
+
+  if (!userId) {
+    throw new Error("User not logged in");
+  }
+
+  const qs = new URLSearchParams();
+  qs.set("user_id", userId);
+  qs.set("months", String(params.months));
+  if (params.anchor) {
+    qs.set("anchor", `${params.anchor.year}-${String(params.anchor.month).padStart(2, "0")}`);
+  }
+  if (params.top != null) qs.set("top", String(params.top));
+
+  return await request<TimeseriesResponse>(`/analytics/timeseries?${qs.toString()}`);
+}
+
 export async function listUserRoadmapSteps(
   userId: string,
   activeOnly = true
@@ -551,117 +774,13 @@ export type FullFundSeed = {
   save_per_month: number;
 };
 
-function normalizeCategory(category: string): string {
-  return category.trim().toLowerCase();
-}
-
-function monthKey(d: Date): string {
-  return `${d.getFullYear()}-${String(d.getMonth() + 1).padStart(2, "0")}`;
-}
-
-function roundMoney(n: number): number {
-  return Math.round(n * 100) / 100;
-}
-
-export async function deriveFullFundSeedFromEntries(userId: string): Promise<FullFundSeed> {
-  const entries = await listEntriesByUser({
-    userId,
-    type: "expense",
-    limit: 500,
-  });
-
-  const latestMonthKeys = Array.from(
-    new Set(entries.map((e) => monthKey(e.date)).sort((a, b) => (a < b ? 1 : -1)))
-  ).slice(0, 3);
-
-  const recentExpenses = entries.filter((e) => latestMonthKeys.includes(monthKey(e.date)));
-
-  const bucketMonthTotals: Record<string, Record<string, number>> = {
-    rent: {},
-    utilities: {},
-    groceries: {},
-    transportation: {},
-    phone_internet: {},
-    insurance: {},
-    minimum_debt_payments: {},
-    essential_medical_costs: {},
-    child_essentials: {},
-    other_expenses: {},
-  };
-
-  function addToBucket(bucket: keyof typeof bucketMonthTotals, entry: UiEntry) {
-    const mk = monthKey(entry.date);
-    bucketMonthTotals[bucket][mk] =
-      (bucketMonthTotals[bucket][mk] ?? 0) + Number(entry.amount || 0);
-  }
-
-  for (const entry of recentExpenses) {
-    const cat = normalizeCategory(entry.category);
-
-    if (cat === "rent") {
-      addToBucket("rent", entry);
-    } else if (cat === "utilities") {
-      addToBucket("utilities", entry);
-    } else if (cat === "groceries" || cat === "food") {
-      addToBucket("groceries", entry);
-    } else if (cat === "travel" || cat === "transportation") {
-      addToBucket("transportation", entry);
-    } else if (
-      cat === "phone" ||
-      cat === "internet" ||
-      cat === "phone / internet" ||
-      cat === "phone/internet"
-    ) {
-      addToBucket("phone_internet", entry);
-    } else if (cat === "insurance") {
-      addToBucket("insurance", entry);
-    } else if (
-      cat === "debt" ||
-      cat === "loan" ||
-      cat === "credit card" ||
-      cat === "minimum debt payments"
-    ) {
-      addToBucket("minimum_debt_payments", entry);
-    } else if (
-      cat === "medical" ||
-      cat === "health" ||
-      cat === "pharmacy" ||
-      cat === "essential medical costs"
-    ) {
-      addToBucket("essential_medical_costs", entry);
-    } else if (
-      cat === "child" ||
-      cat === "kids" ||
-      cat === "baby" ||
-      cat === "child essentials"
-    ) {
-      addToBucket("child_essentials", entry);
-    } else if (cat === "other") {
-      addToBucket("other_expenses", entry);
-    }
-  }
-
-  function averageFromMonths(monthTotals: Record<string, number>): number {
-    const vals = Object.values(monthTotals).filter((v) => v > 0);
-    if (vals.length === 0) return 0;
-    return roundMoney(vals.reduce((a, b) => a + b, 0) / vals.length);
-  }
-
-  return {
-    rent: averageFromMonths(bucketMonthTotals.rent),
-    utilities: averageFromMonths(bucketMonthTotals.utilities),
-    groceries: averageFromMonths(bucketMonthTotals.groceries),
-    transportation: averageFromMonths(bucketMonthTotals.transportation),
-    phone_internet: averageFromMonths(bucketMonthTotals.phone_internet),
-    insurance: averageFromMonths(bucketMonthTotals.insurance),
-    minimum_debt_payments: averageFromMonths(bucketMonthTotals.minimum_debt_payments),
-    essential_medical_costs: averageFromMonths(bucketMonthTotals.essential_medical_costs),
-    child_essentials: averageFromMonths(bucketMonthTotals.child_essentials),
-    other_expenses: averageFromMonths(bucketMonthTotals.other_expenses),
-    selected_months: 3,
-    current_saved: 0,
-    save_per_month: 0,
-  };
+// Averages of the latest `months` months with expenses, bucketed server-side
+// (GET /analytics/essential-expenses).
+export async function deriveFullFundSeedFromEntries(
+  _userId: string,
+  months = 3
+): Promise<FullFundSeed> {
+  return request<FullFundSeed>(`/analytics/essential-expenses?months=${months}`);
 }
 
 export async function ensureFullFundMetricsSeeded(params: {
@@ -820,6 +939,7 @@ export async function patchUserInvestment(
       | "average_return"
       | "website"
       | "preset_id"
+      | "symbol"
       | "is_custom"
     >
   >
@@ -863,3 +983,54 @@ export async function loginUser(payload: LoginPayload): Promise<AuthUser> {
   return user;
 }
 
+export type MarketPrices = {
+  symbol: string;
+  start: string;
+  end: string;
+  // column-packed: dates[i] closed at closes[i]
+  dates: string[];
+  closes: number[];
+  last: number | null;
+  prev_close: number | null;
+  as_of: string | null;
+};
+
+export async function getMarketPrices(
+  symbol: string,
+  params?: { start?: string; end?: string }
+): Promise<MarketPrices> {
+  const qs = new URLSearchParams({ symbol });
+  if (params?.start) qs.set("start", params.start);
+  if (params?.end) qs.set("end", params.end);
+  return request<MarketPrices>(`/market/prices?${qs.toString()}`);
+}
+
+export type PortfolioValueHolding = {
+  id: string;
+  name: string;
+  symbol: string | null;
+  units?: number;
+  value: number;
+};
+
+export type PortfolioValue = {
+  start: string;
+  end: string;
+  // column-packed: the portfolio was worth values[i] on dates[i]
+  dates: string[];
+  values: number[];
+  holdings: PortfolioValueHolding[];
+  unpriced: PortfolioValueHolding[];
+};
+
+export async function getPortfolioValue(params?: {
+  stepKey?: string;
+  start?: string;
+  end?: string;
+}): Promise<PortfolioValue> {
+  const qs = new URLSearchParams();
+  if (params?.stepKey) qs.set("step_key", params.stepKey);
+  if (params?.start) qs.set("start", params.start);
+  if (params?.end) qs.set("end", params.end);
+  return request<PortfolioValue>(`/analytics/portfolio-value?${qs.toString()}`);
+}
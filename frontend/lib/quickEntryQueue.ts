@@ -1,4 +1,5 @@
 import { openDB } from "idb";
+import { authHeaders } from "@/lib/bridge";
 
 type QuickEntryType = "income" | "expense";
 
@@ -130,6 +131,7 @@ export async function flushPendingQuickEntries(opts?: {
           headers: {
             "Content-Type": "application/json",
             "X-Client-Request-Id": item.localId,
+            ...authHeaders(),
           },
           body: JSON.stringify({
             user_id: item.userId,